@@ -0,0 +1,56 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# memory per node of the syntax tree (AstNode vs. ete3 Tree) and end-to-end compile time
+#
+#   python -m benchmarks.bench_ast
+#
+import time
+import tracemalloc
+
+from benchmarks.bench_compiler_session import sample_sources, compile_all
+from src.compiler import Compiler
+from src.generate_results import to_ete_tree
+
+ROUNDS = 200
+
+
+def parse_all(compiler, sources):
+    trees = []
+    for source in sources:
+        compiler.lexer.lineno = 1
+        tree = compiler.parser.parse(source, lexer=compiler.lexer)
+        if tree is not None:
+            trees.append(tree)
+    return trees
+
+
+def allocated(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+if __name__ == '__main__':
+    sources = sample_sources()
+    compiler = Compiler()
+    parse_all(compiler, sources)
+
+    trees, ast_size = allocated(lambda: parse_all(compiler, sources))
+    # ete3 is imported lazily, keep the import out of the measurement
+    to_ete_tree(trees[0])
+    _, ete_size = allocated(lambda: [to_ete_tree(tree) for tree in trees])
+    nodes = sum(len(tree.preorder()) for tree in trees)
+
+    compile_all(compiler, sources)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        compile_all(compiler, sources)
+    per_compile = (time.perf_counter() - start) / (ROUNDS * len(sources))
+
+    print(f"{len(trees)} trees, {nodes} nodes")
+    print(f"AstNode (parse incl.)       {ast_size / nodes:10.1f} B / node")
+    print(f"ete3 Tree                   {ete_size / nodes:10.1f} B / node")
+    print(f"warm Compiler session       {per_compile * 1e6:10.1f} us / compile")
@@ -0,0 +1,32 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# throughput of the batch compilation of a tree of generated sources with 1 and more worker processes
+#
+#   python -m benchmarks.bench_batch
+#
+import os
+import shutil
+import tempfile
+
+from benchmarks.bench_scopes import generated_program
+from src.batch import compile_batch
+
+FILES = 64
+STATEMENTS = 500
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        for i in range(FILES):
+            with open(os.path.join(directory, f"program_{i}.swift"), "w") as f:
+                f.write(generated_program(STATEMENTS + i))
+        print(f"{FILES} files, {os.cpu_count()} cpus")
+        print(f"{'workers':>7} {'time [s]':>9} {'files/s':>8}")
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            summary = compile_batch([directory], os.path.join(directory, "out"), workers=workers)
+            assert not summary.failed, summary.report()
+            print(f"{workers:>7} {summary.seconds:9.3f} {FILES / summary.seconds:8.1f}")
+    finally:
+        shutil.rmtree(directory)
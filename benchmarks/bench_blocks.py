@@ -0,0 +1,43 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# basic blocks compiled to python vs. the reference interpreter and the decoded program with superinstructions
+#
+#   python -m benchmarks.bench_blocks
+#
+import time
+
+from benchmarks.bench_vm import programs
+from src.compiler import Compiler
+from src.pl0_vm import block_compiler, dispatch, p_machine
+from src.pl0_vm.p_machine import STACK_SIZE
+
+ROUNDS = 3
+
+
+def best_time(run):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'program':>22} {'p_machine [ms]':>15} {'dispatch [ms]':>14} {'compile [ms]':>13} {'blocks [ms]':>12}"
+          f" {'speed-up':>9}")
+    for name, source in programs():
+        compiler.compile_source(source)
+        code = compiler.generator.code
+        reference = best_time(lambda: p_machine.execute(code))
+        opcodes, arguments = dispatch.decode(code)
+        dispatch.fuse(opcodes, arguments)
+        decoded = best_time(lambda: dispatch.execute_decoded(opcodes, arguments))
+        compile_time = best_time(lambda: block_compiler.compile_blocks(code))
+        run = block_compiler.compile_blocks(code)
+        blocks = best_time(lambda: run([0] * STACK_SIZE))
+        print(f"{name:>22} {reference * 1e3:15.2f} {decoded * 1e3:14.2f} {compile_time * 1e3:13.2f}"
+              f" {blocks * 1e3:12.2f} {reference / blocks:9.1f}")
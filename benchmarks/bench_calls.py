@@ -0,0 +1,32 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# code generation of programs with hundreds of functions that are called from everywhere
+#
+#   python -m benchmarks.bench_calls
+#
+from benchmarks.bench_scopes import phases
+from src.compiler import Compiler
+
+SIZES = (100, 200, 400)
+CALLS = 20
+
+
+def generated_program(functions):
+    lines = ["var a: Int = 0;"]
+    for i in range(functions):
+        lines += [f"func f{i}(x: Int) -> Int {{",
+                  f"    x += {i};",
+                  "    return x;",
+                  "}"]
+    for i in range(functions * CALLS):
+        lines.append(f"a = f{(i * 7) % functions}(a);")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'functions':>10} {'instructions':>12} {'generator [s]':>14}")
+    for size in SIZES:
+        times = phases(compiler, generated_program(size))
+        print(f"{size:>10} {len(compiler.generator.code):>12} {times['generator']:14.3f}")
@@ -0,0 +1,56 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# per-compile latency of a warm Compiler session vs. a new lexer and parser for every compilation
+#
+#   python -m benchmarks.bench_compiler_session
+#
+import glob
+import time
+
+from src.compiler import Compiler
+
+WARM_UP = 20
+ROUNDS = 200
+
+
+def sample_sources():
+    sources = []
+    for name in sorted(glob.glob("sample_input/*.swift")):
+        with open(name) as f:
+            sources.append(f.read())
+    return sources
+
+
+def compile_all(compiler, sources):
+    for source in sources:
+        try:
+            compiler.compile_source(source)
+        except Exception:
+            # the corpus contains intentionally broken inputs
+            pass
+
+
+if __name__ == '__main__':
+    sources = sample_sources()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS // 20):
+        for source in sources:
+            try:
+                Compiler().compile_source(source)
+            except Exception:
+                pass
+    fresh = (time.perf_counter() - start) / (ROUNDS // 20 * len(sources))
+
+    session = Compiler()
+    for _ in range(WARM_UP):
+        compile_all(session, sources)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        compile_all(session, sources)
+    warm = (time.perf_counter() - start) / (ROUNDS * len(sources))
+
+    print(f"{len(sources)} sources")
+    print(f"new Compiler per source     {fresh * 1e6:10.1f} us / compile")
+    print(f"warm Compiler session       {warm * 1e6:10.1f} us / compile")
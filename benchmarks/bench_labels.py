@@ -0,0 +1,45 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# code generation of programs with thousands of ifs and loops nested into each other
+#
+#   python -m benchmarks.bench_labels
+#
+import time
+
+from benchmarks.bench_scopes import phases
+from src.compiler import Compiler
+
+SIZES = (500, 1000, 2000, 4000)
+
+
+def generated_program(constructs):
+    lines = ["var a: Int = 0;", "var b: Int = 0;"]
+    for i in range(constructs):
+        lines += ["if (a < 10 && b > 0 || a == 3) {",
+                  f"    for (var j{i}: Int = 0; j{i} < 3; j{i} += 1;) {{",
+                  "        if (b > 1) {",
+                  "            b += 1;",
+                  "        } else {",
+                  f"            a += {i % 5};",
+                  "        }",
+                  "    }",
+                  "    while a < 5 {",
+                  "        a += 1;",
+                  "    }",
+                  "} else {",
+                  "    repeat {",
+                  "        b -= 1;",
+                  "    } while b > 0;",
+                  "}"]
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'constructs':>10} {'instructions':>12} {'generator [s]':>14}")
+    for size in SIZES:
+        source = generated_program(size)
+        start = time.perf_counter()
+        times = phases(compiler, source)
+        print(f"{size:>10} {len(compiler.generator.code):>12} {times['generator']:14.3f}")
@@ -0,0 +1,76 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# one program over N inputs, the lane machine (numpy, all lanes at once) vs. N runs of the decoded program
+#
+#   python -m benchmarks.bench_lanes
+#
+import time
+
+import numpy as np
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instructions import LIT
+from src.pl0_vm import dispatch, lane_machine
+
+LANES = (1, 10, 100, 1000, 10000)
+
+# every lane runs the same number of iterations
+UNIFORM = """var n: Int = n;
+var a: Int = 0;
+var i: Int = 0;
+while i < 200 {
+    a = a + n;
+    i += 1;
+}
+"""
+
+# lanes take different branches and leave the loop after n iterations
+DIVERGENT = """var n: Int = n;
+var a: Int = 0;
+var h: Int = 0;
+while n > 0 {
+    h = n / 2;
+    if (h * 2 == n) {
+        a += n;
+    } else {
+        a = a - 1;
+    }
+    n = n - 1;
+}
+"""
+
+
+def scalar_runs(compiler, source, values):
+    """
+    It runs the decoded program once per value of n, the constant of the declaration of n is patched per run
+    """
+    compiler.compile_source(source.replace("= n;", "= 0;", 1))
+    code = compiler.generator.code
+    seed = code.opcodes.index(LIT)
+    opcodes, arguments = dispatch.decode(code)
+    start = time.perf_counter()
+    for value in values:
+        arguments[seed] = int(value)
+        dispatch.execute_decoded(opcodes, arguments)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    # the first run pays for lazy imports of numpy
+    compiler.compile_source(DIVERGENT)
+    lane_machine.execute(compiler.generator.code, [[3, 0, 0], [4, 0, 0]])
+    print(f"{'program':>10} {'lanes':>7} {'scalar [ms]':>12} {'lanes [ms]':>11} {'speed-up':>9}")
+    for name, source in (("uniform", UNIFORM), ("divergent", DIVERGENT)):
+        for lane_count in LANES:
+            values = np.arange(lane_count) % 200
+            scalar = scalar_runs(compiler, source, values)
+            compiler.compile_source(source)
+            code = compiler.generator.code
+            inputs = np.zeros((lane_count, 3), dtype=np.int64)
+            inputs[:, 0] = values
+            start = time.perf_counter()
+            lane_machine.execute(code, inputs)
+            lanes = time.perf_counter() - start
+            print(f"{name:>10} {lane_count:>7} {scalar * 1e3:12.1f} {lanes * 1e3:11.1f} {scalar / lanes:9.2f}")
@@ -0,0 +1,53 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# cold vs warm startup of the lexer and parser
+#
+#   python -m benchmarks.bench_parser_tables
+#
+import statistics
+import tempfile
+import time
+
+import ply.lex
+import ply.yacc as yy
+
+import src.lex_analyzer as lexical
+import src.syntax_analyzer as syntax
+from src.tables_cache import build_lexer_and_parser
+
+RUNS = 10
+
+
+def measure(function, runs=RUNS):
+    """
+    It returns the median wall time of the function in milliseconds
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def no_cache():
+    ply.lex.lex(module=lexical)
+    yy.yacc(module=syntax, debug=False, write_tables=False)
+
+
+def cold():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        build_lexer_and_parser(cache_dir)
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as warm_cache_dir:
+        build_lexer_and_parser(warm_cache_dir)
+        results = {
+            "no cache (old start_compiler)": measure(no_cache),
+            "cold cache (generate + store)": measure(cold),
+            "warm cache (load tables)": measure(lambda: build_lexer_and_parser(warm_cache_dir)),
+        }
+    for name, ms in results.items():
+        print(f"{name:32s} {ms:8.2f} ms")
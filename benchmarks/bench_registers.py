@@ -0,0 +1,43 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# the register IR vs. the stack machine, executed instructions and time of one run on the sample input
+# and on the synthetic loops of bench_vm
+#
+#   python -m benchmarks.bench_registers
+#
+import glob
+import os
+
+from benchmarks.bench_blocks import best_time
+from benchmarks.bench_vm import programs
+from src.compiler import Compiler
+from src.pl0_vm import dispatch, p_machine, register_machine
+
+
+def all_programs():
+    for name in sorted(glob.glob("sample_input/*.swift")):
+        yield os.path.basename(name), open(name).read()
+    for name, source in programs():
+        if not name.endswith(".swift"):
+            yield name, source
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'program':>22} {'stack steps':>12} {'IR steps':>10} {'p_machine [ms]':>15} {'dispatch [ms]':>14}"
+          f" {'registers [ms]':>15} {'speed-up':>9}")
+    for name, source in all_programs():
+        compiler.compile_source(source)
+        code = compiler.generator.code
+        _, steps = p_machine.execute(code)
+        reference = best_time(lambda: p_machine.execute(code))
+        # both programs are prepared once, only their execution is measured
+        opcodes, arguments = dispatch.decode(code)
+        dispatch.fuse(opcodes, arguments)
+        decoded = best_time(lambda: dispatch.execute_decoded(opcodes, arguments))
+        program, registers = register_machine.translate(code)
+        _, register_steps = register_machine.execute_translated(program, registers)
+        translated = best_time(lambda: register_machine.execute_translated(program, registers))
+        print(f"{name:>22} {steps:>12} {register_steps:>10} {reference * 1e3:15.3f} {decoded * 1e3:14.3f}"
+              f" {translated * 1e3:15.3f} {reference / translated:9.2f}")
@@ -0,0 +1,55 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# symbol table and code generation of long generated programs, the statements are nested in a block,
+# so every symbol lookup needs the depth of its block
+#
+#   python -m benchmarks.bench_scopes
+#
+import time
+
+from src.compiler import Compiler
+from src.semantics_analyzer.analyzer import Analyzer
+from src.syntax_analyzer.symbol_table import generate_table_of_symbols
+
+SIZES = (12_500, 25_000, 50_000, 100_000)
+
+
+def generated_program(statements):
+    lines = ["var a: Int = 0;", "if (a >= 0) {", "    var b: Int = 1;"]
+    for i in range(statements):
+        lines.append(f"    a = a + {i % 7};" if i % 2 else "    b += a;")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def phases(compiler, source):
+    times = {}
+    start = time.perf_counter()
+    compiler.lexer.lineno = 1
+    dst = compiler.parser.parse(source, lexer=compiler.lexer)
+    times["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table_of_symbols = {}
+    generate_table_of_symbols(table_of_symbols, symbols=dst.get_leaves())
+    times["symbols"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Analyzer(dst, table_of_symbols).Analyze()
+    times["analyzer"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiler.generator.reset(dst, table_of_symbols)
+    compiler.generator.generate_instructions()
+    times["generator"] = time.perf_counter() - start
+    return times
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'statements':>10} {'parse':>9} {'symbols':>9} {'analyzer':>9} {'generator':>9}   [s]")
+    for size in SIZES:
+        times = phases(compiler, generated_program(size))
+        print(f"{size:>10} {times['parse']:9.3f} {times['symbols']:9.3f} {times['analyzer']:9.3f} "
+              f"{times['generator']:9.3f}")
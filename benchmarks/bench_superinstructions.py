@@ -0,0 +1,43 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# superinstructions of the decoded program: which fusions fired, the drop of the dynamic instruction count
+# and the run time with and without them
+#
+#   python -m benchmarks.bench_superinstructions
+#
+import time
+
+from benchmarks.bench_vm import programs
+from src.compiler import Compiler
+from src.pl0_vm import dispatch
+
+ROUNDS = 5
+
+
+def best_time(opcodes, arguments):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        dispatch.execute_decoded(opcodes, arguments)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    for name, source in programs():
+        compiler.compile_source(source)
+        opcodes, arguments = dispatch.decode(compiler.generator.code)
+        _, steps = dispatch.execute_decoded(opcodes, arguments)
+        plain_time = best_time(opcodes, arguments)
+
+        fired = dispatch.fuse(opcodes, arguments)
+        _, fused_steps = dispatch.execute_decoded(opcodes, arguments)
+        fused_time = best_time(opcodes, arguments)
+
+        print(f"{name}: {steps} -> {fused_steps} steps ({100 * (1 - fused_steps / steps):.1f} % less), "
+              f"{plain_time * 1e3:.2f} -> {fused_time * 1e3:.2f} ms ({plain_time / fused_time:.2f}x)")
+        for fusion, count in fired.most_common():
+            print(f"    {count:>5}  {fusion}")
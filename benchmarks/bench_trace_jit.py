@@ -0,0 +1,46 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# hot-loop traces vs. compilation of all basic blocks, both with their compile time,
+# on loops and on long straight-line code that runs once
+#
+#   python -m benchmarks.bench_trace_jit
+#
+import time
+
+from benchmarks.bench_vm import programs
+from src.compiler import Compiler
+from src.pl0_vm import block_compiler, p_machine, trace_jit
+
+ROUNDS = 3
+STRAIGHT_LINE_STATEMENTS = 5000
+
+
+def straight_line():
+    lines = ["var a: Int = 0;", "var b: Int = 1;"]
+    for i in range(STRAIGHT_LINE_STATEMENTS):
+        lines.append("a = a + b;" if i % 2 else f"b += {i % 5};")
+    return "\n".join(lines) + "\n"
+
+
+def best_time(run):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'program':>22} {'p_machine [ms]':>15} {'blocks [ms]':>12} {'traces [ms]':>12} {'speed-up':>9}")
+    for name, source in list(programs()) + [("straight line", straight_line())]:
+        compiler.compile_source(source)
+        code = compiler.generator.code
+        reference = best_time(lambda: p_machine.execute(code))
+        blocks = best_time(lambda: block_compiler.execute(code))
+        traces = best_time(lambda: trace_jit.execute(code))
+        print(f"{name:>22} {reference * 1e3:15.2f} {blocks * 1e3:12.2f} {traces * 1e3:12.2f}"
+              f" {reference / traces:9.1f}")
@@ -0,0 +1,70 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+# instructions per second of the PL/0 machine on loop-heavy and call-heavy programs,
+# the reference interpreter (p_machine) vs. the decoded program with the dispatch loop (dispatch)
+#
+#   python -m benchmarks.bench_vm
+#
+import time
+
+from src.compiler import Compiler
+from src.pl0_vm import dispatch, p_machine
+
+# minimal number of executed instructions per measurement
+MIN_STEPS = 2_000_000
+
+LOOP = """var a: Int = 0;
+var i: Int = 0;
+while i < 200000 {
+    a += i;
+    i += 1;
+}
+"""
+
+CALLS = """var a: Int = 0;
+var i: Int = 0;
+func f(x: Int) -> Int {
+    x += 3;
+    return x;
+}
+while i < 50000 {
+    a = f(a);
+    i += 1;
+}
+"""
+
+
+def programs():
+    yield "complex_program.swift", open("sample_input/complex_program.swift").read()
+    yield "for_in_func.swift", open("sample_input/for_in_func.swift").read()
+    yield "loop", LOOP
+    yield "calls", CALLS
+
+
+def instructions_per_second(execute):
+    """
+    It runs the machine repeatedly and returns the number of steps of one run and executed instructions per second
+
+    :param execute: function without arguments that runs the program and returns (stack, steps)
+    """
+    _, steps = execute()
+    runs = max(1, MIN_STEPS // steps)
+    start = time.perf_counter()
+    for _ in range(runs):
+        execute()
+    elapsed = time.perf_counter() - start
+    return steps, runs * steps / elapsed
+
+
+if __name__ == '__main__':
+    compiler = Compiler()
+    print(f"{'program':>22} {'steps':>10} {'p_machine [i/s]':>16} {'dispatch [i/s]':>16} {'speed-up':>9}")
+    for name, source in programs():
+        compiler.compile_source(source)
+        code = compiler.generator.code
+        steps, reference = instructions_per_second(lambda: p_machine.execute(code))
+        # the program is decoded once, only the dispatch loop is measured
+        program = dispatch.decode(code)
+        _, decoded = instructions_per_second(lambda: dispatch.execute_decoded(*program))
+        print(f"{name:>22} {steps:>10} {reference:16,.0f} {decoded:16,.0f} {decoded / reference:9.2f}")
@@ -1,15 +1,74 @@
-from src.start_compiler import start_compiler
-
 if __name__ == '__main__':
     import argparse
 
     parser = argparse.ArgumentParser(description='Not so swift compiler.')
-    parser.add_argument('-i', '--f_input',
-                        help='path to input file...',  required=True)
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument('-i', '--f_input',
+                        help='path to input file...')
+    inputs.add_argument('-b', '--batch', nargs='+',
+                        help='directories, files or glob patterns of input files compiled in parallel, '
+                             'every file gets its own output dir <out>/<name of the file>/output...')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='number of processes of --batch, the number of cpus by default...')
     parser.add_argument('-o', '--out',  default="./",
                         help='path to output dir...')
     parser.add_argument('-qt', '--show_tree_with_pyqt5',  default=False,  type=bool,
                         help='True/False')
+    parser.add_argument('-p', '--profile', action='store_true',
+                        help='save the profile of the run of the generated code (output/profile.json)...')
+    parser.add_argument('--time-passes', action='store_true',
+                        help='print wall and cpu time of the phases of the compiler to stderr...')
+    parser.add_argument('--mem-passes', action='store_true',
+                        help='print the memory peaks of the phases of the compiler (tracemalloc) to stderr...')
+    parser.add_argument('--passes-json',
+                        help='path to json file with the measured phases and counts...')
+    parser.add_argument('--trace',
+                        help='path to trace.json with nested spans of the compiler (chrome://tracing, Perfetto)...')
+    parser.add_argument('--cache', action='store_true',
+                        help='reuse the results of earlier compilations of unchanged sources...')
+    parser.add_argument('--cache-dir',
+                        help='root of the compile cache (implies --cache), ~/.cache/not_so_swift by default...')
+    parser.add_argument('--cache-size', type=int, default=64,
+                        help='size of the compile cache in MiB, the least recently used entries are evicted...')
     args = parser.parse_args()
 
-    start_compiler(input_file_name=args.f_input, output_dir=args.out, show_tree_with_pyqt5=args.show_tree_with_pyqt5)
+    # the compiler is imported after parsing of the arguments, so --help does not load it at all
+    import sys
+    from src.tables_cache import default_cache_dir
+
+    compile_cache_dir = args.cache_dir
+    if compile_cache_dir is None and args.cache:
+        compile_cache_dir = default_cache_dir()
+
+    if args.batch is not None:
+        from src.batch import compile_batch
+
+        summary = compile_batch(args.batch, args.out, workers=args.jobs, profile=args.profile,
+                                compile_cache_dir=compile_cache_dir, compile_cache_bytes=args.cache_size << 20)
+        sys.stdout.write(summary.report())
+        sys.exit(1 if summary.failed else 0)
+
+    from src.compiler import Compiler
+    from src.pass_timer import PassTimer
+    from src.trace_events import Tracer
+
+    tracer = Tracer() if args.trace is not None else None
+    with PassTimer(time_passes=args.time_passes or args.passes_json is not None, mem_passes=args.mem_passes,
+                   tracer=tracer) as passes:
+        with passes.phase("compiler setup"):
+            compile_cache = None
+            if compile_cache_dir is not None:
+                from src.compile_cache import CompileCache
+                compile_cache = CompileCache(compile_cache_dir, args.cache_size << 20)
+            compiler = Compiler(compile_cache=compile_cache)
+        compiler.compile_file(args.f_input, output_dir=args.out, show_tree_with_pyqt5=args.show_tree_with_pyqt5,
+                              profile=args.profile, passes=passes)
+    if args.time_passes or args.mem_passes:
+        sys.stderr.write(passes.report())
+    if args.passes_json is not None:
+        with open(args.passes_json, mode="w") as f:
+            f.write(passes.to_json())
+    if tracer is not None:
+        tracer.write(args.trace)
+    if compile_cache is not None:
+        sys.stderr.write(f"compile cache: {compile_cache.stats()}\n")
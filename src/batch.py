@@ -0,0 +1,242 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.compile_cache import CompileCache, DEFAULT_MAX_BYTES
+from src.compiler import Compiler
+
+SOURCE_SUFFIX = ".swift"
+# file in the output directory of a source while a worker compiles it, it is left behind if the worker dies
+RUNNING_MARKER = ".compiling"
+
+# compiler of the worker process, it is built once by init_worker and reused for all files of the worker
+worker_compiler = None
+
+
+class BatchResult:
+    """
+    It is the result of the compilation of one file of the batch, the error is the message of the exception
+    of a failed compilation
+    """
+    __slots__ = ("source", "output_dir", "ok", "seconds", "lines", "instructions", "error", "cached")
+
+    def __init__(self, source: str, output_dir: str) -> None:
+        self.source = source
+        self.output_dir = output_dir
+        self.ok = False
+        self.seconds = 0.0
+        self.lines = 0
+        self.instructions = 0
+        self.error = None
+        # True if the result comes from the compile cache
+        self.cached = False
+
+
+class BatchSummary:
+    """
+    It is the result of compile_batch, the results of the files in the order of the sources and the wall time
+    of the whole batch
+    """
+    __slots__ = ("results", "seconds", "workers")
+
+    def __init__(self, results: list, seconds: float, workers: int) -> None:
+        self.results = results
+        self.seconds = seconds
+        self.workers = workers
+
+    @property
+    def succeeded(self) -> list:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    def report(self) -> str:
+        """
+        It returns the time of every file, the failures with their errors and the totals with the throughput
+        """
+        lines = [f"{'time [s]':>10} {'lines':>8} {'instructions':>12}  source"]
+        for result in self.results:
+            status = f"{result.instructions:>12}" if result.ok else f"{'FAILED':>12}"
+            lines.append(f"{result.seconds:10.4f} {result.lines:>8} {status}  {result.source}")
+        for result in self.failed:
+            lines.append(f"FAILED {result.source}: {result.error}")
+        seconds = max(self.seconds, 1e-9)
+        source_lines = sum(result.lines for result in self.results)
+        cached = sum(result.cached for result in self.results)
+        lines.append(f"{len(self.succeeded)} compiled, {len(self.failed)} failed ({cached} from cache) "
+                     f"in {self.seconds:.3f} s with {self.workers} workers, "
+                     f"{len(self.results) / seconds:.1f} files/s, {source_lines / seconds:.0f} lines/s")
+        return "\n".join(lines) + "\n"
+
+
+def collect_sources(paths) -> list:
+    """
+    It returns (source, name) of every .swift file of the paths, directories are searched recursively,
+    other paths are files or glob patterns, the name is the path of the source relative to the directory
+    it was found in without the suffix (the file name for files and patterns), names are unique
+
+    :param paths: directories, files and glob patterns
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = glob.glob(os.path.join(glob.escape(path), "**", "*" + SOURCE_SUFFIX), recursive=True)
+            sources += [(source, os.path.relpath(source, path)) for source in sorted(found)]
+        else:
+            found = glob.glob(path) if glob.has_magic(path) else [path]
+            sources += [(source, os.path.basename(source)) for source in sorted(found)]
+    collected = []
+    seen_sources = set()
+    seen_names = set()
+    for source, name in sources:
+        if os.path.abspath(source) in seen_sources:
+            continue
+        seen_sources.add(os.path.abspath(source))
+        name = name[:-len(SOURCE_SUFFIX)] if name.endswith(SOURCE_SUFFIX) else name
+        unique_name = name
+        number = 1
+        while unique_name in seen_names:
+            number += 1
+            unique_name = f"{name}_{number}"
+        seen_names.add(unique_name)
+        collected.append((source, unique_name))
+    return collected
+
+
+def init_worker(cache_dir=None, compile_cache_dir=None, compile_cache_bytes=DEFAULT_MAX_BYTES):
+    """
+    It builds the compiler of the worker process, so the parser is warm for every file of the worker
+
+    :param cache_dir: root of the cache with lexer and parser tables (optional)
+    :param compile_cache_dir: root of the compile cache the workers share, no cache if None (optional)
+    :param compile_cache_bytes: size of the compile cache the entries are evicted over (optional)
+    """
+    global worker_compiler
+    compile_cache = None
+    if compile_cache_dir is not None:
+        compile_cache = CompileCache(compile_cache_dir, compile_cache_bytes)
+    worker_compiler = Compiler(cache_dir, compile_cache)
+
+
+def compile_one(source: str, output_dir: str, profile=False) -> BatchResult:
+    """
+    It compiles one file of the batch with the compiler of the worker, an exception fails only this file
+
+    :param source: path of the source
+    :param output_dir: directory of the output files of the source
+    :param profile: If True, the profile of the run of the code is saved with the output files (optional)
+    """
+    if worker_compiler is None:
+        init_worker()
+    result = BatchResult(source, output_dir)
+    compile_cache = worker_compiler.compile_cache
+    hits = compile_cache.hits if compile_cache is not None else 0
+    start = time.perf_counter()
+    marker = os.path.join(output_dir, RUNNING_MARKER)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        open(marker, "w").close()
+        code = worker_compiler.compile_file(source, output_dir=os.path.join(output_dir, ""), profile=profile)
+        result.instructions = code.count("\n")
+        result.ok = True
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    remove_marker(output_dir)
+    result.seconds = time.perf_counter() - start
+    result.cached = compile_cache is not None and compile_cache.hits > hits
+    try:
+        with open(source) as f:
+            result.lines = sum(1 for _ in f)
+    except OSError:
+        pass
+    return result
+
+
+def remove_marker(output_dir: str) -> bool:
+    """
+    It removes the marker of the running compilation from the output directory, it returns True if it was there
+
+    :param output_dir: directory of the output files of the source
+    """
+    try:
+        os.remove(os.path.join(output_dir, RUNNING_MARKER))
+        return True
+    except OSError:
+        return False
+
+
+def run_pool(jobs, indexes, workers: int, worker_args, profile: bool, results: list) -> list:
+    """
+    It compiles the jobs of the indexes in a new pool of processes and puts their results to the results,
+    it returns the indexes of the jobs that were lost because a worker died and broke the pool
+
+    :param jobs: (source, output directory) of every file of the batch
+    :param indexes: indexes of the jobs to compile
+    :param workers: number of processes
+    :param worker_args: arguments of init_worker
+    :param profile: If True, the profile of the run of the code is saved with the output files
+    :param results: results of all jobs, the results of the compiled jobs are set
+    """
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=worker_args) as pool:
+        futures = [(index, pool.submit(compile_one, *jobs[index], profile)) for index in indexes]
+        for index, future in futures:
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                lost.append(index)
+            except Exception as e:
+                # the exception of compile_one is caught in the worker, this one comes from the pool
+                results[index] = BatchResult(*jobs[index])
+                results[index].error = str(e) or type(e).__name__
+    return lost
+
+
+def compile_batch(paths, output_dir: str, workers=None, profile=False, cache_dir=None, compile_cache_dir=None,
+                  compile_cache_bytes=DEFAULT_MAX_BYTES) -> BatchSummary:
+    """
+    It compiles all .swift files of the paths in a pool of processes, every file gets its own output directory
+    <output_dir>/<name of the source>/output, a compilation error fails only its file, if a worker process dies,
+    the files that were not compiled yet are compiled again in a new pool and the files the worker was compiling
+    are compiled again each in a pool of its own, so only the file that kills its worker fails
+
+    :param paths: directories, files and glob patterns
+    :param output_dir: root of the output directories
+    :param workers: number of processes, the number of cpus if None, the files are compiled
+                    in this process if it is 1 and then a dying compilation stops the batch (optional)
+    :param profile: If True, the profile of the run of the code is saved with the output files (optional)
+    :param cache_dir: root of the cache with lexer and parser tables (optional)
+    :param compile_cache_dir: root of the compile cache the workers share, no cache if None (optional)
+    :param compile_cache_bytes: size of the compile cache the entries are evicted over (optional)
+    """
+    sources = collect_sources(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(sources)))
+    start = time.perf_counter()
+    jobs = [(source, os.path.join(output_dir, name)) for source, name in sources]
+    worker_args = (cache_dir, compile_cache_dir, compile_cache_bytes)
+    if workers == 1:
+        init_worker(*worker_args)
+        results = [compile_one(source, directory, profile) for source, directory in jobs]
+    else:
+        results = [None] * len(jobs)
+        pending = list(range(len(jobs)))
+        while pending:
+            lost = run_pool(jobs, pending, workers, worker_args, profile, results)
+            # the markers tell the jobs the workers were compiling from the ones that were waiting
+            running = [index for index in lost if remove_marker(jobs[index][1])] or lost
+            for index in running:
+                if run_pool(jobs, [index], 1, worker_args, profile, results):
+                    remove_marker(jobs[index][1])
+                    results[index] = BatchResult(*jobs[index])
+                    results[index].error = "the worker process died"
+            pending = [index for index in lost if index not in running]
+    return BatchSummary(results, time.perf_counter() - start, workers)
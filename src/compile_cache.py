@@ -0,0 +1,207 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from functools import lru_cache
+
+from src.tables_cache import default_cache_dir
+
+# bump whenever the layout of the cached entries changes
+CACHE_VERSION = 1
+# the cache evicts the least recently used entries when it grows over this number of bytes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# the size of the cache is counted again after this number of stores, other processes write to the cache too
+RESCAN_STORES = 256
+# a temporary file of an entry older than this number of seconds was left by a writer that died before the rename
+TMP_GRACE_SECONDS = 60
+
+
+@lru_cache(maxsize=None)
+def compiler_hash() -> str:
+    """
+    It returns a hash of the sources of the compiler, any change of the lexer, the parser, the analyzer,
+    the generator or the machine gives a new key to all entries
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}:{sys.version_info[:2]}".encode())
+    root = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(root, "**", "*.py"), recursive=True)):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# > The CompileCache keeps the results of compilations addressed by the hash of the source, of the compiler
+# and of the options, an entry is one json file with the generated code, the output files and the error,
+# the entries are written atomically and the least recently used ones are evicted when the cache is full.
+class CompileCache:
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES) -> None:
+        """
+        :param cache_dir: root of the cache, defaults to default_cache_dir() (optional)
+        :param max_bytes: size of the cache the entries are evicted over (optional)
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.directory = os.path.join(cache_dir, "compiled")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        # running estimate of the size of the cache in bytes, None until the entries are counted
+        self.size = None
+        self.stores_since_scan = 0
+
+    def key(self, source: str, **options) -> str:
+        """
+        It returns the address of the compilation of the source with the options
+
+        :param source: the source code
+        :param options: options that change the result of the compilation
+        """
+        digest = hashlib.sha256()
+        digest.update(compiler_hash().encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def load(self, key: str):
+        """
+        It returns the entry of the key as a dictionary with "code", "files" and "error", None if it is not cached,
+        a broken entry is removed and counts as a miss
+
+        :param key: address from key()
+        """
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            # the time of the last use orders the entries for the eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            self.misses += 1
+            self.remove(path)
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key: str, code, files: dict, error=None):
+        """
+        It writes the entry to a temporary file and renames it, so a concurrent reader never sees half of it,
+        then it evicts the least recently used entries if the cache is too big, the entries are scanned only
+        when the running estimate of the size of the cache is over max_bytes (or after RESCAN_STORES stores)
+
+        :param key: address from key()
+        :param code: the generated code, None if the compilation failed
+        :param files: name of the output file -> its text
+        :param error: message of the error of a failed compilation (optional)
+        """
+        path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError:
+            # the cache is not writable, the compiler works without it
+            return
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                json.dump({"code": code, "files": files, "error": error}, f)
+                entry_size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError:
+            self.remove(tmp_path)
+            return
+        self.stores += 1
+        self.stores_since_scan += 1
+        if self.size is None or self.stores_since_scan >= RESCAN_STORES:
+            self.evict()
+            return
+        # a replaced entry is counted twice, the estimate is corrected by the scan of evict
+        self.size += entry_size
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> list:
+        """
+        It returns (time of the last use, size, path) of every entry
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*", "*.json")):
+            try:
+                status = os.stat(path)
+            except OSError:
+                # evicted by another process
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, path))
+        return entries
+
+    def stale_temporaries(self) -> list:
+        """
+        It returns the paths of the temporary files older than TMP_GRACE_SECONDS, they are never renamed
+        to an entry, younger ones may still be written by other processes
+        """
+        oldest = time.time() - TMP_GRACE_SECONDS
+        stale = []
+        for path in glob.glob(os.path.join(self.directory, "*", "*.tmp")):
+            try:
+                if os.stat(path).st_mtime < oldest:
+                    stale.append(path)
+            except OSError:
+                # renamed or removed by another process
+                continue
+        return stale
+
+    def evict(self):
+        """
+        It counts the size of the cache and removes the least recently used entries until it fits into max_bytes,
+        the stale temporary files are removed first
+        """
+        for path in self.stale_temporaries():
+            self.remove(path)
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        self.stores_since_scan = 0
+        if size > self.max_bytes:
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_bytes:
+                    break
+                if self.remove(path):
+                    self.evictions += 1
+                size -= entry_size
+        self.size = size
+
+    def remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def clear(self):
+        """
+        It removes all entries
+        """
+        for _, _, path in self.entries():
+            self.remove(path)
+        for path in self.stale_temporaries():
+            self.remove(path)
+        self.size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores, "evictions": self.evictions}
@@ -0,0 +1,205 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import os
+
+import src.pl0_code_generator as gen
+from src.generate_results import generate_output_files, save_generated_code, visualize_dst, output_file_names
+from src.pass_timer import PassTimer, NO_PASSES
+from src.trace_events import GENERATOR_SPANS, ANALYZER_SPANS, generator_span_name, analyzer_span_name
+from src.semantics_analyzer.analyzer import Analyzer
+from src.syntax_analyzer.symbol_table import generate_table_of_symbols
+from src.tables_cache import build_lexer_and_parser
+
+
+# > The Compiler is a long-lived compilation session, the lexer, the parser and the code generator
+# (with its dispatch tables) are built once and reused by every compilation.
+class Compiler:
+
+    def __init__(self, cache_dir=None, compile_cache=None) -> None:
+        """
+        It builds the lexer, the parser and the code generator.
+
+        :param cache_dir: root of the cache with lexer and parser tables, defaults to the user cache (optional)
+        :param compile_cache: CompileCache with the results of earlier compilations, an unchanged source
+                              is not compiled again (optional)
+        """
+        self.lexer, self.parser = build_lexer_and_parser(cache_dir)
+        self.generator = gen.Pl0(None, {})
+        self.compile_cache = compile_cache
+        # directory the last compilation wrote its output files to, None if it wrote none
+        self.output_dir = None
+
+    def compile_file(self, input_file_name: str, output_dir=None, show_tree_with_pyqt5=False, profile=False,
+                     passes=None) -> str:
+        """
+        It compiles the file and returns the generated PL/0 code
+
+        :param input_file_name: The name of the file to be compiled
+        :type input_file_name: str
+        :param output_dir: The directory where the output files will be saved, no files are written if None (optional)
+        :param show_tree_with_pyqt5: If True, the tree will be displayed using PyQt5, defaults to False (optional)
+        :param profile: If True, the profile of the run of the code is saved with the output files (optional)
+        :param passes: PassTimer that measures the phases of the compilation (optional)
+        """
+        with open(input_file_name) as f:
+            formatted_input_code = f.read()
+        return self.compile_source(formatted_input_code, output_dir=output_dir,
+                                   show_tree_with_pyqt5=show_tree_with_pyqt5, source_name=input_file_name,
+                                   profile=profile, passes=passes)
+
+    def compile_source(self, formatted_input_code: str, output_dir=None, show_tree_with_pyqt5=False,
+                       source_name="<input>", profile=False, passes=None) -> str:
+        """
+        It compiles the source code and returns the generated PL/0 code
+
+        :param formatted_input_code: The source code to be compiled
+        :type formatted_input_code: str
+        :param output_dir: The directory where the output files will be saved, no files are written if None (optional)
+        :param show_tree_with_pyqt5: If True, the tree will be displayed using PyQt5, defaults to False (optional)
+        :param source_name: name of the source used in error messages (optional)
+        :param profile: If True, the profile of the run of the code is saved with the output files (optional)
+        :param passes: PassTimer that measures the phases of the compilation (optional)
+        """
+        if passes is None:
+            passes = NO_PASSES
+        cache = self.compile_cache
+        if cache is None or show_tree_with_pyqt5:
+            return self.compile_uncached(formatted_input_code, output_dir, show_tree_with_pyqt5, source_name, profile,
+                                         passes)
+        with passes.phase("cache lookup"):
+            # the name of the source is a part of the error messages
+            key = cache.key(formatted_input_code, source_name=source_name, output=output_dir is not None,
+                            profile=profile)
+            entry = cache.load(key)
+        if entry is not None:
+            # the generator describes the cached compilation, not the last one that was not cached
+            self.generator.load_code(entry["code"] or "")
+            self.output_dir = os.path.join(output_dir, "output") if output_dir is not None and entry["files"] else None
+            return restore_cached(entry, output_dir)
+        try:
+            code = self.compile_uncached(formatted_input_code, output_dir, False, source_name, profile, passes)
+        except Exception as e:
+            # the errors of the source are plain exceptions, other ones may not happen the next time,
+            # the files written before the error are cached with it
+            if type(e) is Exception:
+                cache.store(key, None, self.written_files(profile), str(e))
+            raise
+        cache.store(key, code, self.written_files(profile))
+        return code
+
+    def written_files(self, profile) -> dict:
+        """
+        It returns name -> text of the output files the last compilation wrote
+
+        :param profile: If True, the code was profiled
+        """
+        files = {}
+        if self.output_dir is None:
+            return files
+        for name in output_file_names(self.generator, profile):
+            try:
+                with open(os.path.join(self.output_dir, name)) as f:
+                    files[name] = f.read()
+            except FileNotFoundError:
+                # the compilation failed before it wrote the file
+                continue
+        return files
+
+    def compile_uncached(self, formatted_input_code: str, output_dir, show_tree_with_pyqt5, source_name, profile,
+                         passes) -> tuple:
+        """
+        It runs all phases of the compiler and returns the generated PL/0 code, the directory of the output files
+        is kept in output_dir, the parameters are the ones of compile_source
+        """
+        self.output_dir = None
+        # Parsing the code_input, line numbers start again for every source.
+        self.lexer.lineno = 1
+        with passes.phase("parse"):
+            # the parser pulls the tokens from the lexer, so lexing is a part of parsing
+            token = counted_tokens(self.lexer, passes) if passes.enabled else None
+            dst = self.parser.parse(formatted_input_code, lexer=self.lexer, tokenfunc=token)
+        if dst is None:
+            raise Exception(f"Input file {source_name} contains an syntactical error. Compilation to PL0 is therefore not possible.")
+        # Generating a table of symbols.
+        table_of_symbols = {}
+        with passes.phase("symbols"):
+            generate_table_of_symbols(table_of_symbols, symbols=dst.get_leaves())
+        if passes.enabled:
+            passes.count("nodes", len(dst.preorder()))
+            passes.count("symbols", len(table_of_symbols) - 1 + sum(map(len, table_of_symbols["_scopes"])))
+
+        generated_code = self.generator
+        generated_code.reset(dst, table_of_symbols)
+
+        # Generating the output files.
+        if output_dir is not None:
+            with passes.phase("output files"):
+                output_dir = generate_output_files(dst, generated_code, output_dir)
+                self.output_dir = output_dir
+
+        # Showing the tree.
+        visualize_dst(dst, show_tree_with_pyqt5)
+
+        with passes.phase("semantics"):
+            semantics_analyzer = Analyzer(dst, table_of_symbols)
+            if passes.tracer is not None:
+                with passes.tracer.instrument(semantics_analyzer, ANALYZER_SPANS, "analyzer", analyzer_span_name):
+                    semantics_okay = semantics_analyzer.Analyze()
+            else:
+                semantics_okay = semantics_analyzer.Analyze()
+            if not semantics_okay:
+                raise Exception(f"Input file {source_name} contains semantical error. Compilation to PL0 is therefore not possible.")
+
+        # Generating the instructions for the PL/0 compiler.
+        with passes.phase("generator"):
+            if passes.tracer is not None:
+                with passes.tracer.instrument(generated_code, GENERATOR_SPANS, "generator", generator_span_name):
+                    generated_code.generate_instructions()
+            else:
+                generated_code.generate_instructions()
+        passes.count("instructions", len(generated_code.code))
+
+        # Saving the generated code to a file.
+        if output_dir is not None:
+            with passes.phase("save code"):
+                save_generated_code(generated_code, formatted_input_code, output_dir, profile=profile, passes=passes)
+
+        return generated_code.return_code()
+
+
+def restore_cached(entry: dict, output_dir):
+    """
+    It writes the cached output files to the output directory, it returns the cached code
+    or raises the cached error of the compilation (after the files written before the error)
+
+    :param entry: entry of CompileCache
+    :param output_dir: The directory where the output files are saved, None if no files are written
+    """
+    if output_dir is not None and entry["files"]:
+        output_dir = os.path.join(output_dir, "output")
+        os.makedirs(output_dir, exist_ok=True)
+        for name, text in entry["files"].items():
+            with open(os.path.join(output_dir, name), mode="w") as f:
+                f.write(text)
+    if entry["error"] is not None:
+        raise Exception(entry["error"])
+    return entry["code"]
+
+
+def counted_tokens(lexer, passes: PassTimer):
+    """
+    It returns the token function of the lexer that counts the tokens it returns
+
+    :param lexer: PLY lexer
+    :param passes: PassTimer that keeps the count
+    """
+    next_token = lexer.token
+
+    def token():
+        result = next_token()
+        if result is not None:
+            passes.count("tokens", 1)
+        return result
+
+    return token
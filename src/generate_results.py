@@ -3,7 +3,25 @@
 #
 import os
 
-from src.pl0_vm.p_machine import run_pl0_code
+from src.pass_timer import NO_PASSES
+
+# names of the output files, the tree files are written always, the code files if some code was generated
+# and the profile files on top of them if the code is profiled
+TREE_FILES = ("full_tree.txt", "tree.txt", "symbol_table.txt")
+CODE_FILES = ("generated_code_only.txt", "generated_code_with_input.txt")
+PROFILE_FILES = ("profile.json", "profile_listing.txt", "line_table.txt", "profile_source.txt")
+
+
+def output_file_names(generated_code, profile=False) -> tuple:
+    """
+    It returns the names of the files written to the output directory by the compilation of the code
+
+    :param generated_code: The code that was generated by the model
+    :param profile: If True, the code was profiled (optional)
+    """
+    if len(generated_code.code) == 0:
+        return TREE_FILES
+    return TREE_FILES + CODE_FILES + (PROFILE_FILES if profile else ())
 
 
 def generate_output_files(dst, generated_code, output_dir):
@@ -19,7 +37,7 @@ def generate_output_files(dst, generated_code, output_dir):
         os.mkdir(output_dir + "output")
     output_dir += "output"
     with open(output_dir + "/full_tree.txt", mode="w") as tree:
-        tree.writelines(dst.get_ascii(attributes=["name", "dist", "label", "complex"]))
+        tree.writelines(dst.get_ascii(attributes=["name", "lineno"]))
     with open(output_dir + "/tree.txt", mode="w") as tree:
         tree.writelines(str(dst))
     with open(output_dir + "/symbol_table.txt", mode="w") as table:
@@ -35,28 +53,74 @@ def visualize_dst(dst, show_tree_with_pyqt5):
         tree_style.show_leaf_name = True
         tree_style.mode = "c"
         tree_style.arc_start = -180  # 0 degrees = 3 o'clock
-        dst.show(
+        to_ete_tree(dst).show(
             tree_style=tree_style
         )
 
 
-def save_generated_code(generated_code, formatted_input_code, output_dir):
+def to_ete_tree(dst):
+    """
+    It copies the syntax tree to ete3 Tree, ete3 is imported only here because it is needed just for the visualization
+
+    :param dst: syntax tree
+    """
+    from ete3 import Tree
+    root = Tree(name=dst.name)
+    to_copy = [(dst, root)]
+    while to_copy:
+        node, ete_node = to_copy.pop()
+        ete_node.add_feature("lineno", node.lineno)
+        for child in node.children:
+            to_copy.append((child, ete_node.add_child(name=child.name)))
+    return root
+
+
+def save_generated_code(generated_code, formatted_input_code, output_dir, profile=False, passes=None):
     """
     It saves the generated code to a file
 
     :param generated_code: The code that was generated by the model
     :param formatted_input_code: The input code, formatted with the correct indentation
+    :param profile: If True, the code is run once more by the profiler and its results are saved too (optional)
+    :param passes: PassTimer that measures the run of the code and the profiler as nested phases (optional)
     """
-    if generated_code.return_code() != "":
-        # Writing the generated code to a file.
+    if passes is None:
+        passes = NO_PASSES
+    if len(generated_code.code) > 0:
+        from src.pl0_vm.p_machine import run_pl0_code
+        # Writing the generated code to a file, the code is rendered once and the text is reused.
         with open(output_dir + "/generated_code_only.txt", mode="w") as txt:
-            txt.writelines(generated_code.return_code())
+            txt.write(generated_code.return_code())
         with open(output_dir + "/generated_code_with_input.txt", mode="w") as txt:
             txt.writelines("----------input code----------------\n")
             txt.writelines(formatted_input_code)
             txt.writelines("\n")
             txt.writelines("----------generated code------------\n")
-            txt.writelines(generated_code.return_code())
+            generated_code.write_code(txt)
             txt.writelines("-------------PL/0 start-------------\n")
-            txt.writelines(run_pl0_code(generated_code.code))
-            txt.writelines("------------------------------------")
\ No newline at end of file
+            with passes.phase("run"):
+                txt.writelines(run_pl0_code(generated_code.code))
+            txt.writelines("------------------------------------")
+        if profile:
+            with passes.phase("profile"):
+                save_profile(generated_code, formatted_input_code, output_dir)
+
+
+def save_profile(generated_code, formatted_input_code, output_dir):
+    """
+    It runs the generated code with the profiler, it saves the counts as json, the annotated listing of the code,
+    the line table of the generator and the source annotated with the counts of its lines
+
+    :param generated_code: The code that was generated by the model
+    :param formatted_input_code: The input code the counts of lines are put in front of
+    """
+    from src.pl0_vm.profiler import profile
+    _, result = profile(generated_code.code, timed=True)
+    with open(output_dir + "/profile.json", mode="w") as txt:
+        txt.write(result.to_json(line_table=generated_code.lines, function_names=generated_code.function_names()))
+    with open(output_dir + "/profile_listing.txt", mode="w") as txt:
+        txt.write(result.annotated_listing())
+    with open(output_dir + "/line_table.txt", mode="w") as txt:
+        txt.writelines(line + "\n" for line in generated_code.lines.render())
+    with open(output_dir + "/profile_source.txt", mode="w") as txt:
+        txt.write(result.annotated_source(formatted_input_code, generated_code.lines))
@@ -0,0 +1,151 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class PassRecord:
+    """
+    It is one run of a phase of the compiler, its depth in the nested phases, wall and cpu time in seconds,
+    the peak of traced memory and the change of traced memory in bytes (None if memory is not traced)
+    """
+    __slots__ = ("name", "depth", "wall", "cpu", "peak", "allocated")
+
+    def __init__(self, name: str, depth: int) -> None:
+        self.name = name
+        self.depth = depth
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = None
+        self.allocated = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "depth": self.depth, "wall": self.wall, "cpu": self.cpu,
+                "peak": self.peak, "allocated": self.allocated}
+
+
+# > The PassTimer measures the phases of the compiler (--time-passes and --mem-passes), every phase is a with block,
+# the phases can be nested and the counts (tokens, nodes of the tree, symbols, instructions) are kept with them.
+class PassTimer:
+
+    def __init__(self, time_passes=True, mem_passes=False, tracer=None) -> None:
+        """
+        :param time_passes: If True, wall and cpu time of the phases are measured (optional)
+        :param mem_passes: If True, the memory is traced by tracemalloc, it slows the compiler down (optional)
+        :param tracer: Tracer that gets a span of every phase and of the traced methods of the phases (optional)
+        """
+        self.time_passes = time_passes
+        self.mem_passes = mem_passes
+        self.tracer = tracer
+        self.records = []
+        self.counts = {}
+        # peaks of the open phases, an inner phase resets the peak of tracemalloc
+        self.open_peaks = []
+        self.started_tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.time_passes or self.mem_passes or self.tracer is not None
+
+    def __enter__(self) -> "PassTimer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stop(self):
+        """
+        It stops tracemalloc if the timer has started it
+        """
+        if self.started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def phase(self, name: str):
+        """
+        It returns the context manager that measures the phase, nothing is measured if the timer is disabled
+
+        :param name: name of the phase
+        """
+        if not self.enabled:
+            return nullcontext()
+        if self.tracer is not None:
+            return self.traced_measure(name)
+        return self.measure(name)
+
+    @contextmanager
+    def traced_measure(self, name: str):
+        with self.tracer.span(name, "phase"), self.measure(name) as record:
+            yield record
+
+    @contextmanager
+    def measure(self, name: str):
+        record = PassRecord(name, len(self.open_peaks))
+        self.records.append(record)
+        if self.mem_passes:
+            # tracemalloc (and pickle it imports) is loaded only when the memory is traced
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self.open_peaks:
+                self.open_peaks[-1] = max(self.open_peaks[-1], peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        self.open_peaks.append(0)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - start_wall
+            record.cpu = time.process_time() - start_cpu
+            peak = self.open_peaks.pop()
+            if self.mem_passes:
+                current, traced_peak = tracemalloc.get_traced_memory()
+                record.peak = max(peak, traced_peak)
+                record.allocated = current - start_memory
+                if self.open_peaks:
+                    self.open_peaks[-1] = max(self.open_peaks[-1], record.peak)
+
+    def count(self, name: str, value: int):
+        """
+        It adds the value to the count, counts are kept only if the timer is enabled
+
+        :param name: name of the count
+        :param value: number added to the count
+        """
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        return {"phases": [record.to_dict() for record in self.records], "counts": dict(self.counts)}
+
+    def to_json(self, indent=2) -> str:
+        import json
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def report(self) -> str:
+        """
+        It returns the phases as a table, the share is the share of the wall time of all outermost phases
+        """
+        total = sum(record.wall for record in self.records if record.depth == 0) or 1.0
+        header = f"{'wall [s]':>10} {'cpu [s]':>10} {'share':>7}"
+        if self.mem_passes:
+            header += f" {'peak [KiB]':>11} {'alloc [KiB]':>11}"
+        lines = [header + "  phase"]
+        for record in self.records:
+            line = f"{record.wall:10.4f} {record.cpu:10.4f} {100 * record.wall / total:6.1f}%"
+            if self.mem_passes:
+                line += f" {record.peak / 1024:11.1f} {record.allocated / 1024:11.1f}"
+            lines.append(line + "  " + "  " * record.depth + record.name)
+        for name, value in self.counts.items():
+            lines.append(f"{value:>10} {name}")
+        return "\n".join(lines) + "\n"
+
+
+# the timer of compilations that are not measured
+NO_PASSES = PassTimer(time_passes=False)
@@ -0,0 +1,128 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from array import array
+from itertools import islice
+
+from src.pl0_code_generator.instructions import INST_NAMES
+
+
+# > The InstructionBuffer holds the generated code in three parallel arrays of machine integers,
+# so no Python objects are allocated for an instruction.
+class InstructionBuffer:
+    __slots__ = ("opcodes", "levels", "operands", "text")
+
+    def __init__(self) -> None:
+        # integer opcodes, see INST_NAMES
+        self.opcodes = array("b")
+        # first parameters of the instructions (level)
+        self.levels = array("i")
+        # second parameters of the instructions (constant, address, operation)
+        self.operands = array("q")
+        # rendered text of the code, None until it is rendered or after the code changes
+        self.text = None
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __getitem__(self, index) -> tuple:
+        return self.opcodes[index], self.levels[index], self.operands[index]
+
+    def __iter__(self):
+        """
+        It iterates over the instructions as (opcode, level, operand) tuples
+        """
+        return zip(self.opcodes, self.levels, self.operands)
+
+    def append(self, opcode: int, level: int, operand: int):
+        """
+        It appends an instruction to the end of the buffer
+
+        :param opcode: integer opcode of the instruction
+        :param level: the first parameter of the instruction
+        :param operand: the second parameter of the instruction
+        """
+        self.text = None
+        # the operand first, an operand out of the range of int64 raises OverflowError before the buffer changes
+        self.operands.append(operand)
+        self.opcodes.append(opcode)
+        self.levels.append(level)
+
+    def patch(self, index: int, operand: int):
+        """
+        It replaces the operand of an already emitted instruction (jump or call target)
+
+        :param index: index of the instruction
+        :param operand: the new second parameter of the instruction
+        """
+        self.text = None
+        self.operands[index] = operand
+
+    def copy(self) -> "InstructionBuffer":
+        """
+        It returns a new buffer with the same instructions
+        """
+        duplicate = InstructionBuffer()
+        duplicate.opcodes.extend(self.opcodes)
+        duplicate.levels.extend(self.levels)
+        duplicate.operands.extend(self.operands)
+        duplicate.text = self.text
+        return duplicate
+
+    def clear(self):
+        """
+        It removes all instructions
+        """
+        self.text = None
+        del self.opcodes[:]
+        del self.levels[:]
+        del self.operands[:]
+
+    def load_text(self, text: str):
+        """
+        It replaces the instructions with the ones of the rendered text (to_text), the text is kept as the cache
+
+        :param text: lines in the format of "index opcode level operand"
+        """
+        self.clear()
+        opcodes = {name: opcode for opcode, name in enumerate(INST_NAMES)}
+        for line in text.splitlines():
+            _, name, level, operand = line.split()
+            self.opcodes.append(opcodes[name])
+            self.levels.append(int(level))
+            self.operands.append(int(operand))
+        self.text = text
+
+    def render(self):
+        """
+        It yields the instructions as text lines in the format of "index opcode level operand"
+        """
+        names = INST_NAMES
+        for index, (opcode, level, operand) in enumerate(zip(self.opcodes, self.levels, self.operands)):
+            yield f"{index} {names[opcode]} {level} {operand}"
+
+    def to_text(self) -> str:
+        """
+        It renders the whole code at once, the text is cached until the code changes
+        """
+        if self.text is None:
+            self.text = "".join(line + "\n" for line in self.render())
+        return self.text
+
+    def write(self, file, chunk_lines=4096):
+        """
+        It writes the code to the file object (or sys.stdout), the cached text is written as it is,
+        otherwise the code is rendered in chunks, so the whole text is never held in memory
+
+        :param file: object with a write method
+        :param chunk_lines: number of lines rendered at once (optional)
+        """
+        if self.text is not None:
+            file.write(self.text)
+            return
+        lines = self.render()
+        while True:
+            chunk = "".join(line + "\n" for line in islice(lines, chunk_lines))
+            if not chunk:
+                break
+            file.write(chunk)
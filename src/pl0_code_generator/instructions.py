@@ -17,6 +17,12 @@ class Inst(Enum):
     jmc = "JMC"
 
 
+# integer opcodes of the instructions, the opcode is the index of the name in INST_NAMES
+LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC = range(len(Inst))
+INST_NAMES = tuple(instruction.value for instruction in Inst)
+OPCODES = {instruction: opcode for opcode, instruction in enumerate(Inst)}
+
+
 # The Op class is an enumeration of the possible operations that can be performed on the stack.
 class Op(Enum):
     """
@@ -0,0 +1,15 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+
+
+# > The Label is a target of jumps in the generated code.
+# Jumps emitted before the address of the label is known are remembered as fixups and patched once it is placed.
+class Label:
+    __slots__ = ("address", "fixups")
+
+    def __init__(self) -> None:
+        # address of the target instruction, None until the label is placed
+        self.address = None
+        # indexes of instructions whose operand is the address of this label
+        self.fixups = []
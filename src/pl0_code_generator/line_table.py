@@ -0,0 +1,88 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from array import array
+from bisect import bisect_right
+
+
+# > The LineTable maps addresses of the generated code to lines of the source, it keeps only the addresses
+# where the line changes (in two parallel arrays), so it has one entry per statement, not per instruction.
+class LineTable:
+    __slots__ = ("addresses", "lines")
+
+    def __init__(self) -> None:
+        # first addresses of the runs of instructions generated for one line
+        self.addresses = array("i")
+        # line of every run, 0 for the code the generator adds on its own (start of the program)
+        self.lines = array("i")
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __iter__(self):
+        """
+        It iterates over the runs as (first address, line) tuples
+        """
+        return zip(self.addresses, self.lines)
+
+    def mark(self, address: int, line: int):
+        """
+        It starts a run of the line at the address, the instructions up to the next mark belong to the line
+
+        :param address: address of the next generated instruction
+        :param line: line of the source
+        """
+        if self.lines and self.lines[-1] == line:
+            return
+        if self.addresses and self.addresses[-1] == address:
+            # the previous run is empty
+            self.addresses.pop()
+            self.lines.pop()
+            if self.lines and self.lines[-1] == line:
+                return
+        self.addresses.append(address)
+        self.lines.append(line)
+
+    def line_of(self, address: int) -> int:
+        """
+        It returns the line of the instruction at the address, 0 if it has no line
+
+        :param address: address of the instruction
+        """
+        run = bisect_right(self.addresses, address) - 1
+        return self.lines[run] if run >= 0 else 0
+
+    def expand(self, code_length: int) -> list:
+        """
+        It returns the line of every address of the code
+
+        :param code_length: number of instructions of the code
+        """
+        lines = [0] * code_length
+        ends = list(self.addresses[1:]) + [code_length]
+        for address, end, line in zip(self.addresses, ends, self.lines):
+            lines[address:end] = [line] * (max(min(end, code_length) - address, 0))
+        return lines
+
+    def copy(self) -> "LineTable":
+        """
+        It returns a new table with the same runs
+        """
+        duplicate = LineTable()
+        duplicate.addresses.extend(self.addresses)
+        duplicate.lines.extend(self.lines)
+        return duplicate
+
+    def clear(self):
+        """
+        It removes all runs
+        """
+        del self.addresses[:]
+        del self.lines[:]
+
+    def render(self):
+        """
+        It yields the runs as text lines in the format of "address line"
+        """
+        for address, line in zip(self.addresses, self.lines):
+            yield f"{address} {line}"
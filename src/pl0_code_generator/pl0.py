@@ -3,22 +3,22 @@
 #
 from copy import copy
 
-from ete3 import Tree
-
 from src.pl0_code_generator.instructions import Inst
+from src.pl0_code_generator.label import Label
 from src.pl0_code_generator.pl0_parent import Pl0Parent
-from src.syntax_analyzer.symbol_table import find_real_level, find_entry_in_symbol_table
+from src.syntax_analyzer.ast_node import AstNode
+from src.syntax_analyzer.symbol_table import find_real_level, find_scope, find_entry_in_symbol_table
 
 
 # > The class Pl0 is a class that represents a PL/0 program
 class Pl0(Pl0Parent):
 
-    def __init__(self, abstract_syntax_tree: Tree, symbol_table) -> None:
+    def __init__(self, abstract_syntax_tree: AstNode, symbol_table) -> None:
         """
         The function takes in an abstract syntax tree and initializes the code, ast, and stck attributes.
 
         :param abstract_syntax_tree: This is the abstract syntax tree that was generated by the parser
-        :type abstract_syntax_tree: Tree
+        :type abstract_syntax_tree: AstNode
         """
         super().__init__(abstract_syntax_tree, symbol_table)
 
@@ -28,7 +28,7 @@ class Pl0(Pl0Parent):
         """
         self.generate_instruction(self.inst(Inst.int), 0, 3)
         self.allocate_variables()
-        self.generate_code(sub_tree=self.clear_tree(self.ast.iter_prepostorder()), symbol_table=self.symbol_table)
+        self.generate_code(sub_tree=self.ast.preorder(), symbol_table=self.symbol_table)
         # end of code
         self.generate_instruction(self.inst(Inst.ret), 0, 0)
         self.correct_func_call_jmp()
@@ -45,8 +45,11 @@ class Pl0(Pl0Parent):
         sub_tree = list(sub_tree)
         index = 0
         while index < len(sub_tree):
+            #  generates statements of the program or of a block one by one
+            if sub_tree[index].name in self.sequences:
+                index += self.gen_sequence(sub_tree[index], level=level, symbol_table=symbol_table) - 1
             #  generates expression_term statements
-            if sub_tree[index].name in self.expressions:
+            elif sub_tree[index].name in self.expressions:
                 index = self.gen_expression(sub_tree, index, symbol_table=symbol_table, level=level)
             #  generates variable declaration statements
             elif sub_tree[index].name == "var_declaration_expression":
@@ -80,6 +83,28 @@ class Pl0(Pl0Parent):
             #  update index
             index += 1
 
+    def gen_sequence(self, sequence, level=0, symbol_table=None):
+        """
+        It generates the statements of the sequence, every statement gets its own part of the tree,
+        so the index of one statement never runs into the next one
+
+        :param sequence: node whose children are the statements
+        :param level: the level of the current node in the tree, defaults to 0 (optional)
+        :param symbol_table: a dictionary that maps variable names to their values
+        :return: number of nodes of the sequence subtree
+        """
+        size = 1
+        lines = self.lines
+        # the code after the nested statements (jumps of loops, return of functions) belongs to the enclosing one
+        enclosing_line = lines.lines[-1] if lines.lines else 0
+        for statement in sequence.children:
+            statement_tree = statement.preorder()
+            lines.mark(len(self.code), statement_line(statement_tree, enclosing_line))
+            self.generate_code(sub_tree=statement_tree, level=level, symbol_table=symbol_table)
+            size += len(statement_tree)
+        lines.mark(len(self.code), enclosing_line)
+        return size
+
     def gen_while_loop_block(self, sub_tree, index, symbol_table=None, level=0, ):
         """
         It generates the code for a while loop block
@@ -93,19 +118,13 @@ class Pl0(Pl0Parent):
         body = sub_tree[index].children[1]
 
         start_address = len(self.code)
+        loop_end = self.start_condition()
         _, index, level = self.gen_condition(condition, index, level, symbol_table=symbol_table)
-
-        x = id("x" + str(level))
-        self.correct_jmc_for_logical_condition(x)
-        self.generate_instruction(self.inst(Inst.jmc), 0, x)
+        self.gen_condition_jump(loop_end)
 
         index, level = self.generate_code_again(index, level, symbol_table, body)
-        for i in self.code:
-            if i[2] == x:
-                jmc_address = len(self.code)
-
-                i[2] = jmc_address + 1
         self.generate_instruction(self.inst(Inst.jmp), 0, start_address)
+        self.place_label(loop_end)
         return index, level
 
     def gen_repeat_loop_block(self, sub_tree, index, symbol_table=None, level=0):
@@ -123,10 +142,11 @@ class Pl0(Pl0Parent):
         start_address = len(self.code)
         index, level = self.generate_code_again(index, level, symbol_table, body)
 
+        loop_end = self.start_condition()
         _, index, level = self.gen_condition(condition, index, level, symbol_table=symbol_table)
-        self.correct_jmc_for_logical_condition(len(self.code) + 2)
-        self.generate_instruction(self.inst(Inst.jmc), 0, len(self.code) + 2)
+        self.gen_condition_jump(loop_end)
         self.generate_instruction(self.inst(Inst.jmp), 0, start_address)
+        self.place_label(loop_end)
         return index, level
 
     def gen_for_loop_block(self, sub_tree, index, symbol_table=None, level=0):
@@ -145,20 +165,14 @@ class Pl0(Pl0Parent):
 
         index, level = self.generate_code_again(index, level, symbol_table, loop_var)
         start_address = len(self.code)
+        loop_end = self.start_condition()
         _, index, level = self.gen_condition(condition, index, level, symbol_table=symbol_table)
-
-        x = id("x" + str(level))
-        self.correct_jmc_for_logical_condition(x)
-        self.generate_instruction(self.inst(Inst.jmc), 0, x)
+        self.gen_condition_jump(loop_end)
 
         index, level = self.generate_code_again(index, level, symbol_table, body)
         index, level = self.generate_code_again(index, level, symbol_table, loop_step)
-        for i in self.code:
-            if i[2] == x:
-                jmc_address = len(self.code)
-
-                i[2] = jmc_address + 1
         self.generate_instruction(self.inst(Inst.jmp), 0, start_address)
+        self.place_label(loop_end)
         return index, level
 
     def gen_function_signature(self, sub_tree, index, symbol_table=None, level=0):
@@ -170,21 +184,19 @@ class Pl0(Pl0Parent):
         :param symbol_table: The symbol table that the function is being added to
         :param level: the level of the function in the tree, defaults to 0 (optional)
         """
-        old_scope = self.current_scope
-        self.curr_func_name = sub_tree[index].children[0].name
-        self.current_scope = sub_tree[index].children[0].name
-        y = id("y" + str(self.curr_func_name))
-        self.generate_instruction(self.inst(Inst.jmp), 0, y)
-        self.symbol_table[self.curr_func_name].address = len(self.code)
+        function_name = sub_tree[index].children[0].name
+        function_end = Label()
+        self.generate_jump(self.inst(Inst.jmp), function_end)
+        self.symbol_table[function_name].address = len(self.code)
         func_block = sub_tree[index].children[3].children[0]
-        sub_sub_tree = self.clear_tree(func_block.iter_prepostorder())
-        index += len(self.clear_tree(sub_tree[index].iter_prepostorder())) - len(sub_sub_tree)
+        sub_sub_tree = func_block.preorder()
+        index += len(sub_tree[index].preorder()) - len(sub_sub_tree)
         params = {}
         locals = []
-        if symbol_table[self.curr_func_name].params is not None:
-            params.update(symbol_table[self.curr_func_name].params)
-        if symbol_table[self.curr_func_name].locals is not None:
-            locals = symbol_table[self.curr_func_name].locals
+        if symbol_table[function_name].params is not None:
+            params.update(symbol_table[function_name].params)
+        if symbol_table[function_name].locals is not None:
+            locals = symbol_table[function_name].locals
         # [JT] evaluate function parameters first
         for new_addr, i in enumerate(params.values()):
             i.level = level
@@ -198,20 +210,16 @@ class Pl0(Pl0Parent):
             locals_parent_scope_var_count += len(current_block)
 
         self.generate_instruction(self.inst(Inst.int), 0, 3)
-        for i in range(len(symbol_table[self.curr_func_name].params), 0, -1):
+        for i in range(len(symbol_table[function_name].params), 0, -1):
             self.generate_instruction(self.inst(Inst.lod), level, -i)
         # allocates memory for local vars and lets
-        self.generate_instruction(self.inst(Inst.int), 0, len(locals))
+        self.generate_instruction(self.inst(Inst.int), 0, locals_parent_scope_var_count)
         self.generate_code(sub_tree=sub_sub_tree, level=level,
                            symbol_table=symbol_table)
         index += len(sub_sub_tree)
-        self.generate_instruction(self.inst(Inst.sto), level, - 1 - (len(symbol_table[self.curr_func_name].params)))
+        self.generate_instruction(self.inst(Inst.sto), level, - 1 - (len(symbol_table[function_name].params)))
         self.generate_instruction(self.inst(Inst.ret), 0, 0)
-        for i in self.code:
-            if i[2] == y:
-                i[2] = len(self.code)
-        # [JT] restore previous scope when we are done with function
-        self.current_scope = old_scope
+        self.place_label(function_end)
         return index, level
 
     def gen_var_declaration_expression(self, sub_tree, index, symbol_table=None, level=0):
@@ -224,7 +232,7 @@ class Pl0(Pl0Parent):
         :param level: the level of the current scope, defaults to 0 (optional)
         """
         name = sub_tree[index].children[0].name
-        sub_sub_tree = self.clear_tree(sub_tree[index].children[2].iter_prepostorder())
+        sub_sub_tree = sub_tree[index].children[2].preorder()
         if sub_tree[index].children[2].name == "const_expression_term":
             index += 2
         # shifting index to skip duplicates
@@ -234,7 +242,7 @@ class Pl0(Pl0Parent):
         real_level = find_real_level(sub_tree, index)
         # [JT] find the entry in the symbol table by going bottom up in the stack of scopes in scope defined by
         # @param level
-        symbol_table_entry = find_entry_in_symbol_table(symbol_table, self.current_scope, real_level, name)
+        symbol_table_entry = find_entry_in_symbol_table(symbol_table, find_scope(sub_tree, index), real_level, name)
         self.store_var(symbol_table_entry)
         index += len(sub_sub_tree)
         return index, level
@@ -250,7 +258,7 @@ class Pl0(Pl0Parent):
         :param make_negation: If True, the condition will be negated, defaults to False (optional)
         """
         if "negation_condition" in condition.name:
-            condition.name = "compound_condition"
+            condition.kind = "compound_condition"
             # generates next condition(s)
             _, index, level = self.gen_condition(condition, index, level, symbol_table,
                                                  make_negation=True)
@@ -278,13 +286,11 @@ class Pl0(Pl0Parent):
                 return False, index, level
             if len(condition.children) > 2:
                 if condition.children[shift].name == "&&":
-                    and_mark = "and_mark"
-                    self.generate_instruction(self.inst(Inst.jmc), 0, and_mark)
+                    self.generate_jump(self.inst(Inst.jmc), self.condition_false)
                 elif condition.children[shift].name == "||":
-                    or_mark = "or_mark"
                     self.generate_instruction(self.inst(Inst.lit), 0, -1)
                     self.generate_instruction(self.inst(Inst.opr), 0, 2)
-                    self.generate_instruction(self.inst(Inst.jmc), 0, or_mark)
+                    self.generate_jump(self.inst(Inst.jmc), self.condition_true)
                 # generates next condition(s)
                 _, index, level = self.gen_condition(condition.children[shift + 1], index, level, symbol_table)
                 return True, index, level
@@ -303,10 +309,12 @@ class Pl0(Pl0Parent):
 
         while i < (len(sub_tree)):
             if sub_tree[i].name == "function_call":
-                sub_sub_tree = self.clear_tree(sub_tree[i].iter_prepostorder())
+                sub_sub_tree = sub_tree[i].preorder()
                 f_name = sub_tree[i].children[0].name
                 f_args = sub_tree[i].children[1]
                 args_len = 0
+                # slot for the return value, the function stores its result below the arguments
+                self.generate_instruction(self.inst(Inst.int), 0, 1)
                 while f_args.name == "arguments_list":
                     if f_args.children[0].get_leaf_names()[0] in symbol_table.keys():
                         self.gen_load_symbol(symbol_table[f_args.children[0].get_leaf_names()[0]])
@@ -314,7 +322,7 @@ class Pl0(Pl0Parent):
                     else:
                         self.gen_const(f_args.children[0].get_leaf_names()[0])
                         args_len += 1
-                    f_args = copy(f_args.children[1])
+                    f_args = f_args.children[1]
 
                 if f_args.children[0].get_leaf_names()[0] in symbol_table.keys():
                     self.gen_load_symbol(symbol_table[f_args.children[0].get_leaf_names()[0]])
@@ -324,7 +332,7 @@ class Pl0(Pl0Parent):
                     args_len += 1
                 i += len(sub_sub_tree)
                 func_len = i
-                self.generate_instruction(self.inst(Inst.cal), level, symbol_table[f_name].id)
+                self.generate_call(f_name, level)
                 if args_len > 0:
                     self.generate_instruction(self.inst(Inst.int), 0, -args_len)
             i += 1
@@ -343,6 +351,7 @@ class Pl0(Pl0Parent):
         :param symbol_table: a dictionary of variables and their values
         """
         real_level = find_real_level(sub_tree, index)
+        scope = find_scope(sub_tree, index)
         func_len = self.gen_func_call(sub_tree, symbol_table=symbol_table, level=level)
         if func_len is not None:
             return func_len
@@ -361,23 +370,25 @@ class Pl0(Pl0Parent):
             sub_sub_tree = sub_tree[0].get_common_ancestor(leaves[0], leaves[1])
             # shifting index to skip duplicates
             # recursive call
-            index = self.gen_expression(sub_tree=self.clear_tree(sub_sub_tree.iter_prepostorder()), index=index,
+            index = self.gen_expression(sub_tree=sub_sub_tree.preorder(), index=index,
                                         symbol_table=symbol_table, level=level, )
             for i in range(2, len(leaf_names)):
                 parent = sub_tree[0].get_common_ancestor(sub_sub_tree, leaves[i])
-                self.expressions[parent.name](leaf_names[i], symbol_table=symbol_table, real_level=real_level)
+                self.expressions[parent.name](leaf_names[i], symbol_table=symbol_table, real_level=real_level,
+                                              scope=scope)
             index += len(sub_tree)
 
         elif sub_tree[index].name == "const_expression_term":
             self.expressions[sub_tree[index].name](leaf_names[0], symbol_table=symbol_table)
 
         elif sub_tree[index].name == "expression_term":
-            self.expressions[sub_tree[index].name](leaf_names[0], symbol_table=symbol_table, real_level=real_level)
+            self.expressions[sub_tree[index].name](leaf_names[0], symbol_table=symbol_table, real_level=real_level,
+                                                   scope=scope)
             if sub_tree[index].children[0].name == "const_expression_term":
                 index += len(sub_tree)
         else:
             self.expressions[sub_tree[index].name](leaf_names[0], leaf_names[1], symbol_table=symbol_table,
-                                                   real_level=real_level)
+                                                   real_level=real_level, scope=scope)
             index += 2
         return index
 
@@ -394,7 +405,7 @@ class Pl0(Pl0Parent):
         oper_and_equals = sub_tree[index].children[1]
         # [JT] calculate real level of indentation and find the symbol in symbol table
         real_level = find_real_level(sub_tree, index)
-        symbol = find_entry_in_symbol_table(symbol_table, self.current_scope, real_level, symbol_name)
+        symbol = find_entry_in_symbol_table(symbol_table, find_scope(sub_tree, index), real_level, symbol_name)
 
         if sub_tree[index].name == "loop_step":
             self.gen_const(sub_tree[index].children[2].get_leaf_names()[0], symbol_table)
@@ -405,7 +416,7 @@ class Pl0(Pl0Parent):
             self.gen_load_symbol(symbol)
         # shifting index to skip duplicates
         # recursive call
-        self.generate_code(sub_tree=oper_and_equals, level=level + 1)
+        self.generate_code(sub_tree=oper_and_equals.get_leaves(), level=level + 1)
         index += 1
         self.store_var(symbol)
         return index, level
@@ -425,35 +436,29 @@ class Pl0(Pl0Parent):
         if sub_tree[index].name == "if_else_stmt" or sub_tree[index].name == "ternary_operator":
             block2 = sub_tree[index].children[2]
         if "condition" in condition.name:
+            else_label = self.start_condition()
             _, index, level = self.gen_condition(condition, index, level, symbol_table=symbol_table)
-            x = id("x" + str(level))
-            self.correct_jmc_for_logical_condition(x)
-            index += len(self.clear_tree(condition.iter_prepostorder()))
+            index += len(condition.preorder())
             # block 1
-            sub_sub_tree = self.clear_tree(block1.iter_prepostorder())
+            sub_sub_tree = block1.preorder()
             # shifting index to skip duplicates
             # recursive call
-            self.generate_instruction(self.inst(Inst.jmc), 0, x)
+            self.gen_condition_jump(else_label)
             self.generate_code(sub_tree=sub_sub_tree, level=level + 1, symbol_table=symbol_table)
             index += len(sub_sub_tree)
-            for i in self.code:
-                if i[2] == x:
-                    jmc_address = len(self.code)
-                    if block2 is not None:
-                        jmc_address += 1
-                    i[2] = jmc_address
             if block2 is not None:
                 # block 2
-                sub_sub_tree = self.clear_tree(block2.iter_prepostorder())
+                sub_sub_tree = block2.preorder()
                 # shifting index to skip duplicates
                 # recursive call
-                y = id("y" + str(level))
-                self.generate_instruction(self.inst(Inst.jmp), 0, y)
+                if_end = Label()
+                self.generate_jump(self.inst(Inst.jmp), if_end)
+                self.place_label(else_label)
                 self.generate_code(sub_tree=sub_sub_tree, level=level + 1, symbol_table=symbol_table)
                 index += len(sub_sub_tree)
-                for i in self.code:
-                    if i[2] == y:
-                        i[2] = len(self.code)
+                self.place_label(if_end)
+            else:
+                self.place_label(else_label)
         return index, level
 
     def generate_code_again(self, index, level, symbol_table, sub_tree):
@@ -465,7 +470,7 @@ class Pl0(Pl0Parent):
         :param symbol_table: a dictionary that maps variable names to their values
         :param sub_tree: the subtree of the AST that we are currently generating code for
         """
-        sub_sub_tree = self.clear_tree(sub_tree.iter_prepostorder())
+        sub_sub_tree = sub_tree.preorder()
         # shifting index to skip duplicates
         # recursive call
         self.generate_code(sub_tree=sub_sub_tree, level=level, symbol_table=symbol_table)
@@ -474,17 +479,14 @@ class Pl0(Pl0Parent):
 
     def correct_func_call_jmp(self):
         """
-        support of function call before declaration
+        support of function call before declaration, CAL instructions from the relocation table get
+        the addresses of the functions
         """
-        functions_dict = {}
         self.symbol_table.pop("_scopes")
-        for key in self.symbol_table:
-            if self.symbol_table[key].type == "func":
-                functions_dict[self.symbol_table[key].id] = self.symbol_table[key].address
-
-        for i in self.code:
-            if i[2] in functions_dict.keys():
-                i[2] = functions_dict[i[2]]
+        for function_name, call_sites in self.call_sites.items():
+            address = self.symbol_table[function_name].address
+            for call_site in call_sites:
+                self.code.patch(call_site, address)
 
     def allocate_variables(self):
         symbol_table_to_print = copy(self.symbol_table)
@@ -492,3 +494,23 @@ class Pl0(Pl0Parent):
         del symbol_table_to_print["_scopes"]
         [symbol_table_to_print.update(i) for i in scopes]
         self.generate_instruction(self.inst(Inst.int), 0, len(symbol_table_to_print))
+
+
+def statement_line(statement_tree, default=0) -> int:
+    """
+    It returns the line where the statement starts, the parser numbers a node by the line of the last token it has
+    read, so it is the line of the first node whose children have no lines (the first reduced part of the statement)
+
+    :param statement_tree: nodes of the statement in preorder
+    :param default: line returned when no node of the statement has a line (optional)
+    """
+    line = default
+    for node in statement_tree:
+        if node.lineno > 0:
+            line = node.lineno
+            for child in node.children:
+                if child.lineno > 0:
+                    break
+            else:
+                return line
+    return line
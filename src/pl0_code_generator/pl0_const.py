@@ -10,6 +10,9 @@ class Pl0Const:
 
         self.types = [int]
 
+        # Names of the nodes whose children are statements of the program or of a block.
+        self.sequences = ["declaration_list", "block"]
+
         # A dictionary that maps the operators to the functions that generate the code for the operators.
         self.expressions = {"expression_sum": self.gen_opr_add, "expression_minus": self.gen_opr_sub,
                             "expression_multiply": self.gen_opr_mul, "expression_divide": self.gen_opr_div,
@@ -1,50 +1,82 @@
 #  date: 29. 12. 2022
 #  author: Daniel Schnurpfeil
 #
+import sys
 from copy import copy
 
-from ete3 import Tree
-
-from src.pl0_code_generator.instructions import Inst, Op
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Inst, Op, OPCODES
+from src.pl0_code_generator.label import Label
+from src.pl0_code_generator.line_table import LineTable
 from src.pl0_code_generator.pl0_const import Pl0Const
+from src.syntax_analyzer.ast_node import AstNode
 from src.syntax_analyzer.symbol_record import SymbolRecord
 from src.syntax_analyzer.symbol_table import find_entry_in_symbol_table
 
 
 class Pl0Parent(Pl0Const):
 
-    def __init__(self, abstract_syntax_tree: Tree, symbol_table) -> None:
+    def __init__(self, abstract_syntax_tree: AstNode, symbol_table) -> None:
         """
         The function takes in an abstract syntax tree and initializes the code, ast, and stck attributes.
 
         :param abstract_syntax_tree: This is the abstract syntax tree that was generated by the parser
-        :type abstract_syntax_tree: Tree
+        :type abstract_syntax_tree: AstNode
         """
         super().__init__()
-        self.code = []
+        self.reset(abstract_syntax_tree, symbol_table)
+
+    def reset(self, abstract_syntax_tree: AstNode, symbol_table) -> None:
+        """
+        It clears the generated code and prepares the generator for a new abstract syntax tree,
+        so one generator (and its dispatch tables) can be reused for many compilations.
+
+        :param abstract_syntax_tree: This is the abstract syntax tree that was generated by the parser
+        :type abstract_syntax_tree: AstNode
+        :param symbol_table: table of symbols of the tree
+        """
+        self.code = InstructionBuffer()
+        # debug section, address of the code -> line of the source
+        self.lines = LineTable()
         self.ast = abstract_syntax_tree
         self.symbol_table = symbol_table
-        self.curr_func_name = None
-        # [JT] current scope in the tree, ie if we are in global scope (0) or in function scope (<id>)
-        # used for symbol table navigation
-        self.current_scope = 0
+        # targets of the short-circuit jumps (|| and &&) of the condition that is being generated
+        self.condition_true = Label()
+        self.condition_false = Label()
+        # relocation table of function calls, name of the function -> indexes of its CAL instructions
+        self.call_sites = {}
+
+    def load_code(self, code: str) -> None:
+        """
+        It replaces the state of the generator with the code of a cached compilation, the tree, the symbol table
+        and the line table of that compilation are not cached, so they are empty
+
+        :param code: text of the code as returned by return_code
+        """
+        self.reset(None, {})
+        self.code.load_text(code)
 
     def generate_instruction(self, inst_name, param1, param2):
         """
-        It appends a list of three elements to the list called code
+        It appends an instruction to the instruction buffer
 
-        :param inst_name: The name of the instruction
+        :param inst_name: The integer opcode of the instruction
         :param param1: the first parameter of the instruction
         :param param2: the value of the second parameter
         """
-        self.code.append([inst_name, param1, param2])
+        try:
+            self.code.append(inst_name, param1, param2)
+        except OverflowError:
+            # the operands of the machine are 64-bit integers, the line is the one of the statement being generated
+            line = self.lines.line_of(len(self.code))
+            raise Exception(f"Error on line {line}. Integer {param2} does not fit into 64 bits.") from None
 
     def print_code(self, out_method):
         """
         It prints the code of the program
         """
-        for index, c in enumerate(self.code):
-            out_method(str(index) + " " + "" + str(c[0]) + " " + str(c[1]) + " " + str(c[2]))
+        for line in self.code.render():
+            out_method(line)
 
     def print_symbol_table(self, out_method):
         """
@@ -73,23 +105,30 @@ class Pl0Parent(Pl0Const):
 
     def return_code(self) -> str:
         """
-        This function returns a string of the code in the format of "index opcode operand1 operand2"
+        This function returns a string of the code in the format of "index opcode operand1 operand2",
+        the code is rendered once and the text is reused by the next calls
         :return: The return_code method returns a string of the code.
         """
-        code_string = ""
-        for index, c in enumerate(self.code):
-            code_string += (str(index) + " " + str(c[0]) + " " + str(c[1]) + " " + str(c[2]) + "\n")
-        return code_string
+        return self.code.to_text()
 
-    def gen_const(self, const, symbol_table=None, real_level=0):
+    def write_code(self, file=None):
+        """
+        It writes the code of the program to the file object without building the whole text
+
+        :param file: object with a write method, defaults to sys.stdout (optional)
+        """
+        self.code.write(sys.stdout if file is None else file)
+
+    def gen_const(self, const, symbol_table=None, real_level=0, scope=0):
         """
         It generates a constant
         :param const: The constant to be generated
+        :param scope: name of the function the constant is used in, 0 in the global scope (optional)
         """
         if type(const) == int:
             self.generate_instruction(self.inst(Inst.lit), 0, const)
             return
-        symbol = find_entry_in_symbol_table(symbol_table, self.current_scope, real_level, const)
+        symbol = find_entry_in_symbol_table(symbol_table, scope, real_level, const)
         if symbol is not None:
             self.gen_load_symbol(symbol)
 
@@ -100,7 +139,8 @@ class Pl0Parent(Pl0Const):
         :param var: The variable to store
         :type var: SymbolRecord
         """
-        self.generate_instruction(self.inst(Inst.sto), var.level, var.address)
+        # levels of global symbols are kept as "0" in the table of symbols
+        self.generate_instruction(self.inst(Inst.sto), int(var.level), var.address)
 
     def gen_load_symbol(self, symbol: SymbolRecord):
         """
@@ -109,16 +149,71 @@ class Pl0Parent(Pl0Const):
         :param symbol: The symbol record for the symbol to be loaded
         :type symbol: SymbolRecord
         """
-        self.generate_instruction(self.inst(Inst.lod), symbol.level, symbol.address)
+        self.generate_instruction(self.inst(Inst.lod), int(symbol.level), symbol.address)
+
+    def generate_jump(self, inst_name, label: Label, param1=0):
+        """
+        It appends a jump to the label, the operand is patched when the label is placed later
 
-    def correct_jmc_for_logical_condition(self, x):
-        for i in self.code:
-            if i[2] == "or_mark":
-                i[2] = len(self.code) + 1
-            if i[2] == "and_mark":
-                i[2] = x
+        :param inst_name: The integer opcode of the instruction (JMP, JMC)
+        :param label: target of the jump
+        :param param1: the first parameter of the instruction
+        """
+        if label.address is None:
+            label.fixups.append(len(self.code))
+            self.generate_instruction(inst_name, param1, 0)
+        else:
+            self.generate_instruction(inst_name, param1, label.address)
 
-    def gen_opr(self, const1, operator: Op, const2, symbol_table=None, real_level=0):
+    def generate_call(self, function_name, level):
+        """
+        It appends CAL of the function, the address is filled in by correct_func_call_jmp
+        when all functions are generated, so functions can be called before their declaration
+
+        :param function_name: name of the called function
+        :param level: the first parameter of the instruction
+        """
+        self.call_sites.setdefault(function_name, []).append(len(self.code))
+        self.generate_instruction(self.inst(Inst.cal), level, 0)
+
+    def function_names(self) -> dict:
+        """
+        It returns the address of every called function -> its name, the addresses are the ones of the patched CALs
+        """
+        return {self.code.operands[call_sites[0]]: name for name, call_sites in self.call_sites.items()}
+
+    def place_label(self, label: Label, address=None):
+        """
+        It sets the address of the label and patches all jumps that were emitted before
+
+        :param label: the label to be placed
+        :param address: address of the target, defaults to the address of the next instruction (optional)
+        """
+        label.address = len(self.code) if address is None else address
+        for fixup in label.fixups:
+            self.code.patch(fixup, label.address)
+        label.fixups.clear()
+
+    def start_condition(self) -> Label:
+        """
+        It prepares targets of the short-circuit jumps for a new condition
+
+        :return: the label where the code continues when the condition is false
+        """
+        self.condition_true = Label()
+        self.condition_false = Label()
+        return self.condition_false
+
+    def gen_condition_jump(self, false_label: Label):
+        """
+        It appends the JMC that ends the condition, || jumps right behind it and && jumps to the same target
+
+        :param false_label: label returned by start_condition
+        """
+        self.place_label(self.condition_true, len(self.code) + 1)
+        self.generate_jump(self.inst(Inst.jmc), false_label)
+
+    def gen_opr(self, const1, operator: Op, const2, symbol_table=None, real_level=0, scope=0):
         """
         It generates instructions for the operation of two constants
         :param const1: The first constant to be used in the operation
@@ -126,26 +221,26 @@ class Pl0Parent(Pl0Const):
         :type operator: o
         :param const2: The second constant to be used in the operation
         """
-        if const1:
-            self.gen_const(const1, symbol_table, real_level=real_level)
-        if const2:
-            self.gen_const(const2, symbol_table, real_level=real_level)
-        self.generate_instruction(self.inst(Inst.opr), 0, str(operator))
+        if const1 is not None:
+            self.gen_const(const1, symbol_table, real_level=real_level, scope=scope)
+        if const2 is not None:
+            self.gen_const(const2, symbol_table, real_level=real_level, scope=scope)
+        self.generate_instruction(self.inst(Inst.opr), 0, operator)
 
-    def gen_opr_add(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.add), const2, symbol_table=symbol_table, real_level=real_level)
+    def gen_opr_add(self, const1=None, const2=None, symbol_table=None, real_level=0, scope=0):
+        self.gen_opr(const1, self.op(Op.add), const2, symbol_table=symbol_table, real_level=real_level, scope=scope)
 
-    def gen_opr_sub(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.sub), const2, symbol_table=symbol_table, real_level=real_level)
+    def gen_opr_sub(self, const1=None, const2=None, symbol_table=None, real_level=0, scope=0):
+        self.gen_opr(const1, self.op(Op.sub), const2, symbol_table=symbol_table, real_level=real_level, scope=scope)
 
-    def gen_opr_mul(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.mul), const2, symbol_table=symbol_table, real_level=real_level)
+    def gen_opr_mul(self, const1=None, const2=None, symbol_table=None, real_level=0, scope=0):
+        self.gen_opr(const1, self.op(Op.mul), const2, symbol_table=symbol_table, real_level=real_level, scope=scope)
 
-    def gen_opr_div(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.div), const2, symbol_table=symbol_table, real_level=real_level)
+    def gen_opr_div(self, const1=None, const2=None, symbol_table=None, real_level=0, scope=0):
+        self.gen_opr(const1, self.op(Op.div), const2, symbol_table=symbol_table, real_level=real_level, scope=scope)
 
-    def gen_term(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_const(const1, symbol_table=symbol_table, real_level=real_level)
+    def gen_term(self, const1=None, const2=None, symbol_table=None, real_level=0, scope=0):
+        self.gen_const(const1, symbol_table=symbol_table, real_level=real_level, scope=scope)
 
     def gen_sub(self, operator):
         self.generate_instruction(self.inst(Inst.opr), 0, self.op(Op.sub))
@@ -180,13 +275,13 @@ class Pl0Parent(Pl0Const):
     @staticmethod
     def inst(instruction: Inst):
         """
-        It takes an instruction and returns its value
+        It takes an instruction and returns its integer opcode
 
         :param instruction: The instruction to be executed
         :type instruction: t
-        :return: The value of the instruction.
+        :return: The opcode of the instruction.
         """
-        return instruction.value
+        return OPCODES[instruction]
 
     @staticmethod
     def op(operation: Op):
@@ -198,15 +293,3 @@ class Pl0Parent(Pl0Const):
         :return: The value of the operation.
         """
         return operation.value
-
-    @staticmethod
-    def clear_tree(tree_iter_generator):
-        """
-        It takes a generator that yields tree iterators, and clears the tree of all rows
-        :param tree_iter_generator: A generator that returns a Gtk.TreeIter for each row in the tree
-        """
-        sub_tree = []
-        for i in tree_iter_generator:
-            if not i[0]:
-                sub_tree.append(i[1])
-        return sub_tree
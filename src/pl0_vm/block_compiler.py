@@ -0,0 +1,266 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm.p_machine import STACK_SIZE, STACK_HEADROOM, StackView, allocate_stack, grow_stack
+
+# operations of OPR as python operators, results are assigned to local variables,
+# only relations are kept as conditions until their value is needed
+BINARY_OPERATIONS = {Op.add.value: "+", Op.sub.value: "-", Op.mul.value: "*"}
+RELATIONS = {Op.eq.value: "==", Op.ne.value: "!=", Op.lt.value: "<", Op.ge.value: ">=", Op.gt.value: ">",
+             Op.le.value: "<="}
+
+
+def divide(left, right):
+    """
+    It divides two integers, the quotient is truncated toward zero as in p_machine
+    """
+    quotient = left // right
+    if quotient < 0 and quotient * right != left:
+        quotient += 1
+    return quotient
+
+
+def modulo(left, right):
+    return left - divide(left, right) * right
+
+
+def find_leaders(generated_code: InstructionBuffer) -> list:
+    """
+    It returns sorted addresses where basic blocks start, ie the start of the program, targets of jumps and calls
+    and instructions that follow a jump, a call or a return
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    code_length = len(generated_code)
+    leaders = {0}
+    for address, (opcode, _, operand) in enumerate(generated_code):
+        if opcode == JMP or opcode == JMC or opcode == CAL:
+            if not 0 <= operand <= code_length:
+                raise IndexError(f"ERR in executing generated code, jump to {operand} at {address}...")
+            leaders.add(operand)
+            leaders.add(address + 1)
+        elif opcode == RET:
+            leaders.add(address + 1)
+    return sorted(leader for leader in leaders if leader < code_length)
+
+
+class BlockTranslator:
+    """
+    It translates one basic block to python statements, values pushed inside the block are kept in local variables
+    (constants and relations as expressions) and they are written to the stack only when the block ends
+    """
+
+    def __init__(self) -> None:
+        self.lines = []
+        # values pushed in this block, (python expression, True if the expression is a condition)
+        self.values = []
+        # number of values taken from the stack below the top at the start of the block
+        self.taken = 0
+        self.temporaries = 0
+
+    def emit(self, line: str):
+        self.lines.append(line)
+
+    def temporary(self, expression: str) -> str:
+        """
+        It evaluates the expression now (reads of memory must not be moved behind stores) and returns its variable
+        """
+        self.temporaries += 1
+        name = f"t{self.temporaries}"
+        self.emit(f"{name} = {expression}")
+        return name
+
+    def push(self, expression: str, condition=False):
+        self.values.append((expression, condition))
+
+    def pop_condition(self) -> str:
+        """
+        It returns the top value as a python condition that is true when the value is not zero
+        """
+        if self.values:
+            expression, condition = self.values.pop()
+            return expression if condition else f"{expression} != 0"
+        self.taken += 1
+        return f"{self.temporary(f'stack[top - {self.taken - 1}]')} != 0"
+
+    def pop(self) -> str:
+        if self.values:
+            expression, condition = self.values.pop()
+            return f"(1 if {expression} else 0)" if condition else expression
+        self.taken += 1
+        return self.temporary(f"stack[top - {self.taken - 1}]")
+
+    def frame(self, level: int) -> str:
+        """
+        It returns the expression of the base of the frame the given number of static links below
+        """
+        if level == 0:
+            return "base"
+        frame = "base"
+        for _ in range(level):
+            frame = self.temporary(f"stack[{frame}]")
+        return frame
+
+    def flush(self):
+        """
+        It writes the values pushed in the block to the stack and moves the top of the stack
+        """
+        values = [self.pop() for _ in range(len(self.values))][::-1]
+        start = f"top - {self.taken}" if self.taken else "top"
+        for offset, value in enumerate(values, 1):
+            self.emit(f"stack[{start} + {offset}] = {value}")
+        shift = len(values) - self.taken
+        if shift:
+            self.emit(f"top += {shift}")
+        self.taken = 0
+
+    def translate(self, generated_code: InstructionBuffer, start: int, end: int) -> list:
+        """
+        It translates the instructions from start to end (exclusive), the last statement sets the label of the next
+        block, the program stops by return
+
+        :param generated_code: generated instructions
+        :param start: address of the first instruction of the block
+        :param end: address behind the block
+        """
+        self.emit(f"steps += {end - start}")
+        for address in range(start, end):
+            opcode, level, operand = generated_code[address]
+            if opcode == LIT:
+                self.push(str(operand))
+            elif opcode == LOD:
+                self.push(self.temporary(f"stack[{self.frame(level)} + {operand}]"))
+            elif opcode == STO:
+                value = self.pop()
+                self.emit(f"stack[{self.frame(level)} + {operand}] = {value}")
+            elif opcode == OPR:
+                self.translate_operation(operand, address)
+            elif opcode == INT:
+                self.flush()
+                self.emit(f"top += {operand}")
+                if operand > 0:
+                    self.emit("if top > stack_limit:")
+                    self.emit("    stack_limit = grow_stack(stack, top)")
+            elif opcode == JMP:
+                self.flush()
+                self.emit(f"label = {operand}")
+                return self.lines
+            elif opcode == JMC:
+                condition = self.pop_condition()
+                self.flush()
+                self.emit(f"label = {address + 1} if {condition} else {operand}")
+                return self.lines
+            elif opcode == CAL:
+                self.flush()
+                frame = self.frame(level)
+                self.emit(f"stack[top + 1] = {frame}")
+                self.emit("stack[top + 2] = base")
+                self.emit(f"stack[top + 3] = {address + 1}")
+                self.emit("base = top + 1")
+                self.emit(f"label = {operand}")
+                return self.lines
+            elif opcode == RET:
+                self.flush()
+                self.emit("if base == 0:")
+                self.emit("    return StackView(stack, top + 1), steps")
+                self.emit("top = base - 1")
+                self.emit("label = stack[base + 2]")
+                self.emit("base = stack[base + 1]")
+                return self.lines
+            else:
+                raise Exception(f"Unknown instruction {opcode} at {address}")
+        self.flush()
+        self.emit(f"label = {end}")
+        return self.lines
+
+    def translate_operation(self, operation: int, address: int):
+        if operation == Op.neg.value:
+            self.push(self.temporary(f"-{self.pop()}"))
+        elif operation == Op.odd.value:
+            self.push(self.temporary(f"{self.pop()} & 1"))
+        else:
+            right = self.pop()
+            left = self.pop()
+            if operation in BINARY_OPERATIONS:
+                self.push(self.temporary(f"{left} {BINARY_OPERATIONS[operation]} {right}"))
+            elif operation in RELATIONS:
+                self.push(f"{left} {RELATIONS[operation]} {right}", condition=True)
+            elif operation == Op.div.value:
+                self.push(self.temporary(f"divide({left}, {right})"))
+            elif operation == Op.mod.value:
+                self.push(self.temporary(f"modulo({left}, {right})"))
+            else:
+                raise Exception(f"Unknown operation {operation} at {address}")
+
+
+def dispatch_tree(labels: list, bodies: dict, indent: str) -> list:
+    """
+    It returns nested ifs that select the block by its label in log(number of blocks) comparisons
+
+    :param labels: sorted labels of the blocks
+    :param bodies: label -> statements of the block
+    :param indent: indentation of the statements
+    """
+    if len(labels) == 1:
+        return [indent + line for line in bodies[labels[0]]]
+    middle = len(labels) // 2
+    return ([f"{indent}if label < {labels[middle]}:"] + dispatch_tree(labels[:middle], bodies, indent + "    ") +
+            [f"{indent}else:"] + dispatch_tree(labels[middle:], bodies, indent + "    "))
+
+
+def translate(generated_code: InstructionBuffer) -> str:
+    """
+    It translates the code to the source of a python function run(stack), every basic block is one branch
+    of the dispatch on the label of the next block
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    code_length = len(generated_code)
+    leaders = find_leaders(generated_code)
+    bodies = {}
+    for start, end in zip(leaders, leaders[1:] + [code_length]):
+        bodies[start] = BlockTranslator().translate(generated_code, start, end)
+    # jumps behind the last instruction end the program
+    bodies[code_length] = ["return StackView(stack, top + 1), steps"]
+    labels = leaders + [code_length]
+    lines = ["def run(stack):",
+             f"    stack_limit = len(stack) - {STACK_HEADROOM}",
+             "    top = -1",
+             "    base = 0",
+             "    label = 0",
+             "    steps = 0",
+             "    while True:"]
+    lines += dispatch_tree(labels, bodies, "        ")
+    return "\n".join(lines) + "\n"
+
+
+def compile_blocks(generated_code: InstructionBuffer):
+    """
+    It translates the code to python and compiles it once, it returns the function run(stack)
+    that returns the same stack and number of steps as p_machine.execute
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    namespace = {"divide": divide, "modulo": modulo, "StackView": StackView, "grow_stack": grow_stack}
+    exec(compile(translate(generated_code), "<pl/0 basic blocks>", "exec"), namespace)
+    return namespace["run"]
+
+
+def execute(generated_code: InstructionBuffer, stack_size=STACK_SIZE) -> tuple:
+    """
+    It compiles the basic blocks of the code to python and runs them
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    run = compile_blocks(generated_code)
+    try:
+        return run(allocate_stack(stack_size))
+    except IndexError:
+        raise IndexError("ERR in executing generated code, stack overflow...")
@@ -0,0 +1,324 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import operator
+from collections import Counter
+
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm import p_machine
+from src.pl0_vm.p_machine import STACK_SIZE, STACK_HEADROOM, StackView, allocate_stack, grow_stack
+from src.pl0_vm.verifier import VerificationError, verify
+
+# opcodes of the decoded program, every operation of OPR has its own opcode and LOD, STO of the current frame
+# (level 0) do not walk the static links, the most frequent ones are tested first
+(D_LIT, D_LOD0, D_STO0, D_ADD, D_SUB, D_MUL, D_LT, D_GT, D_EQ, D_NE, D_LE, D_GE, D_JMC, D_JMP, D_INT, D_CAL, D_RET,
+ D_LOD, D_STO, D_DIV, D_MOD, D_NEG, D_ODD) = range(23)
+
+OPERATIONS = {
+    Op.neg.value: D_NEG, Op.add.value: D_ADD, Op.sub.value: D_SUB, Op.mul.value: D_MUL, Op.div.value: D_DIV,
+    Op.mod.value: D_MOD, Op.odd.value: D_ODD, Op.eq.value: D_EQ, Op.ne.value: D_NE, Op.lt.value: D_LT,
+    Op.ge.value: D_GE, Op.gt.value: D_GT, Op.le.value: D_LE,
+}
+# instructions that keep their operand as it is
+PLAIN_INSTRUCTIONS = {LIT: D_LIT, JMP: D_JMP, JMC: D_JMC, INT: D_INT, RET: D_RET}
+
+# superinstructions, a fused sequence replaces only its first instruction, so jumps into the middle of it still work
+(S_INC, S_SLOT_OP_CONST, S_CONST_OP_SLOT, S_SLOT_OP_SLOT, S_JUMP_UNLESS_SLOT_CONST, S_JUMP_UNLESS, S_OP_CONST,
+ S_COPY, S_STORE_CONST) = range(23, 32)
+# the decoded program ends with it, so the loop does not compare the instruction pointer with the length of the code
+D_HALT = 32
+SUPERINSTRUCTION_NAMES = {
+    S_INC: "LIT c; LOD x; ADD; STO x",
+    S_SLOT_OP_CONST: "LOD x; LIT c; OPR; STO y",
+    S_CONST_OP_SLOT: "LIT c; LOD x; OPR; STO y",
+    S_SLOT_OP_SLOT: "LOD x; LOD y; OPR; STO z",
+    S_JUMP_UNLESS_SLOT_CONST: "LOD x; LIT c; OPR rel; JMC",
+    S_JUMP_UNLESS: "OPR rel; JMC",
+    S_OP_CONST: "LIT c; OPR",
+    S_COPY: "LOD x; STO y",
+    S_STORE_CONST: "LIT c; STO x",
+}
+ARITHMETIC = {D_ADD: operator.add, D_SUB: operator.sub, D_MUL: operator.mul}
+RELATIONS = {D_LT: operator.lt, D_GT: operator.gt, D_EQ: operator.eq, D_NE: operator.ne, D_LE: operator.le,
+             D_GE: operator.ge}
+
+
+def decode(generated_code: InstructionBuffer) -> tuple:
+    """
+    It decodes the code once before the execution, it returns the list of decoded opcodes and the list of their
+    arguments (the operand, or (level, operand) for instructions that walk the static links), jumps and calls
+    must stay in the program, jumps behind its last instruction reach D_HALT
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    code_length = len(generated_code)
+    opcodes = []
+    arguments = []
+    for address, (opcode, level, operand) in enumerate(generated_code):
+        if (opcode == JMP or opcode == JMC or opcode == CAL) and not 0 <= operand <= code_length:
+            raise IndexError(f"ERR in executing generated code, jump to {operand} at {address}...")
+        if opcode in PLAIN_INSTRUCTIONS:
+            opcodes.append(PLAIN_INSTRUCTIONS[opcode])
+            arguments.append(operand)
+        elif opcode == OPR:
+            if operand not in OPERATIONS:
+                raise Exception(f"Unknown operation {operand} at {address}")
+            opcodes.append(OPERATIONS[operand])
+            arguments.append(0)
+        elif opcode == LOD or opcode == STO:
+            if level == 0:
+                opcodes.append(D_LOD0 if opcode == LOD else D_STO0)
+                arguments.append(operand)
+            else:
+                opcodes.append(D_LOD if opcode == LOD else D_STO)
+                arguments.append((level, operand))
+        elif opcode == CAL:
+            opcodes.append(D_CAL)
+            arguments.append((level, operand))
+        else:
+            raise Exception(f"Unknown instruction {opcode} at {address}")
+    opcodes.append(D_HALT)
+    arguments.append(0)
+    return opcodes, arguments
+
+
+def fuse(opcodes: list, arguments: list) -> Counter:
+    """
+    It replaces common sequences of the decoded program by superinstructions, the fused instruction continues behind
+    the sequence and the other instructions of the sequence stay at their addresses as targets of jumps,
+    it returns how many times every superinstruction was used
+
+    :param opcodes: decoded opcodes, changed in place
+    :param arguments: arguments of the decoded opcodes, changed in place
+    """
+    fired = Counter()
+    code_length = len(opcodes)
+    address = 0
+    while address < code_length:
+        window = opcodes[address:address + 4] + [None] * (address + 4 - code_length)
+        first, second, third, fourth = window
+        fused = None
+        if first == D_LIT and second == D_LOD0 and third in ARITHMETIC and fourth == D_STO0:
+            constant, slot, target = arguments[address], arguments[address + 1], arguments[address + 3]
+            if third == D_ADD and slot == target:
+                fused = S_INC, (slot, constant), 4
+            else:
+                fused = S_CONST_OP_SLOT, (constant, slot, ARITHMETIC[third], target), 4
+        elif first == D_LOD0 and second == D_LIT and third in ARITHMETIC and fourth == D_STO0:
+            slot, constant, target = arguments[address], arguments[address + 1], arguments[address + 3]
+            if third == D_ADD and slot == target:
+                fused = S_INC, (slot, constant), 4
+            else:
+                fused = S_SLOT_OP_CONST, (slot, constant, ARITHMETIC[third], target), 4
+        elif first == D_LOD0 and second == D_LOD0 and third in ARITHMETIC and fourth == D_STO0:
+            fused = S_SLOT_OP_SLOT, (arguments[address], arguments[address + 1], ARITHMETIC[third],
+                                     arguments[address + 3]), 4
+        elif first == D_LOD0 and second == D_LIT and third in RELATIONS and fourth == D_JMC:
+            fused = S_JUMP_UNLESS_SLOT_CONST, (arguments[address], arguments[address + 1], RELATIONS[third],
+                                               arguments[address + 3]), 4
+        elif first in RELATIONS and second == D_JMC:
+            fused = S_JUMP_UNLESS, (RELATIONS[first], arguments[address + 1]), 2
+        elif first == D_LIT and second in ARITHMETIC:
+            fused = S_OP_CONST, (ARITHMETIC[second], arguments[address]), 2
+        elif first == D_LOD0 and second == D_STO0:
+            fused = S_COPY, (arguments[address], arguments[address + 1]), 2
+        elif first == D_LIT and second == D_STO0:
+            fused = S_STORE_CONST, (arguments[address], arguments[address + 1]), 2
+        if fused is None:
+            address += 1
+            continue
+        opcode, argument, length = fused
+        opcodes[address] = opcode
+        arguments[address] = argument
+        fired[SUPERINSTRUCTION_NAMES[opcode]] += 1
+        address += length
+    return fired
+
+
+def execute(generated_code: InstructionBuffer, stack_size=STACK_SIZE, superinstructions=True) -> tuple:
+    """
+    It decodes the code and runs it, the stack is the same as of p_machine.execute,
+    the number of steps is lower when superinstructions are used,
+    the stack of a verified program that does not call itself is allocated at once with the size it needs,
+    other verified programs start with stack_size slots and the stack grows,
+    a program the verifier rejects runs on the checked loop of p_machine.execute
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    :param superinstructions: fuse common sequences of instructions, defaults to True (optional)
+    """
+    try:
+        needed = verify(generated_code).stack_size
+    except VerificationError:
+        # the loop of the decoded program does not check the top, the frames nor the return addresses
+        return p_machine.execute(generated_code, stack_size)
+    opcodes, arguments = decode(generated_code)
+    if superinstructions:
+        fuse(opcodes, arguments)
+    if needed is not None:
+        # INT never reaches the limit of the stack, it stays below the headroom
+        stack_size = needed + STACK_HEADROOM
+    return execute_decoded(opcodes, arguments, stack_size)
+
+
+def execute_decoded(opcodes: list, arguments: list, stack_size=STACK_SIZE) -> tuple:
+    """
+    It runs the decoded program, the instruction pointer, the top of the stack and the base of the frame are locals,
+    and returns the stack up to its top and the number of executed instructions, the loop has no checks,
+    so the program must pass verify
+
+    :param opcodes: decoded opcodes, the last one is D_HALT
+    :param arguments: arguments of the decoded opcodes
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    stack = allocate_stack(stack_size)
+    stack_limit = len(stack) - STACK_HEADROOM
+    base = 0
+    top = -1
+    instruction_pointer = 0
+    steps = 0
+    try:
+        while True:
+            opcode = opcodes[instruction_pointer]
+            argument = arguments[instruction_pointer]
+            instruction_pointer += 1
+            steps += 1
+
+            if opcode == D_LIT:
+                top += 1
+                stack[top] = argument
+            elif opcode == D_LOD0:
+                top += 1
+                stack[top] = stack[base + argument]
+            elif opcode == D_STO0:
+                stack[base + argument] = stack[top]
+                top -= 1
+            elif opcode == S_INC:
+                slot, constant = argument
+                stack[base + slot] += constant
+                instruction_pointer += 3
+            elif opcode == S_JUMP_UNLESS_SLOT_CONST:
+                slot, constant, relation, address = argument
+                if relation(stack[base + slot], constant):
+                    instruction_pointer += 3
+                else:
+                    instruction_pointer = address
+            elif opcode == S_JUMP_UNLESS:
+                relation, address = argument
+                top -= 2
+                if relation(stack[top + 1], stack[top + 2]):
+                    instruction_pointer += 1
+                else:
+                    instruction_pointer = address
+            elif opcode == S_SLOT_OP_CONST:
+                slot, constant, function, target = argument
+                stack[base + target] = function(stack[base + slot], constant)
+                instruction_pointer += 3
+            elif opcode == S_CONST_OP_SLOT:
+                constant, slot, function, target = argument
+                stack[base + target] = function(constant, stack[base + slot])
+                instruction_pointer += 3
+            elif opcode == S_SLOT_OP_SLOT:
+                left, right, function, target = argument
+                stack[base + target] = function(stack[base + left], stack[base + right])
+                instruction_pointer += 3
+            elif opcode == S_OP_CONST:
+                function, constant = argument
+                stack[top] = function(stack[top], constant)
+                instruction_pointer += 1
+            elif opcode == S_COPY:
+                source, target = argument
+                stack[base + target] = stack[base + source]
+                instruction_pointer += 1
+            elif opcode == S_STORE_CONST:
+                constant, target = argument
+                stack[base + target] = constant
+                instruction_pointer += 1
+            elif opcode == D_ADD:
+                top -= 1
+                stack[top] += stack[top + 1]
+            elif opcode == D_SUB:
+                top -= 1
+                stack[top] -= stack[top + 1]
+            elif opcode == D_MUL:
+                top -= 1
+                stack[top] *= stack[top + 1]
+            elif opcode == D_LT:
+                top -= 1
+                stack[top] = 1 if stack[top] < stack[top + 1] else 0
+            elif opcode == D_GT:
+                top -= 1
+                stack[top] = 1 if stack[top] > stack[top + 1] else 0
+            elif opcode == D_EQ:
+                top -= 1
+                stack[top] = 1 if stack[top] == stack[top + 1] else 0
+            elif opcode == D_NE:
+                top -= 1
+                stack[top] = 1 if stack[top] != stack[top + 1] else 0
+            elif opcode == D_LE:
+                top -= 1
+                stack[top] = 1 if stack[top] <= stack[top + 1] else 0
+            elif opcode == D_GE:
+                top -= 1
+                stack[top] = 1 if stack[top] >= stack[top + 1] else 0
+            elif opcode == D_JMC:
+                if stack[top] == 0:
+                    instruction_pointer = argument
+                top -= 1
+            elif opcode == D_JMP:
+                instruction_pointer = argument
+            elif opcode == D_INT:
+                top += argument
+                if top > stack_limit:
+                    stack_limit = grow_stack(stack, top)
+            elif opcode == D_CAL:
+                level, address = argument
+                frame = base
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[top + 1] = frame
+                stack[top + 2] = base
+                stack[top + 3] = instruction_pointer
+                base = top + 1
+                instruction_pointer = address
+            elif opcode == D_RET:
+                if base == 0:
+                    break
+                top = base - 1
+                instruction_pointer = stack[base + 2]
+                base = stack[base + 1]
+            elif opcode == D_LOD or opcode == D_STO:
+                level, address = argument
+                frame = base
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                if opcode == D_LOD:
+                    top += 1
+                    stack[top] = stack[frame + address]
+                else:
+                    stack[frame + address] = stack[top]
+                    top -= 1
+            elif opcode == D_NEG:
+                stack[top] = -stack[top]
+            elif opcode == D_ODD:
+                stack[top] = stack[top] & 1
+            elif opcode == D_HALT:
+                steps -= 1
+                break
+            else:
+                # division truncates toward zero
+                top -= 1
+                left = stack[top]
+                right = stack[top + 1]
+                quotient = left // right
+                if quotient < 0 and quotient * right != left:
+                    quotient += 1
+                stack[top] = quotient if opcode == D_DIV else left - quotient * right
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    return StackView(stack, top + 1), steps
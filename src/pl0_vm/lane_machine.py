@@ -0,0 +1,180 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import numpy as np
+
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm.p_machine import (STACK_SIZE, STACK_HEADROOM, MAX_STACK_SIZE, NEG, ADD, SUB, MUL, DIV, MOD, ODD, EQ,
+                                  NE, LT, GE, GT, LE)
+
+# the first global variable follows the header of the frame of the main program
+GLOBALS_START = 3
+
+OPERATIONS = {
+    ADD: np.add, SUB: np.subtract, MUL: np.multiply,
+    EQ: np.equal, NE: np.not_equal, LT: np.less, GE: np.greater_equal, GT: np.greater, LE: np.less_equal,
+}
+
+
+def divide(left, right):
+    """
+    It divides the lanes, the quotient is truncated toward zero as in p_machine
+    """
+    if not right.all():
+        raise ZeroDivisionError("integer division by zero")
+    quotient = left // right
+    quotient += (quotient < 0) & (quotient * right != left)
+    return quotient
+
+
+def frames_of(memory, base: int, level: int, lanes, indices):
+    """
+    It returns the base of the frame the given number of static links below, one number if it is the same
+    in all lanes of the group, otherwise an array of bases of the lanes
+
+    :param memory: memory of the machine, one row per slot and one column per lane
+    :param lanes: columns of the group, a slice of all lanes or an array of their indices
+    :param indices: array of the indices of the lanes of the group
+    """
+    frames = memory[base, lanes]
+    for _ in range(level - 1):
+        frames = memory[frames, indices]
+    return int(frames[0]) if (frames == frames[0]).all() else frames
+
+
+def execute(generated_code: InstructionBuffer, initial_globals, stack_size=STACK_SIZE) -> tuple:
+    """
+    It runs the code once for every row of initial_globals, the lanes share the instruction pointer, the top
+    and the base while their control flow agrees, so every instruction is one array operation over all of them,
+    a JMC (or a return) that goes different ways splits the lanes into groups, the group with the lowest
+    instruction pointer runs first and groups that reach the same state are joined again,
+    it returns the matrix of the final values of the globals and the number of executed instructions
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param initial_globals: matrix of values of the globals before the start, one row per lane, the program reads
+                            them by declarations like var n: Int = n;
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    initial_globals = np.asarray(initial_globals, dtype=np.int64)
+    if initial_globals.ndim != 2:
+        raise Exception("initial globals must be a matrix with one row per lane")
+    lane_count, global_count = initial_globals.shape
+    opcodes = list(generated_code.opcodes)
+    levels = list(generated_code.levels)
+    operands = list(generated_code.operands)
+    code_length = len(opcodes)
+    # one row per slot, so a slot of all lanes is contiguous
+    memory = np.zeros((max(stack_size, STACK_HEADROOM, GLOBALS_START + global_count + STACK_HEADROOM), lane_count),
+                      dtype=np.int64)
+    memory[GLOBALS_START:GLOBALS_START + global_count] = initial_globals.T
+    all_lanes = slice(None)
+    every_index = np.arange(lane_count)
+    # (instruction pointer, top, base) -> lanes in this state
+    groups = {(0, -1, 0): all_lanes} if lane_count else {}
+    steps = 0
+
+    def join(state, lanes):
+        if state in groups:
+            # groups never share a lane
+            lanes = np.sort(np.concatenate((every_index[groups[state]], every_index[lanes])))
+            if len(lanes) == lane_count:
+                lanes = all_lanes
+        groups[state] = lanes
+
+    instruction_pointer = 0
+    try:
+        while groups:
+            state = min(groups)
+            lanes = groups.pop(state)
+            instruction_pointer, top, base = state
+            indices = every_index[lanes]
+            # the group runs until it splits, stops or gets ahead of another group
+            waiting = min(groups)[0] if groups else code_length
+            while True:
+                if instruction_pointer >= code_length:
+                    break
+                if instruction_pointer > waiting or (instruction_pointer, top, base) in groups:
+                    join((instruction_pointer, top, base), lanes)
+                    break
+                opcode = opcodes[instruction_pointer]
+                operand = operands[instruction_pointer]
+                level = levels[instruction_pointer]
+                instruction_pointer += 1
+                steps += 1
+
+                if opcode == LIT:
+                    top += 1
+                    memory[top, lanes] = operand
+                elif opcode == LOD or opcode == STO:
+                    frame = base if level == 0 else frames_of(memory, base, level, lanes, indices)
+                    columns = lanes if isinstance(frame, int) else indices
+                    if opcode == LOD:
+                        top += 1
+                        memory[top, lanes] = memory[frame + operand, columns]
+                    else:
+                        memory[frame + operand, columns] = memory[top, lanes]
+                        top -= 1
+                elif opcode == OPR:
+                    if operand == NEG:
+                        memory[top, lanes] = -memory[top, lanes]
+                    elif operand == ODD:
+                        memory[top, lanes] = memory[top, lanes] & 1
+                    else:
+                        top -= 1
+                        left = memory[top, lanes]
+                        right = memory[top + 1, lanes]
+                        if operand in OPERATIONS:
+                            memory[top, lanes] = OPERATIONS[operand](left, right)
+                        elif operand == DIV:
+                            memory[top, lanes] = divide(left, right)
+                        elif operand == MOD:
+                            memory[top, lanes] = left - divide(left, right) * right
+                        else:
+                            raise Exception(f"Unknown operation {operand} at {instruction_pointer - 1}")
+                elif opcode == JMC:
+                    jumps = memory[top, lanes] == 0
+                    top -= 1
+                    if jumps.all():
+                        instruction_pointer = operand
+                    elif jumps.any():
+                        join((operand, top, base), indices[jumps])
+                        join((instruction_pointer, top, base), indices[~jumps])
+                        break
+                elif opcode == JMP:
+                    instruction_pointer = operand
+                elif opcode == INT:
+                    top += operand
+                    if top > len(memory) - STACK_HEADROOM:
+                        size = len(memory)
+                        while top > size - STACK_HEADROOM:
+                            size *= 2
+                        if size > MAX_STACK_SIZE:
+                            raise IndexError(f"stack overflow, more than {MAX_STACK_SIZE} slots")
+                        memory = np.concatenate((memory, np.zeros((size - len(memory), lane_count), np.int64)))
+                elif opcode == CAL:
+                    memory[top + 1, lanes] = base if level == 0 else frames_of(memory, base, level, lanes, indices)
+                    memory[top + 2, lanes] = base
+                    memory[top + 3, lanes] = instruction_pointer
+                    base = top + 1
+                    instruction_pointer = operand
+                elif opcode == RET:
+                    if base == 0:
+                        break
+                    top = base - 1
+                    returns = memory[base + 2, lanes]
+                    links = memory[base + 1, lanes]
+                    if (returns == returns[0]).all() and (links == links[0]).all():
+                        instruction_pointer = int(returns[0])
+                        base = int(links[0])
+                    else:
+                        # the lanes were called from different places
+                        for address, link in np.unique(np.stack((returns, links), axis=1), axis=0):
+                            join((int(address), top, int(link)), indices[(returns == address) & (links == link)])
+                        break
+                else:
+                    raise Exception(f"Unknown instruction {opcode} at {instruction_pointer - 1}")
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    return memory[GLOBALS_START:GLOBALS_START + global_count].T.copy(), steps
@@ -1,163 +1,316 @@
 #  date: 31. 12. 2022
 #  author: Daniel Schnurpfeil
 #
-from copy import copy
+from itertools import islice, repeat
 
-from src.pl0_code_generator.instructions import Inst, Op
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
 
+# number of slots of the stack allocated before the program starts
+STACK_SIZE = 1024
+# free slots kept above the frames for temporaries of expressions and for the header of the next call
+STACK_HEADROOM = 256
+# the machine stops with a stack overflow instead of growing the stack over this number of slots
+MAX_STACK_SIZE = 1 << 24
 
-def ret_stack_as_str(stack: list) -> str:
+NEG, ADD, SUB, MUL, DIV, MOD, ODD, EQ, NE, LT, GE, GT, LE = (operation.value for operation in Op)
+
+
+class StackUnderflow(IndexError):
+    """
+    It is the error of an instruction that takes a value from the empty stack
+    """
+    pass
+
+
+def stack_underflow(address=None) -> StackUnderflow:
+    """
+    It returns the error of a program whose top of the stack drops below the bottom
+
+    :param address: address of the instruction, None if it is not known (optional)
+    """
+    where = "" if address is None else f" at {address}"
+    return StackUnderflow(f"ERR in executing generated code{where}, stack underflow...")
+
+
+class BrokenFrame(IndexError):
+    """
+    It is the error of an instruction that reaches a frame or an address outside of the stack or of the code
+    """
+    pass
+
+
+def broken_frame(address: int, what: str) -> BrokenFrame:
+    """
+    It returns the error of a program that leaves its frames
+
+    :param address: address of the instruction
+    :param what: what is out of range
+    """
+    return BrokenFrame(f"ERR in executing generated code at {address}, {what} out of range...")
+
+
+class StackView:
+    """
+    It is a read-only view of the stack of the machine up to its top, the machine returns it instead of a copy
+    of its memory and the dump of the stack is written from it
+    """
+    __slots__ = ("stack", "size")
+
+    def __init__(self, stack: list, size: int) -> None:
+        if size < 0:
+            # the machine took more values than it pushed
+            raise stack_underflow()
+        self.stack = stack
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return islice(self.stack, self.size)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.stack[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("stack index out of range")
+        return self.stack[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (StackView, list)):
+            return NotImplemented
+        return len(other) == self.size and all(left == right for left, right in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def allocate_stack(stack_size=STACK_SIZE) -> list:
+    """
+    It returns the zeroed memory of the machine, the slots are allocated at once before the start,
+    the memory is a list because the machine reads and writes one slot per step, a slot of a list is an int
+    object already, array('q') and numpy arrays box a new int on every read (2x and 4x slower per step)
+
+    :param stack_size: number of slots (optional)
+    """
+    return [0] * max(stack_size, STACK_HEADROOM)
+
+
+def grow_stack(stack: list, top: int) -> int:
+    """
+    It doubles the stack until the top and the headroom above it fit, new slots are zeroed in bulk,
+    it returns the new limit of the top
+
+    :param stack: memory of the machine, it grows in place
+    :param top: the top of the stack after INT
+    """
+    size = len(stack)
+    while top > size - STACK_HEADROOM:
+        size *= 2
+    if size > MAX_STACK_SIZE:
+        raise IndexError(f"stack overflow, more than {MAX_STACK_SIZE} slots")
+    stack.extend(repeat(0, size - len(stack)))
+    return size - STACK_HEADROOM
+
+
+def ret_stack_as_str(stack) -> str:
     """
     It returns a string representation of the stack.
 
-    :param stack: list
-    :type stack: list
+    :param stack: list or StackView
     """
-    ret_val = ""
-    for index, i in enumerate(stack):
-        ret_val += str(index) + "\t" + str(i) + "\n"
-    return ret_val
+    return "".join(f"{index}\t{value}\n" for index, value in enumerate(stack))
 
 
-def run_pl0_code(generated_code: list) -> str:
+def write_stack(stack, file, chunk_lines=4096):
     """
-    It takes a list of pl/0 code, and returns a string of stack
+    It writes the stack to the file object in chunks, so neither the whole dump nor a copy of the stack
+    is held in memory
+
+    :param stack: list or StackView
+    :param file: object with a write method
+    :param chunk_lines: number of lines rendered at once (optional)
+    """
+    values = iter(stack)
+    for start in range(0, len(stack), chunk_lines):
+        file.write("".join(f"{index}\t{value}\n"
+                           for index, value in enumerate(islice(values, chunk_lines), start)))
+
 
-    :param generated_code: list
-    :type generated_code: list
+def execute(generated_code: InstructionBuffer, stack_size=STACK_SIZE) -> tuple:
     """
-    if len(generated_code) > 0:
-        return "pl/0 machine is lazy...\n"
-    static_base = 0
-    stack_pointer = -1
+    It runs the code on the PL/0 machine, a frame starts with the static link, the dynamic link and the return address,
+    and returns the view of the stack up to its top and the number of executed instructions,
+    it is the reference interpreter that src.pl0_vm.dispatch is tested against, it checks the jumps, the top,
+    the frames and the return addresses, so dispatch runs the programs the verifier rejects on it
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    opcodes = generated_code.opcodes
+    levels = generated_code.levels
+    operands = generated_code.operands
+    code_length = len(opcodes)
+    for address, (opcode, operand) in enumerate(zip(opcodes, operands)):
+        if (opcode == JMP or opcode == JMC or opcode == CAL) and not 0 <= operand <= code_length:
+            raise broken_frame(address, "jump target")
+    stack = allocate_stack(stack_size)
+    stack_limit = len(stack) - STACK_HEADROOM
+    base = 0
+    top = -1
     instruction_pointer = 0
-    stack = []
-
-    # Checking if the instruction pointer is less than the length of the generated code.
-    while instruction_pointer < len(generated_code):
-        # Checking if the instruction is a lit.
-        if generated_code[instruction_pointer][0] == Inst.lit.value:
-            stack_pointer += 1
-            if stack_pointer >= len(stack):
-                stack.append(generated_code[instruction_pointer][2])
-            else:
-                stack[stack_pointer] = generated_code[instruction_pointer][2]
+    steps = 0
+    try:
+        while instruction_pointer < code_length:
+            opcode = opcodes[instruction_pointer]
+            operand = operands[instruction_pointer]
+            instruction_pointer += 1
+            steps += 1
 
-        # Checking if the instruction is an operator.
-        elif generated_code[instruction_pointer][0] == Inst.opr.value:
+            if opcode == LIT:
+                top += 1
+                stack[top] = operand
 
-            if int(generated_code[instruction_pointer][2]) == Op.neg.value:
-                stack[stack_pointer] = -stack[stack_pointer]
+            elif opcode == LOD:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    if frame < 0:
+                        raise broken_frame(instruction_pointer - 1, "static link")
+                    level -= 1
+                if frame + operand < 0:
+                    raise broken_frame(instruction_pointer - 1, "address")
+                top += 1
+                stack[top] = stack[frame + operand]
 
-            elif int(generated_code[instruction_pointer][2]) == Op.add.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] + stack[stack_pointer]
-                stack_pointer -= 1
-            elif int(generated_code[instruction_pointer][2]) == Op.sub.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] - stack[stack_pointer]
-                stack_pointer -= 1
+            elif opcode == OPR:
+                if top < 0:
+                    raise stack_underflow(instruction_pointer - 1)
+                if operand == NEG:
+                    stack[top] = -stack[top]
+                    continue
+                if operand == ODD:
+                    stack[top] = stack[top] & 1
+                    continue
+                right = stack[top]
+                top -= 1
+                if top < 0:
+                    raise stack_underflow(instruction_pointer - 1)
+                left = stack[top]
+                if operand == ADD:
+                    stack[top] = left + right
+                elif operand == SUB:
+                    stack[top] = left - right
+                elif operand == MUL:
+                    stack[top] = left * right
+                elif operand == LT:
+                    stack[top] = 1 if left < right else 0
+                elif operand == GT:
+                    stack[top] = 1 if left > right else 0
+                elif operand == EQ:
+                    stack[top] = 1 if left == right else 0
+                elif operand == NE:
+                    stack[top] = 1 if left != right else 0
+                elif operand == LE:
+                    stack[top] = 1 if left <= right else 0
+                elif operand == GE:
+                    stack[top] = 1 if left >= right else 0
+                else:
+                    # division truncates toward zero
+                    quotient = left // right
+                    if quotient < 0 and quotient * right != left:
+                        quotient += 1
+                    if operand == DIV:
+                        stack[top] = quotient
+                    elif operand == MOD:
+                        stack[top] = left - quotient * right
+                    else:
+                        raise Exception(f"Unknown operation {operand} at {instruction_pointer - 1}")
 
-            elif int(generated_code[instruction_pointer][2]) == Op.mul.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] * stack[stack_pointer]
-                stack_pointer -= 1
+            elif opcode == STO:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    if frame < 0:
+                        raise broken_frame(instruction_pointer - 1, "static link")
+                    level -= 1
+                if frame + operand < 0:
+                    raise broken_frame(instruction_pointer - 1, "address")
+                if top < 0:
+                    raise stack_underflow(instruction_pointer - 1)
+                stack[frame + operand] = stack[top]
+                top -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.div.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] / stack[stack_pointer]
-                stack_pointer -= 1
+            # jumps when the condition on the top of the stack is false, the condition is removed
+            elif opcode == JMC:
+                if top < 0:
+                    raise stack_underflow(instruction_pointer - 1)
+                if stack[top] == 0:
+                    instruction_pointer = operand
+                top -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.mod.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] % stack[stack_pointer]
-                stack_pointer -= 1
+            elif opcode == JMP:
+                instruction_pointer = operand
 
-            elif int(generated_code[instruction_pointer][2]) == Op.eq.value:
-                if stack[stack_pointer - 1] == stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+            elif opcode == INT:
+                top += operand
+                if top > stack_limit:
+                    stack_limit = grow_stack(stack, top)
+                elif top < -1:
+                    raise stack_underflow(instruction_pointer - 1)
 
-            elif int(generated_code[instruction_pointer][2]) == Op.ne.value:
-                if stack[stack_pointer - 1] != stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+            # the header of the new frame is written above the arguments and allocated by INT 0 3 of the function
+            elif opcode == CAL:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    if frame < 0:
+                        raise broken_frame(instruction_pointer - 1, "static link")
+                    level -= 1
+                stack[top + 1] = frame
+                stack[top + 2] = base
+                stack[top + 3] = instruction_pointer
+                base = top + 1
+                instruction_pointer = operand
 
-            elif int(generated_code[instruction_pointer][2]) == Op.lt.value:
-                if stack[stack_pointer - 1] < stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+            # the return from the main program stops the machine
+            elif opcode == RET:
+                if base == 0:
+                    break
+                address = instruction_pointer - 1
+                top = base - 1
+                instruction_pointer = stack[base + 2]
+                base = stack[base + 1]
+                if not 0 <= base <= top:
+                    raise broken_frame(address, "dynamic link")
+                if not 0 <= instruction_pointer <= code_length:
+                    raise broken_frame(address, "return address")
 
-            elif int(generated_code[instruction_pointer][2]) == Op.ge.value:
-                if stack[stack_pointer - 1] >= stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+            else:
+                raise Exception(f"Unknown instruction {opcode} at {instruction_pointer - 1}")
+    except (StackUnderflow, BrokenFrame):
+        raise
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    return StackView(stack, top + 1), steps
 
-            elif int(generated_code[instruction_pointer][2]) == Op.le.value:
-                if stack[stack_pointer - 1] <= stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.gt.value:
-                if stack[stack_pointer - 1] > stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
-
-        # It loads the value of the stack to the stack pointer.
-        elif generated_code[instruction_pointer][0] == Inst.lod.value:
-            stack[stack_pointer] = stack[generated_code[instruction_pointer][2] + static_base]
-
-        # It stores the value of the stack pointer to the stack.
-        elif generated_code[instruction_pointer][0] == Inst.sto.value:
-            stack[generated_code[instruction_pointer][2] + static_base] = stack[stack_pointer]
-            stack_pointer -= 1
-
-        # Calling a function.
-        elif generated_code[instruction_pointer][0] == Inst.cal.value:
-            return "this pl/0 machine does not support functions\n"
-            # stack.append(stack_pointer)
-            # stack.append(0)
-            # stack.append(copy(instruction_pointer))
-            # instruction_pointer = generated_code[instruction_pointer][2] - 1
-            # static_base = stack_pointer + 1
-
-        # It adds the value of the instruction to the stack pointer.
-        # If the stack pointer is greater than the length of the stack, it adds 0 to the stack.
-        elif generated_code[instruction_pointer][0] == Inst.int.value:
-            stack_pointer += generated_code[instruction_pointer][2]
-            if stack_pointer - len(stack) > -1:
-                for _ in range(stack_pointer - len(stack) + 1):
-                    stack.append(0)
-
-        # Returning the value of the stack.
-        elif generated_code[instruction_pointer][0] == Inst.ret.value:
-            if static_base == 0:
-                break
-            instruction_pointer = stack[static_base + 2]
-            stack_pointer = static_base - 1
-            static_base = 0
-
-        # Checking if the stack pointer is 0. If it is, it jumps to the instruction that is given in the generated code.
-        elif generated_code[instruction_pointer][0] == Inst.jmc.value:
-            if stack[stack_pointer] == 0:
-                instruction_pointer = generated_code[instruction_pointer][2] - 1
-
-        # Jumping to the instruction that is given in the generated code.
-        elif generated_code[instruction_pointer][0] == Inst.jmp.value:
-            instruction_pointer = generated_code[instruction_pointer][2] - 1
-
-        # Checking if the instruction pointer is less than the length of the generated code and stack controls too.
-        if instruction_pointer < 0 or instruction_pointer > len(generated_code) or \
-                stack_pointer < 0 or stack_pointer > len(stack):
-            raise IndexError("ERR in executing generated code...")
-
-        # Incrementing the instruction pointer by 1.
-        instruction_pointer += 1
+def run_pl0_code(generated_code: InstructionBuffer) -> str:
+    """
+    It runs the code on the PL/0 machine, and returns a string of stack
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    from src.pl0_vm.dispatch import execute as execute_decoded
+    stack, _ = execute_decoded(generated_code)
     return ret_stack_as_str(stack)
@@ -0,0 +1,358 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import json
+from collections import Counter
+from time import perf_counter_ns
+
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.line_table import LineTable
+from src.pl0_code_generator.instructions import Op, INST_NAMES, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm.p_machine import (STACK_SIZE, STACK_HEADROOM, NEG, ADD, SUB, MUL, DIV, MOD, ODD, EQ, NE, LT, GE, GT,
+                                  LE, StackView, allocate_stack, grow_stack)
+
+OPERATION_NAMES = {operation.value: operation.name for operation in Op}
+# name of the code outside of all functions in the counts per function
+MAIN_NAME = "<main>"
+
+
+class Profile:
+    """
+    It is the result of profile, the number of executions of every address (and the time spent there if the run
+    was timed) and the highest number of slots of the stack in use, the counts per instruction, per operation,
+    per called function and per line of the source are derived from them
+    """
+    __slots__ = ("code", "address_counts", "high_water_mark", "address_times")
+
+    def __init__(self, generated_code: InstructionBuffer, address_counts: list, high_water_mark: int,
+                 address_times=None) -> None:
+        self.code = generated_code
+        self.address_counts = address_counts
+        self.high_water_mark = high_water_mark
+        # nanoseconds spent at every address, None if the run was not timed
+        self.address_times = address_times
+
+    @property
+    def steps(self) -> int:
+        return sum(self.address_counts)
+
+    def instruction_counts(self) -> dict:
+        """
+        It returns the name of the instruction -> number of its executions
+        """
+        counts = Counter()
+        for opcode, count in zip(self.code.opcodes, self.address_counts):
+            counts[INST_NAMES[opcode]] += count
+        return {name: counts[name] for name in INST_NAMES if counts[name]}
+
+    def operation_counts(self) -> dict:
+        """
+        It returns the name of the operation of OPR -> number of its executions
+        """
+        counts = Counter()
+        for (opcode, _, operand), count in zip(self.code, self.address_counts):
+            if opcode == OPR and count:
+                counts[OPERATION_NAMES.get(operand, str(operand))] += count
+        return dict(counts.most_common())
+
+    def call_counts(self) -> dict:
+        """
+        It returns the address of the called function -> number of calls
+        """
+        counts = Counter()
+        for (opcode, _, operand), count in zip(self.code, self.address_counts):
+            if opcode == CAL and count:
+                counts[operand] += count
+        return dict(counts.most_common())
+
+    def function_ranges(self) -> list:
+        """
+        It returns (entry, end) of the body of every called function, the generator jumps over the body,
+        so it ends at the target of the JMP in front of the entry, otherwise at its first RET
+        """
+        opcodes = self.code.opcodes
+        operands = self.code.operands
+        ranges = []
+        for entry in sorted({operand for opcode, _, operand in self.code if opcode == CAL}):
+            if entry > 0 and opcodes[entry - 1] == JMP and operands[entry - 1] > entry:
+                end = operands[entry - 1]
+            else:
+                end = entry
+                while end < len(opcodes) and opcodes[end] != RET:
+                    end += 1
+                end += 1
+            ranges.append((entry, min(end, len(opcodes))))
+        return ranges
+
+    def function_of_addresses(self) -> list:
+        """
+        It returns the entry of the function of every address, 0 for the main program,
+        a nested function overrides the function around it
+        """
+        functions = [0] * len(self.code)
+        for entry, end in sorted(self.function_ranges(), key=lambda pair: (pair[0], -pair[1])):
+            functions[entry:end] = [entry] * (end - entry)
+        return functions
+
+    def function_counts(self) -> dict:
+        """
+        It returns the entry of the function -> number of instructions executed in its body (0 for the main program)
+        """
+        return sum_by(self.function_of_addresses(), self.address_counts)
+
+    def function_times(self) -> dict:
+        """
+        It returns the entry of the function -> nanoseconds spent in its body (0 for the main program),
+        the run must be timed
+        """
+        if self.address_times is None:
+            raise Exception("the profile has no times, run profile with timed=True")
+        return sum_by(self.function_of_addresses(), self.address_times)
+
+    def line_counts(self, line_table: LineTable) -> dict:
+        """
+        It returns the line of the source -> number of instructions executed for it (0 for the code the generator
+        adds on its own)
+
+        :param line_table: debug section of the generator, address -> line
+        """
+        return sum_by(line_table.expand(len(self.code)), self.address_counts)
+
+    def line_times(self, line_table: LineTable) -> dict:
+        """
+        It returns the line of the source -> nanoseconds spent in its instructions, the run must be timed
+
+        :param line_table: debug section of the generator, address -> line
+        """
+        if self.address_times is None:
+            raise Exception("the profile has no times, run profile with timed=True")
+        return sum_by(line_table.expand(len(self.code)), self.address_times)
+
+    def hot_lines(self, line_table: LineTable, limit=10) -> list:
+        """
+        It returns (line, number of executed instructions) of the lines that executed the most instructions
+
+        :param line_table: debug section of the generator, address -> line
+        :param limit: maximal number of lines (optional)
+        """
+        return Counter(self.line_counts(line_table)).most_common(limit)
+
+    def to_dict(self, line_table=None, function_names=None) -> dict:
+        """
+        It returns the counts as a dictionary that can be exported as json
+
+        :param line_table: debug section of the generator, the counts per line are added with it (optional)
+        :param function_names: entry of the function -> its name (generator.function_names()), the functions
+                               are keyed by their names, by their entries if the name is not known (optional)
+        """
+        names = {0: MAIN_NAME}
+        names.update(function_names or {})
+        result = {
+            "steps": self.steps,
+            "stack_high_water_mark": self.high_water_mark,
+            "instructions": self.instruction_counts(),
+            "operations": self.operation_counts(),
+            # json keys are strings
+            "calls": {str(address): count for address, count in self.call_counts().items()},
+            "functions": {names.get(entry, str(entry)): count for entry, count in self.function_counts().items()},
+            "addresses": self.address_counts,
+        }
+        if line_table is not None:
+            result["lines"] = {str(line): count for line, count in self.line_counts(line_table).items()}
+        if self.address_times is not None:
+            result["function_times_ns"] = {names.get(entry, str(entry)): time
+                                           for entry, time in self.function_times().items()}
+            if line_table is not None:
+                result["line_times_ns"] = {str(line): time for line, time in self.line_times(line_table).items()}
+            result["address_times_ns"] = self.address_times
+        return result
+
+    def to_json(self, indent=2, line_table=None, function_names=None) -> str:
+        return json.dumps(self.to_dict(line_table, function_names), indent=indent)
+
+    def annotated_listing(self) -> str:
+        """
+        It returns the generated code in the format of return_code() with the number of executions
+        and the share of all steps in front of every instruction
+        """
+        steps = max(self.steps, 1)
+        return "".join(f"{count:>10} {100 * count / steps:6.2f}%  {line}\n"
+                       for count, line in zip(self.address_counts, self.code.render()))
+
+    def annotated_source(self, source: str, line_table: LineTable) -> str:
+        """
+        It returns the source with the number of executed instructions of every line and their share of all steps
+        (and the share of the time if the run was timed) in front of it, lines without code have no counts
+
+        :param source: the source code the code was generated from
+        :param line_table: debug section of the generator, address -> line
+        """
+        steps = max(self.steps, 1)
+        counts = self.line_counts(line_table)
+        times = self.line_times(line_table) if self.address_times is not None else None
+        total_time = max(sum(self.address_times), 1) if times is not None else 1
+        annotated = []
+        for number, line in enumerate(source.splitlines(), start=1):
+            if number in counts:
+                prefix = f"{counts[number]:>10} {100 * counts[number] / steps:6.2f}%"
+                if times is not None:
+                    prefix += f" {100 * times[number] / total_time:6.2f}%t"
+            else:
+                prefix = " " * (18 if times is None else 26)
+            annotated.append(f"{prefix}  {number:>4}  {line}\n")
+        return "".join(annotated)
+
+
+def sum_by(keys: list, values: list) -> dict:
+    """
+    It sums the values with the same key, keys come in ascending order
+
+    :param keys: key of every value
+    :param values: values to sum
+    """
+    sums = {}
+    for key, value in zip(keys, values):
+        sums[key] = sums.get(key, 0) + value
+    return dict(sorted(sums.items()))
+
+
+def profile(generated_code: InstructionBuffer, stack_size=STACK_SIZE, timed=False) -> tuple:
+    """
+    It runs the code as p_machine.execute does and counts the executions of every address, it is a separate loop,
+    so the machines do not pay anything for the profiling, it returns the stack and the Profile
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    :param timed: If True, the time between the starts of two instructions is added to the first one,
+                  the clock makes the run several times slower (optional)
+    """
+    opcodes = generated_code.opcodes
+    levels = generated_code.levels
+    operands = generated_code.operands
+    code_length = len(opcodes)
+    counts = [0] * code_length
+    times = [0] * code_length if timed else None
+    clock = perf_counter_ns
+    previous = 0
+    last = clock()
+    stack = allocate_stack(stack_size)
+    stack_limit = len(stack) - STACK_HEADROOM
+    base = 0
+    top = -1
+    high_water_mark = 0
+    instruction_pointer = 0
+    try:
+        while instruction_pointer < code_length:
+            opcode = opcodes[instruction_pointer]
+            operand = operands[instruction_pointer]
+            counts[instruction_pointer] += 1
+            if timed:
+                now = clock()
+                times[previous] += now - last
+                last = now
+                previous = instruction_pointer
+            instruction_pointer += 1
+
+            if opcode == LIT:
+                top += 1
+                stack[top] = operand
+                if top >= high_water_mark:
+                    high_water_mark = top + 1
+            elif opcode == LOD:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                top += 1
+                stack[top] = stack[frame + operand]
+                if top >= high_water_mark:
+                    high_water_mark = top + 1
+            elif opcode == OPR:
+                if operand == NEG:
+                    stack[top] = -stack[top]
+                    continue
+                if operand == ODD:
+                    stack[top] = stack[top] & 1
+                    continue
+                right = stack[top]
+                top -= 1
+                left = stack[top]
+                if operand == ADD:
+                    stack[top] = left + right
+                elif operand == SUB:
+                    stack[top] = left - right
+                elif operand == MUL:
+                    stack[top] = left * right
+                elif operand == LT:
+                    stack[top] = 1 if left < right else 0
+                elif operand == GT:
+                    stack[top] = 1 if left > right else 0
+                elif operand == EQ:
+                    stack[top] = 1 if left == right else 0
+                elif operand == NE:
+                    stack[top] = 1 if left != right else 0
+                elif operand == LE:
+                    stack[top] = 1 if left <= right else 0
+                elif operand == GE:
+                    stack[top] = 1 if left >= right else 0
+                else:
+                    # division truncates toward zero
+                    quotient = left // right
+                    if quotient < 0 and quotient * right != left:
+                        quotient += 1
+                    if operand == DIV:
+                        stack[top] = quotient
+                    elif operand == MOD:
+                        stack[top] = left - quotient * right
+                    else:
+                        raise Exception(f"Unknown operation {operand} at {instruction_pointer - 1}")
+            elif opcode == STO:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[frame + operand] = stack[top]
+                top -= 1
+            elif opcode == JMC:
+                if stack[top] == 0:
+                    instruction_pointer = operand
+                top -= 1
+            elif opcode == JMP:
+                instruction_pointer = operand
+            elif opcode == INT:
+                top += operand
+                if top >= high_water_mark:
+                    high_water_mark = top + 1
+                if top > stack_limit:
+                    stack_limit = grow_stack(stack, top)
+            elif opcode == CAL:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[top + 1] = frame
+                stack[top + 2] = base
+                stack[top + 3] = instruction_pointer
+                # the header of the callee is in use before its INT allocates it
+                if top + 3 >= high_water_mark:
+                    high_water_mark = top + 4
+                base = top + 1
+                instruction_pointer = operand
+            elif opcode == RET:
+                if base == 0:
+                    break
+                top = base - 1
+                instruction_pointer = stack[base + 2]
+                base = stack[base + 1]
+            else:
+                raise Exception(f"Unknown instruction {opcode} at {instruction_pointer - 1}")
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    if timed and code_length:
+        times[previous] += clock() - last
+    # the generator reuses its buffer for the next compilation
+    return StackView(stack, top + 1), Profile(generated_code.copy(), counts, high_water_mark, times)
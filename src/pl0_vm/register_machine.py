@@ -0,0 +1,385 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import operator
+
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm.block_compiler import divide, find_leaders, modulo
+from src.pl0_vm.p_machine import STACK_SIZE, STACK_HEADROOM, StackView, allocate_stack, grow_stack
+
+# operands of the register IR, a slot of the current frame (stack[base + index]) or a register (registers[index]),
+# constants are registers that are set before the start and never written
+FRAME, REGISTER = "F", "R"
+
+# opcodes of the register IR, the suffix gives the kinds of the operands (destination first)
+(MOV_FF, MOV_FR, MOV_RF, MOV_RR,
+ BIN_FFF, BIN_FFR, BIN_FRF, BIN_FRR, BIN_RFF, BIN_RFR, BIN_RRF, BIN_RRR,
+ BR_FF, BR_FR, BR_RF, BR_RR, JZ_F, JZ_R, JMP_IR,
+ LOAD_LEVEL, STORE_LEVEL, TAKE, PUT_F, PUT_R, SHIFT, INT_IR, CAL_IR, RET_IR, HALT) = range(29)
+
+MOVES = {(FRAME, FRAME): MOV_FF, (FRAME, REGISTER): MOV_FR, (REGISTER, FRAME): MOV_RF, (REGISTER, REGISTER): MOV_RR}
+BINARIES = {(FRAME, FRAME, FRAME): BIN_FFF, (FRAME, FRAME, REGISTER): BIN_FFR, (FRAME, REGISTER, FRAME): BIN_FRF,
+            (FRAME, REGISTER, REGISTER): BIN_FRR, (REGISTER, FRAME, FRAME): BIN_RFF,
+            (REGISTER, FRAME, REGISTER): BIN_RFR, (REGISTER, REGISTER, FRAME): BIN_RRF,
+            (REGISTER, REGISTER, REGISTER): BIN_RRR}
+BRANCHES = {(FRAME, FRAME): BR_FF, (FRAME, REGISTER): BR_FR, (REGISTER, FRAME): BR_RF, (REGISTER, REGISTER): BR_RR}
+
+ARITHMETIC = {Op.add.value: operator.add, Op.sub.value: operator.sub, Op.mul.value: operator.mul,
+              Op.div.value: divide, Op.mod.value: modulo}
+# conditional jumps branch on RELATIONS, RELATION_VALUES compute relations that are stored or pushed
+RELATIONS = {Op.eq.value: operator.eq, Op.ne.value: operator.ne, Op.lt.value: operator.lt, Op.ge.value: operator.ge,
+             Op.gt.value: operator.gt, Op.le.value: operator.le}
+RELATION_VALUES = {
+    Op.eq.value: lambda left, right: 1 if left == right else 0,
+    Op.ne.value: lambda left, right: 1 if left != right else 0,
+    Op.lt.value: lambda left, right: 1 if left < right else 0,
+    Op.ge.value: lambda left, right: 1 if left >= right else 0,
+    Op.gt.value: lambda left, right: 1 if left > right else 0,
+    Op.le.value: lambda left, right: 1 if left <= right else 0,
+}
+
+
+class RegisterTranslator:
+    """
+    It translates the stack code to the register IR block by block, the stack of the block is simulated during
+    the translation, so loads, constants and results of operations become operands of the instructions that use them
+    and only values that are left on the stack at the end of the block are pushed
+    """
+
+    def __init__(self) -> None:
+        self.program = []
+        # value of the constant -> its register
+        self.constants = {}
+        # values of the registers before the start, constants first
+        self.registers = []
+        # temporaries follow the constants, every block uses them from the first one
+        self.temporaries_start = 0
+        self.temporaries = 0
+        # values pushed in this block, operands (kind, index) or relations (None, operation, left, right)
+        self.values = []
+        # number of values taken from the stack below the top at the start of the block
+        self.taken = 0
+        # instructions whose jump targets (and return addresses of calls) are addresses of the stack code
+        self.fixups = []
+
+    def emit(self, opcode: int, *arguments):
+        self.program.append((opcode,) + arguments + (None,) * (4 - len(arguments)))
+
+    def constant(self, value: int) -> tuple:
+        if value not in self.constants:
+            self.constants[value] = len(self.registers)
+            self.registers.append(value)
+        return REGISTER, self.constants[value]
+
+    def temporary(self) -> tuple:
+        self.temporaries += 1
+        return REGISTER, self.temporaries_start + self.temporaries - 1
+
+    def materialize(self, value: tuple) -> tuple:
+        """
+        It returns the operand of the value, a relation is computed to a temporary
+        """
+        if value[0] is not None:
+            return value
+        _, operation, left, right = value
+        target = self.temporary()
+        self.emit(BINARIES[REGISTER, left[0], right[0]], RELATION_VALUES[operation], target[1], left[1], right[1])
+        return target
+
+    def pop_value(self) -> tuple:
+        if self.values:
+            return self.values.pop()
+        target = self.temporary()
+        self.emit(TAKE, target[1], self.taken)
+        self.taken += 1
+        return target
+
+    def pop(self) -> tuple:
+        return self.materialize(self.pop_value())
+
+    def store(self, slot: int, value: tuple):
+        """
+        It stores the value to the slot of the current frame, values of the block that still read the slot
+        are copied to temporaries first
+        """
+        for position, pending in enumerate(self.values):
+            if pending == (FRAME, slot):
+                copy = self.temporary()
+                self.emit(MOV_RF, copy[1], slot)
+                self.values[position] = copy
+            elif pending[0] is None and (FRAME, slot) in pending[2:]:
+                self.values[position] = self.materialize(pending)
+        last = self.program[-1] if self.program else None
+        if value[0] == REGISTER and value[1] >= self.temporaries_start and last is not None and \
+                BIN_RFF <= last[0] <= BIN_RRR and last[2] == value[1]:
+            # the operation that computed the value writes it to the slot directly
+            self.program[-1] = (last[0] - (BIN_RFF - BIN_FFF), last[1], slot, last[3], last[4])
+        else:
+            self.emit(MOVES[FRAME, value[0]], slot, value[1])
+
+    def flush(self):
+        """
+        It writes the values pushed in the block to the stack and moves the top of the stack
+        """
+        values = [self.materialize(value) for value in self.values]
+        self.values = []
+        for offset, (kind, index) in enumerate(values, 1 - self.taken):
+            self.emit(PUT_F if kind == FRAME else PUT_R, index, offset)
+        shift = len(values) - self.taken
+        if shift:
+            self.emit(SHIFT, shift)
+        self.taken = 0
+
+    def jump(self, opcode: int, address: int, *arguments):
+        self.fixups.append(len(self.program))
+        self.emit(opcode, *(arguments + (None,) * (3 - len(arguments)) + (address,)))
+
+    def translate(self, generated_code: InstructionBuffer) -> tuple:
+        """
+        It translates the code, it returns the IR program and the initial values of the registers
+
+        :param generated_code: generated instructions
+        :type generated_code: InstructionBuffer
+        """
+        code_length = len(generated_code)
+        leaders = find_leaders(generated_code)
+        for opcode, _, operand in generated_code:
+            if opcode == LIT:
+                self.constant(operand)
+        self.constant(0)
+        self.constant(1)
+        self.temporaries_start = len(self.registers)
+        most_temporaries = 0
+        starts = {}
+        for start, end in zip(leaders, leaders[1:] + [code_length]):
+            starts[start] = len(self.program)
+            self.temporaries = 0
+            self.translate_block(generated_code, start, end)
+            most_temporaries = max(most_temporaries, self.temporaries)
+        # jumps behind the last instruction end the program
+        starts[code_length] = len(self.program)
+        self.emit(HALT)
+        for index in self.fixups:
+            opcode, first, second, third, address = self.program[index]
+            if opcode == CAL_IR:
+                third = starts[third]
+            self.program[index] = (opcode, first, second, third, starts[address])
+        return self.program, self.registers + [0] * most_temporaries
+
+    def translate_block(self, generated_code: InstructionBuffer, start: int, end: int):
+        """
+        It translates the instructions from start to end (exclusive)
+
+        :param generated_code: generated instructions
+        :param start: address of the first instruction of the block
+        :param end: address behind the block
+        """
+        for address in range(start, end):
+            opcode, level, operand = generated_code[address]
+            if opcode == LIT:
+                self.values.append(self.constant(operand))
+            elif opcode == LOD:
+                if level == 0:
+                    self.values.append((FRAME, operand))
+                else:
+                    target = self.temporary()
+                    self.emit(LOAD_LEVEL, target[1], level, operand)
+                    self.values.append(target)
+            elif opcode == STO:
+                value = self.pop()
+                if level == 0:
+                    self.store(operand, value)
+                else:
+                    if value[0] == FRAME:
+                        copy = self.temporary()
+                        self.emit(MOV_RF, copy[1], value[1])
+                        value = copy
+                    self.emit(STORE_LEVEL, value[1], level, operand)
+            elif opcode == OPR:
+                self.translate_operation(operand, address)
+            elif opcode == INT:
+                self.flush()
+                self.emit(INT_IR, operand)
+            elif opcode == JMP:
+                self.flush()
+                self.jump(JMP_IR, operand)
+                return
+            elif opcode == JMC:
+                condition = self.pop_value()
+                self.flush()
+                if condition[0] is None:
+                    _, operation, left, right = condition
+                    self.jump(BRANCHES[left[0], right[0]], operand, RELATIONS[operation], left[1], right[1])
+                else:
+                    self.jump(JZ_F if condition[0] == FRAME else JZ_R, operand, condition[1])
+                return
+            elif opcode == CAL:
+                self.flush()
+                # the return address is an address of the stack code too
+                self.jump(CAL_IR, operand, level, None, address + 1)
+                return
+            elif opcode == RET:
+                self.flush()
+                self.emit(RET_IR)
+                return
+            else:
+                raise Exception(f"Unknown instruction {opcode} at {address}")
+        self.flush()
+
+    def translate_operation(self, operation: int, address: int):
+        if operation == Op.neg.value:
+            operands = (self.constant(0), self.pop())
+            function = ARITHMETIC[Op.sub.value]
+        elif operation == Op.odd.value:
+            operands = (self.pop(), self.constant(1))
+            function = operator.and_
+        elif operation in ARITHMETIC or operation in RELATIONS:
+            right = self.pop()
+            operands = (self.pop(), right)
+            if operation in RELATIONS:
+                # the relation is computed by the instruction that uses it, a conditional jump branches on it
+                self.values.append((None, operation) + operands)
+                return
+            function = ARITHMETIC[operation]
+        else:
+            raise Exception(f"Unknown operation {operation} at {address}")
+        left, right = operands
+        target = self.temporary()
+        self.emit(BINARIES[REGISTER, left[0], right[0]], function, target[1], left[1], right[1])
+        self.values.append(target)
+
+def translate(generated_code: InstructionBuffer) -> tuple:
+    """
+    It translates the code to the register IR, it returns the list of IR instructions
+    (opcode and four arguments) and the initial values of the registers
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    return RegisterTranslator().translate(generated_code)
+
+
+def execute_translated(program: list, registers: list, stack_size=STACK_SIZE) -> tuple:
+    """
+    It runs the register IR, it returns the same stack as p_machine.execute and the number of executed
+    IR instructions
+
+    :param program: IR instructions returned by translate
+    :param registers: initial values of the registers returned by translate
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    registers = list(registers)
+    stack = allocate_stack(stack_size)
+    stack_limit = len(stack) - STACK_HEADROOM
+    base = 0
+    top = -1
+    instruction_pointer = 0
+    steps = 0
+    try:
+        while True:
+            opcode, first, second, third, fourth = program[instruction_pointer]
+            instruction_pointer += 1
+            steps += 1
+
+            if opcode == BIN_FRF:
+                stack[base + second] = first(registers[third], stack[base + fourth])
+            elif opcode == BIN_FFR:
+                stack[base + second] = first(stack[base + third], registers[fourth])
+            elif opcode == BIN_FFF:
+                stack[base + second] = first(stack[base + third], stack[base + fourth])
+            elif opcode == BR_FR:
+                if not first(stack[base + second], registers[third]):
+                    instruction_pointer = fourth
+            elif opcode == BR_FF:
+                if not first(stack[base + second], stack[base + third]):
+                    instruction_pointer = fourth
+            elif opcode == JMP_IR:
+                instruction_pointer = fourth
+            elif opcode == MOV_FR:
+                stack[base + first] = registers[second]
+            elif opcode == MOV_FF:
+                stack[base + first] = stack[base + second]
+            elif opcode == BIN_RFF:
+                registers[second] = first(stack[base + third], stack[base + fourth])
+            elif opcode == BIN_RFR:
+                registers[second] = first(stack[base + third], registers[fourth])
+            elif opcode == BIN_RRF:
+                registers[second] = first(registers[third], stack[base + fourth])
+            elif opcode == BIN_RRR:
+                registers[second] = first(registers[third], registers[fourth])
+            elif opcode == BIN_FRR:
+                stack[base + second] = first(registers[third], registers[fourth])
+            elif opcode == BR_RF:
+                if not first(registers[second], stack[base + third]):
+                    instruction_pointer = fourth
+            elif opcode == BR_RR:
+                if not first(registers[second], registers[third]):
+                    instruction_pointer = fourth
+            elif opcode == JZ_F:
+                if stack[base + first] == 0:
+                    instruction_pointer = fourth
+            elif opcode == JZ_R:
+                if registers[first] == 0:
+                    instruction_pointer = fourth
+            elif opcode == MOV_RF:
+                registers[first] = stack[base + second]
+            elif opcode == MOV_RR:
+                registers[first] = registers[second]
+            elif opcode == PUT_F:
+                stack[top + second] = stack[base + first]
+            elif opcode == PUT_R:
+                stack[top + second] = registers[first]
+            elif opcode == TAKE:
+                registers[first] = stack[top - second]
+            elif opcode == SHIFT:
+                top += first
+            elif opcode == INT_IR:
+                top += first
+                if top > stack_limit:
+                    stack_limit = grow_stack(stack, top)
+            elif opcode == CAL_IR:
+                frame = base
+                level = first
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[top + 1] = frame
+                stack[top + 2] = base
+                stack[top + 3] = third
+                base = top + 1
+                instruction_pointer = fourth
+            elif opcode == RET_IR:
+                if base == 0:
+                    break
+                top = base - 1
+                instruction_pointer = stack[base + 2]
+                base = stack[base + 1]
+            elif opcode == LOAD_LEVEL or opcode == STORE_LEVEL:
+                frame = base
+                level = second
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                if opcode == LOAD_LEVEL:
+                    registers[first] = stack[frame + third]
+                else:
+                    stack[frame + third] = registers[first]
+            elif opcode == HALT:
+                break
+            else:
+                raise Exception(f"Unknown IR instruction {opcode} at {instruction_pointer - 1}")
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    return StackView(stack, top + 1), steps
+
+
+def execute(generated_code: InstructionBuffer, stack_size=STACK_SIZE) -> tuple:
+    """
+    It translates the code to the register IR and runs it
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    """
+    return execute_translated(*translate(generated_code), stack_size)
@@ -0,0 +1,246 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+from src.pl0_vm.block_compiler import BlockTranslator, divide, modulo
+from src.pl0_vm.p_machine import STACK_SIZE, STACK_HEADROOM, StackView, allocate_stack, grow_stack
+
+# number of backward jumps to a loop header before its trace is recorded and compiled
+HOT_LOOP_THRESHOLD = 50
+# longer traces are not compiled, the loop stays in the interpreter
+MAX_TRACE_LENGTH = 2000
+
+NEG, ADD, SUB, MUL, DIV, MOD, ODD, EQ, NE, LT, GE, GT, LE = (operation.value for operation in Op)
+BINARY_OPERATIONS = {
+    ADD: lambda left, right: left + right,
+    SUB: lambda left, right: left - right,
+    MUL: lambda left, right: left * right,
+    DIV: divide,
+    MOD: modulo,
+    EQ: lambda left, right: 1 if left == right else 0,
+    NE: lambda left, right: 1 if left != right else 0,
+    LT: lambda left, right: 1 if left < right else 0,
+    GE: lambda left, right: 1 if left >= right else 0,
+    GT: lambda left, right: 1 if left > right else 0,
+    LE: lambda left, right: 1 if left <= right else 0,
+}
+
+
+class TraceTranslator(BlockTranslator):
+    """
+    It translates a recorded trace of a loop to a python function, every JMC of the trace becomes a guard
+    that leaves the function when the condition goes the other way than during the recording
+    """
+
+    def translate_trace(self, generated_code: InstructionBuffer, trace: list) -> str:
+        """
+        It returns the source of trace(stack, top, base, steps) that runs the loop until a guard fails
+        and returns the address where the interpreter continues, the top of the stack and the number of steps
+
+        :param generated_code: generated instructions
+        :param trace: executed instructions of one iteration, (address, True if JMC jumped)
+        """
+        counted = 0
+        for position, (address, jumped) in enumerate(trace, 1):
+            opcode, level, operand = generated_code[address]
+            if opcode == JMC:
+                condition = self.pop_condition()
+                self.flush()
+                self.emit(f"steps += {position - counted}")
+                counted = position
+                if jumped:
+                    self.emit(f"if {condition}:")
+                    self.emit(f"    return {address + 1}, top, steps")
+                else:
+                    self.emit(f"if not ({condition}):")
+                    self.emit(f"    return {operand}, top, steps")
+            elif opcode == LIT:
+                self.push(str(operand))
+            elif opcode == LOD:
+                self.push(self.temporary(f"stack[{self.frame(level)} + {operand}]"))
+            elif opcode == STO:
+                value = self.pop()
+                self.emit(f"stack[{self.frame(level)} + {operand}] = {value}")
+            elif opcode == OPR:
+                self.translate_operation(operand, address)
+        # jumps of the trace need no code, the trace ends where the header of the loop follows
+        self.flush()
+        if counted < len(trace):
+            self.emit(f"steps += {len(trace) - counted}")
+        return "\n".join(["def trace(stack, top, base, steps):", "    while True:"] +
+                         ["        " + line for line in self.lines]) + "\n"
+
+
+def compile_trace(generated_code: InstructionBuffer, trace: list):
+    """
+    It translates the trace to python and compiles it
+
+    :param generated_code: generated instructions
+    :param trace: executed instructions of one iteration, (address, True if JMC jumped)
+    """
+    namespace = {"divide": divide, "modulo": modulo}
+    source = TraceTranslator().translate_trace(generated_code, trace)
+    exec(compile(source, "<pl/0 trace>", "exec"), namespace)
+    return namespace["trace"]
+
+
+def record_trace(opcodes, levels, operands, stack, header, top, base, steps):
+    """
+    It executes one iteration of the loop from its header and records the executed instructions,
+    it returns the trace (None if the loop calls functions, allocates memory, leaves the loop or is too long),
+    the address of the next instruction, the top of the stack and the number of steps
+
+    :param header: address of the first instruction of the loop
+    """
+    trace = []
+    visited = set()
+    instruction_pointer = header
+    while len(trace) < MAX_TRACE_LENGTH:
+        address = instruction_pointer
+        opcode = opcodes[address]
+        if opcode == CAL or opcode == RET or opcode == INT or address in visited:
+            return None, address, top, steps
+        visited.add(address)
+        operand = operands[address]
+        instruction_pointer += 1
+        steps += 1
+        jumped = False
+        if opcode == LIT:
+            top += 1
+            stack[top] = operand
+        elif opcode == LOD or opcode == STO:
+            frame = base
+            for _ in range(levels[address]):
+                frame = stack[frame]
+            if opcode == LOD:
+                top += 1
+                stack[top] = stack[frame + operand]
+            else:
+                stack[frame + operand] = stack[top]
+                top -= 1
+        elif opcode == OPR:
+            if operand == NEG:
+                stack[top] = -stack[top]
+            elif operand == ODD:
+                stack[top] = stack[top] & 1
+            else:
+                top -= 1
+                stack[top] = BINARY_OPERATIONS[operand](stack[top], stack[top + 1])
+        elif opcode == JMC:
+            jumped = stack[top] == 0
+            top -= 1
+            if jumped:
+                instruction_pointer = operand
+        elif opcode == JMP:
+            instruction_pointer = operand
+        trace.append((address, jumped))
+        if instruction_pointer == header:
+            return trace, instruction_pointer, top, steps
+    return None, instruction_pointer, top, steps
+
+
+def execute(generated_code: InstructionBuffer, stack_size=STACK_SIZE, threshold=HOT_LOOP_THRESHOLD) -> tuple:
+    """
+    It interprets the code, loops whose header is reached by a backward jump more than threshold times are recorded
+    and compiled to python, the compiled trace runs until one of its guards fails and the interpreter continues,
+    it returns the same stack and number of steps as p_machine.execute
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    :param stack_size: number of slots allocated before the start, the stack grows when INT needs more (optional)
+    :param threshold: number of iterations of a loop before it is compiled (optional)
+    """
+    opcodes = list(generated_code.opcodes)
+    levels = list(generated_code.levels)
+    operands = list(generated_code.operands)
+    code_length = len(opcodes)
+    stack = allocate_stack(stack_size)
+    stack_limit = len(stack) - STACK_HEADROOM
+    base = 0
+    top = -1
+    instruction_pointer = 0
+    steps = 0
+    # header of the loop -> number of backward jumps to it
+    hotness = {}
+    # header of the loop -> compiled trace, None if the loop cannot be traced
+    traces = {}
+    try:
+        while instruction_pointer < code_length:
+            opcode = opcodes[instruction_pointer]
+            operand = operands[instruction_pointer]
+            instruction_pointer += 1
+            steps += 1
+
+            if opcode == LIT:
+                top += 1
+                stack[top] = operand
+            elif opcode == LOD:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                top += 1
+                stack[top] = stack[frame + operand]
+            elif opcode == OPR:
+                if operand == NEG:
+                    stack[top] = -stack[top]
+                elif operand == ODD:
+                    stack[top] = stack[top] & 1
+                else:
+                    top -= 1
+                    stack[top] = BINARY_OPERATIONS[operand](stack[top], stack[top + 1])
+            elif opcode == STO:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[frame + operand] = stack[top]
+                top -= 1
+            elif opcode == JMC:
+                if stack[top] == 0:
+                    instruction_pointer = operand
+                top -= 1
+            elif opcode == JMP:
+                # a backward jump closes a loop, its target is the header of the loop
+                if operand < instruction_pointer:
+                    trace = traces.get(operand)
+                    if trace is not None:
+                        instruction_pointer, top, steps = trace(stack, top, base, steps)
+                        continue
+                    if operand not in traces:
+                        hotness[operand] = hotness.get(operand, 0) + 1
+                        if hotness[operand] >= threshold:
+                            recorded, instruction_pointer, top, steps = record_trace(opcodes, levels, operands, stack,
+                                                                                     operand, top, base, steps)
+                            traces[operand] = None if recorded is None else compile_trace(generated_code, recorded)
+                            continue
+                instruction_pointer = operand
+            elif opcode == INT:
+                top += operand
+                if top > stack_limit:
+                    stack_limit = grow_stack(stack, top)
+            elif opcode == CAL:
+                frame = base
+                level = levels[instruction_pointer - 1]
+                while level > 0:
+                    frame = stack[frame]
+                    level -= 1
+                stack[top + 1] = frame
+                stack[top + 2] = base
+                stack[top + 3] = instruction_pointer
+                base = top + 1
+                instruction_pointer = operand
+            elif opcode == RET:
+                if base == 0:
+                    break
+                top = base - 1
+                instruction_pointer = stack[base + 2]
+                base = stack[base + 1]
+            else:
+                raise Exception(f"Unknown instruction {opcode} at {instruction_pointer - 1}")
+    except IndexError:
+        raise IndexError(f"ERR in executing generated code at {instruction_pointer - 1}, stack overflow...")
+    return StackView(stack, top + 1), steps
@@ -0,0 +1,139 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, INST_NAMES, LIT, OPR, LOD, STO, CAL, RET, INT, JMP, JMC
+
+# change of the stack depth by OPR, unary operations keep it
+OPERATION_EFFECTS = {operation.value: -1 for operation in Op}
+OPERATION_EFFECTS[Op.neg.value] = 0
+OPERATION_EFFECTS[Op.odd.value] = 0
+
+
+class VerificationError(Exception):
+    pass
+
+
+class Verification:
+    """
+    It is the result of verify, the depth of the stack before every instruction (None if it is never executed),
+    the size of the frame of every function and the size of the stack the program needs
+    (None if the program is recursive)
+    """
+    __slots__ = ("depths", "frame_sizes", "stack_size")
+
+    def __init__(self, depths: list, frame_sizes: dict, stack_size) -> None:
+        self.depths = depths
+        self.frame_sizes = frame_sizes
+        self.stack_size = stack_size
+
+
+def verify(generated_code: InstructionBuffer) -> Verification:
+    """
+    It checks the code before it runs, jumps and calls must stay in the program, every instruction must be reached
+    with the same depth of the stack on every path and no instruction may take more values than its frame holds,
+    the depth is counted from the base of the frame of the function, it raises VerificationError otherwise
+
+    :param generated_code: generated instructions
+    :type generated_code: InstructionBuffer
+    """
+    opcodes = generated_code.opcodes
+    levels = generated_code.levels
+    operands = generated_code.operands
+    code_length = len(opcodes)
+    depths = [None] * code_length
+    # entry of the function -> size of its frame, (depth, callee) of its calls
+    frame_sizes = {}
+    calls = {}
+    entries = [0]
+    while entries:
+        entry = entries.pop()
+        if entry in frame_sizes:
+            continue
+        frame_size = 0
+        calls[entry] = []
+        work = [(entry, 0)]
+        while work:
+            address, depth = work.pop()
+            if address == code_length:
+                continue
+            if depths[address] is not None:
+                if depths[address] != depth:
+                    raise VerificationError(f"stack depth {depth} and {depths[address]} meet at {address}")
+                continue
+            depths[address] = depth
+            opcode, level, operand = opcodes[address], levels[address], operands[address]
+            if level < 0:
+                raise VerificationError(f"negative level at {address}")
+            name = INST_NAMES[opcode] if 0 <= opcode < len(INST_NAMES) else opcode
+            # number of values the instruction takes from the stack
+            taken = 0
+            if opcode == LIT or opcode == LOD:
+                after = depth + 1
+            elif opcode == STO or opcode == JMC:
+                taken = 1
+                after = depth - 1
+            elif opcode == OPR:
+                if operand not in OPERATION_EFFECTS:
+                    raise VerificationError(f"unknown operation {operand} at {address}")
+                taken = 1 - OPERATION_EFFECTS[operand]
+                after = depth + OPERATION_EFFECTS[operand]
+            elif opcode == INT:
+                after = depth + operand
+            elif opcode == JMP or opcode == CAL or opcode == RET:
+                after = depth
+            else:
+                raise VerificationError(f"unknown instruction {name} at {address}")
+            if depth < taken or after < 0:
+                raise VerificationError(f"{name} at {address} takes more values than its frame holds")
+            frame_size = max(frame_size, depth, after)
+            if (opcode == LOD or opcode == STO) and level == 0:
+                frame_size = max(frame_size, operand + 1)
+            if opcode == JMP or opcode == JMC or opcode == CAL:
+                if not 0 <= operand <= code_length - (opcode == CAL):
+                    raise VerificationError(f"{name} at {address} to {operand} is outside of the program")
+            if opcode == JMP:
+                work.append((operand, after))
+            elif opcode == JMC:
+                work.append((operand, after))
+                work.append((address + 1, after))
+            elif opcode == CAL:
+                # the header of the callee is written above the top, the callee returns with the same top
+                frame_size = max(frame_size, depth + 3)
+                calls[entry].append((depth, operand))
+                entries.append(operand)
+                work.append((address + 1, after))
+            elif opcode != RET:
+                work.append((address + 1, after))
+        frame_sizes[entry] = frame_size
+    return Verification(depths, frame_sizes, stack_size(frame_sizes, calls))
+
+
+def stack_size(frame_sizes: dict, calls: dict):
+    """
+    It returns the number of slots the main program needs with the deepest chain of calls,
+    None if a function can call itself
+
+    :param frame_sizes: entry of the function -> size of its frame
+    :param calls: entry of the function -> (depth of the stack, entry of the callee) of its calls
+    """
+    needed = {}
+    active = set()
+
+    def need(entry):
+        if entry in needed:
+            return needed[entry]
+        if entry in active:
+            return None
+        active.add(entry)
+        size = frame_sizes[entry]
+        for depth, callee in calls[entry]:
+            callee_size = need(callee)
+            if callee_size is None:
+                return None
+            size = max(size, depth + callee_size)
+        active.discard(entry)
+        needed[entry] = size
+        return size
+
+    return need(0)
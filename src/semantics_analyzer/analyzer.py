@@ -29,7 +29,7 @@ class Analyzer:
     def Analyze(self) -> bool:
         root = self.__dst
         # traverse the tree, parent -> left subtree -> right subtree
-        for node in root.traverse("preorder"):
+        for node in root.iter_preorder():
             # subtree already visited
             if node in self.__visited_nodes:
                 continue
@@ -77,8 +77,8 @@ class Analyzer:
             subtree_okay = self.__eval_function_signature(node)
         elif node_name == "compound_block":
             subtree_okay = self.__eval_comp_block(node)
-        # [JT] names of all nodes whose children represent a block, either a function body, if/if-else body or loop body
-        elif node_name == "block" or node_name == "block_var_dekl" or node_name == "block_expression" or node_name == "block_statement":
+        # [JT] node whose children represent a block, either a function body, if/if-else body or loop body
+        elif node_name == "block":
             subtree_okay = self.__eval_block(node)
         elif node_name == "for_loop_block":
             subtree_okay = self.__eval_for_loop_block(node)
@@ -620,27 +620,12 @@ class Analyzer:
 
     def __eval_block(self, node):
         lineno = node.lineno
-        tmp_node = node
-        # traverse through block subtree - taking over "control" from the main traversal loop
-        while True:
-            children = tmp_node.get_children()
-            n = len(children)
-            tmp = children[0]
-            # block variable declaration, the relevant subtree is on index 1 instead of 0
-            if n == 3:
-                tmp = children[1]
-            is_statement_okay = self.__eval_node(tmp)
+        # statements of the block are children of one node - taking over "control" from the main traversal loop
+        for statement in node.children:
+            is_statement_okay = self.__eval_node(statement)
             if not is_statement_okay:
                 raise Exception(f"Error on line {lineno} in block.")
-
-            if len(children) == 1:
-                if tmp.name != "block":
-                    self.__last_stmt_in_block = tmp.name
-                break
-            tmp_node = children[1]
-            if n == 3:
-                tmp_node = children[2]
-
+            self.__last_stmt_in_block = statement.name
         return True
 
     def __eval_comp_block(self, node):
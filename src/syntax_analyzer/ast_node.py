@@ -0,0 +1,155 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+
+
+# > The AstNode is a node of the abstract syntax tree.
+# Inner nodes carry the kind of the grammar rule, leaves carry the value of a token (identifier, number, operator...).
+class AstNode:
+    __slots__ = ("kind", "value", "children", "up", "lineno", "depth", "scope")
+
+    def __init__(self, kind=None, value=None, children=(), lineno=-1) -> None:
+        """
+        It creates the node and makes it the parent of its children
+
+        :param kind: name of the grammar rule, None for leaves
+        :param value: value of the leaf, None for inner nodes
+        :param children: children of the node
+        :param lineno: number of line where the statement is declared
+        """
+        # depth = number of enclosing compound blocks, scope = name of the enclosing function (0 in global scope),
+        # both are filled in by annotate_scopes once the whole tree is parsed
+        self.kind = kind
+        self.value = value
+        self.children = tuple(children)
+        self.up = None
+        self.lineno = lineno
+        self.depth = 0
+        self.scope = 0
+        for child in self.children:
+            child.up = self
+
+    @property
+    def name(self):
+        """
+        It returns the kind of inner node or the value of leaf
+        """
+        return self.value if self.kind is None else self.kind
+
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    def get_children(self) -> list:
+        return list(self.children)
+
+    def iter_preorder(self):
+        """
+        It yields the node and all its descendants in preorder (parent, left subtree, right subtree)
+        """
+        to_visit = [self]
+        while to_visit:
+            node = to_visit.pop()
+            yield node
+            to_visit.extend(reversed(node.children))
+
+    def preorder(self) -> list:
+        """
+        It returns the node and all its descendants in preorder
+        """
+        return list(self.iter_preorder())
+
+    def get_leaves(self) -> list:
+        """
+        It returns leaves of the subtree from left to right
+        """
+        return [node for node in self.iter_preorder() if not node.children]
+
+    def get_leaf_names(self) -> list:
+        """
+        It returns values of leaves of the subtree from left to right
+        """
+        return [node.value for node in self.iter_preorder() if not node.children]
+
+    def get_ancestors(self) -> list:
+        """
+        It returns all ancestors from the parent to the root
+        """
+        ancestors = []
+        node = self.up
+        while node is not None:
+            ancestors.append(node)
+            node = node.up
+        return ancestors
+
+    def get_sisters(self) -> list:
+        """
+        It returns the other children of the parent
+        """
+        if self.up is None:
+            return []
+        return [child for child in self.up.children if child is not self]
+
+    @staticmethod
+    def get_common_ancestor(first, second):
+        """
+        It returns the deepest node that is an ancestor (or self) of both nodes
+        """
+        path = set()
+        node = second
+        while node is not None:
+            path.add(node)
+            node = node.up
+        node = first
+        while node not in path:
+            node = node.up
+            if node is None:
+                raise Exception("Nodes are not connected!")
+        return node
+
+    def get_ascii(self, show_internal=True, compact=False, attributes=None) -> str:
+        """
+        It returns an ascii drawing of the tree (same layout as ete3 Tree.get_ascii)
+
+        :param show_internal: includes names of inner nodes
+        :param compact: use exactly one line per leaf
+        :param attributes: list of node attributes shown in the drawing, defaults to ["name"]
+        """
+        lines, _ = self.__ascii_art('-', show_internal, compact, attributes or ["name"])
+        return '\n' + '\n'.join(lines)
+
+    def __ascii_art(self, char1, show_internal, compact, attributes):
+        node_name = ', '.join(str(getattr(self, attribute)) for attribute in attributes if hasattr(self, attribute))
+        if not self.children:
+            return [char1 + '-' + node_name], 0
+
+        length = max(3, len(node_name) if show_internal else 3)
+        pad = ' ' * length
+        pa = ' ' * (length - 1)
+        mids = []
+        result = []
+        for child in self.children:
+            if child is self.children[0]:
+                char2 = '/'
+            elif child is self.children[-1]:
+                char2 = '\\'
+            else:
+                char2 = '-'
+            child_lines, mid = child.__ascii_art(char2, show_internal, compact, attributes)
+            mids.append(mid + len(result))
+            result.extend(child_lines)
+            if not compact:
+                result.append('')
+        if not compact:
+            result.pop()
+        lo, hi, end = mids[0], mids[-1], len(result)
+        prefixes = [pad] * (lo + 1) + [pa + '|'] * (hi - lo - 1) + [pad] * (end - hi)
+        mid = int((lo + hi) / 2)
+        prefixes[mid] = char1 + '-' * (length - 2) + prefixes[mid][-1]
+        result = [prefix + line for prefix, line in zip(prefixes, result)]
+        if show_internal:
+            stem = result[mid]
+            result[mid] = stem[0] + node_name + stem[len(node_name) + 1:]
+        return result, mid
+
+    def __str__(self) -> str:
+        return self.get_ascii(show_internal=False)
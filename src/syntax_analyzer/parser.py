@@ -3,10 +3,8 @@
 #
 
 # vytahnu tokeny, ktere jsem zadefinoval
-from ete3 import Tree
-
 from src.lex_analyzer.lexer import tokens
-from src.syntax_analyzer.utils import make_node,is_integer,get_integer_node_value
+from src.syntax_analyzer.utils import make_node,make_sequence,is_integer,get_integer_node_value,annotate_scopes
 
 
 
@@ -24,9 +22,7 @@ precedence = (
 # entry point of program, the 'root' of the tree
 def p_program(p):
     """program : dekl_list"""
-    root = Tree(name='program')
-    root.add_child(p[1])
-    p[0] = root
+    p[0] = annotate_scopes(make_node('program', [make_sequence('declaration_list', p[1], lineno=p.lexer.lineno)]))
 
 
 # program is just a bunch of declaration statements, this is the core of the grammar
@@ -40,21 +36,25 @@ def p_dekl_list(p):
               | dekl dekl_list
               | block
     """
+    # the list is right recursive, statements come from the last one and are collected in reversed order,
+    # make_sequence turns them into one flat node once the whole list is parsed
     n = len(p)
     # block or single declaration
     if n == 2:
-        p[0] = make_node('declaration', [p[1]],lineno=p.lexer.lineno)
-    # modification of existing variable
+        p[0] = p[1] if isinstance(p[1], list) else [p[1]]
+    # modification of existing variable followed by the rest of the list
     elif n == 4:
-        p[0] = make_node('var_modification_dekl', [p[1], p[3]],lineno=p.lexer.lineno)
+        p[0] = p[3]
+        p[0].append(p[1])
     # expression, modification or declaration list
     elif n == 3:
         # expression or modification
         if p[2] == ";":
-            p[0] = make_node('statement', [p[1]],lineno=p.lexer.lineno)
+            p[0] = [p[1]]
         # declaration list
         else:
-            p[0] = make_node('declaration_list', [p[1], p[2]],lineno=p.lexer.lineno)
+            p[0] = p[2]
+            p[0].append(p[1])
 
 def p_var_modification_error(p):
     """
@@ -389,7 +389,7 @@ def p_comp_block(p):
     """
     comp_block : lcparent block rcparent
     """
-    p[0] = make_node('compound_block', [p[2]],lineno=p.lexer.lineno)
+    p[0] = make_node('compound_block', [make_sequence('block', p[2], lineno=p.lexer.lineno)],lineno=p.lexer.lineno)
 
 
 # generic block statement rule
@@ -411,17 +411,20 @@ def p_block(p):
         | expression semicolon
         | var_modification semicolon
     """
+    # statements are collected in reversed order like in dekl_list
     n = len(p)
     if p[1] == 'return':
-        p[0] = make_node('return_statement', [p[2]],lineno=p.lexer.lineno)
-    elif n == 3 and p[2] != ';':
-        p[0] = make_node('block', [p[1], p[2]],lineno=p.lexer.lineno)
-    elif n == 4 and p[1] == "var" or p[1] == "let":
-        p[0] = make_node('block_var_dekl', [p[1], p[2], p[3]],lineno=p.lexer.lineno)
-    elif n == 4:
-        p[0] = make_node('block_expression', [p[1], p[3]],lineno=p.lexer.lineno)
+        p[0] = [make_node('return_statement', [p[2]],lineno=p.lexer.lineno)]
+    elif p[1] == "var" or p[1] == "let":
+        statement = make_node('variable_declaration', [p[1], p[2]],lineno=p.lexer.lineno)
+        p[0] = p[3] if n == 4 else []
+        p[0].append(statement)
     elif n == 2 or (n == 3 and p[2] == ';'):
-        p[0] = make_node('block_statement', [p[1]],lineno=p.lexer.lineno)
+        p[0] = [p[1]]
+    else:
+        # statement followed by the rest of the block
+        p[0] = p[n - 1]
+        p[0].append(p[1])
 
 
 # loop statement, for / while cycle
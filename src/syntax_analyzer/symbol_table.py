@@ -5,11 +5,13 @@ from src.syntax_analyzer.symbol_record import SymbolRecord
 
 
 def find_real_level(symbols, index):
-    real_level_result = 0
-    for i in symbols[index].get_ancestors():
-        if i.name == "compound_block":
-            real_level_result += 1
-    return real_level_result
+    # depth of the block is stored on the node by annotate_scopes when the tree is parsed
+    return symbols[index].depth
+
+
+def find_scope(symbols, index):
+    # name of the enclosing function (0 in the global scope) is stored on the node by annotate_scopes
+    return symbols[index].scope
 
 
 def find_entry_in_symbol_table(symbol_table, level, real_level, symbol_name):
@@ -70,7 +72,7 @@ def generate_table_of_symbols(symbol_table, symbols: list, level="0", real_level
     # [JT] indented scopes in global scope
     symbol_table["_scopes"] = []
     while index < len(symbols):
-        ancestor = symbols[index].get_ancestors()[0]
+        ancestor = symbols[index].up
         if ancestor.name == "function_signature":
             real_level = find_real_level(symbols, index)
             if symbols[index].name in symbol_table.keys():
@@ -2,14 +2,14 @@
 #  author: Daniel Schnurpfeil
 #
 
-from ete3 import Tree
+from src.syntax_analyzer.ast_node import AstNode
 
 # no idea how to propagate lineno through nodes, so i have to make a custom map for it
 line_numbers = {}
 
 
 # [JT] lineno = number of line where the statement is declared
-def make_node(node_name: str, children=None, lineno=-1) -> Tree:
+def make_node(node_name: str, children=None, lineno=-1) -> AstNode:
     """
     It takes a node name and a list of children, and returns a tree
 
@@ -18,20 +18,47 @@ def make_node(node_name: str, children=None, lineno=-1) -> Tree:
     :param children: A list of children to add to the node
     :return: A tree with the name of the node and the children
     """
-    ast = Tree(name=node_name)
-    ast.add_feature('lineno',lineno)
     if children is None:
-        return ast
-    for i in children:
-        if i.__class__.__name__ == 'TreeNode':
-            ast.add_child(child=i)
-        else:
-            ast.add_child(name=i)
+        return AstNode(kind=node_name, lineno=lineno)
+    # values of tokens become leaves, empty value is stored as an empty string
+    ast = AstNode(kind=node_name, lineno=lineno,
+                  children=[i if isinstance(i, AstNode) else AstNode(value="" if i is None else i) for i in children])
     # if lineno != -1:
     #    line_numbers[id(ast)] = lineno
     return ast
 
 
+def make_sequence(node_name: str, reversed_statements: list, lineno=-1) -> AstNode:
+    """
+    It makes one flat node from a list of statements, so long programs do not nest one level per statement
+
+    :param node_name: The name of the node
+    :param reversed_statements: statements collected by the right recursive grammar rules, the last one first
+    :return: A node with the statements as its children
+    """
+    reversed_statements.reverse()
+    return AstNode(kind=node_name, children=reversed_statements, lineno=lineno)
+
+
+def annotate_scopes(root: AstNode) -> AstNode:
+    """
+    It stores the block depth (number of enclosing compound blocks) and the enclosing function on every node,
+    so the symbol table and the generator read them in O(1) instead of walking the ancestors
+
+    :param root: root of the syntax tree
+    """
+    to_visit = [root]
+    while to_visit:
+        node = to_visit.pop()
+        depth = node.depth + 1 if node.kind == "compound_block" else node.depth
+        scope = node.children[0].value if node.kind == "function_signature" else node.scope
+        for child in node.children:
+            child.depth = depth
+            child.scope = scope
+            to_visit.append(child)
+    return root
+
+
 # wrapper function that checks if node represents numerical value
 # returns true if leaf is an integer
 def is_integer(node):
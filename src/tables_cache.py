@@ -0,0 +1,123 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import hashlib
+import importlib.util
+import os
+import sys
+from functools import lru_cache
+
+import ply
+import ply.lex
+import ply.yacc as yy
+
+import src.lex_analyzer as lexical
+import src.syntax_analyzer as syntax
+from src.lex_analyzer import lexer as lexer_module
+from src.syntax_analyzer import parser as parser_module
+
+# bump whenever the layout of the cached tables changes
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> str:
+    """
+    It returns the directory where the compiler keeps its caches,
+    $NOT_SO_SWIFT_CACHE_DIR if it is set, ~/.cache/not_so_swift otherwise
+    """
+    cache_dir = os.environ.get("NOT_SO_SWIFT_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    return os.path.join(os.path.expanduser("~"), ".cache", "not_so_swift")
+
+
+@lru_cache(maxsize=None)
+def grammar_hash() -> str:
+    """
+    It returns a hash of the grammar and of the token set, the key of the cached tables.
+    Any change of lexer.py or parser.py (or of the PLY version) gives a new key.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}:{ply.__version__}:{sys.version_info[:2]}".encode())
+    for module in (lexer_module, parser_module):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    digest.update(repr(lexical.tokens).encode())
+    return digest.hexdigest()
+
+
+def build_lexer_and_parser(cache_dir=None):
+    """
+    It builds the PLY lexer and LALR parser, the tables are loaded from the cache when they exist,
+    otherwise they are generated and stored to the cache for the next run
+
+    :param cache_dir: root of the cache, defaults to default_cache_dir() (optional)
+    :return: tuple (lexer, parser)
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    tables_dir = os.path.join(cache_dir, "tables", grammar_hash())
+
+    if os.path.isdir(tables_dir):
+        try:
+            return load_tables(tables_dir)
+        except Exception:
+            import shutil
+            # corrupted or incomplete tables, generate them again
+            shutil.rmtree(tables_dir, ignore_errors=True)
+    return generate_tables(tables_dir)
+
+
+def load_tables(tables_dir):
+    """
+    It builds the lexer and the parser from tables stored in tables_dir
+
+    :param tables_dir: directory with lextab.py and parsetab.pickle
+    """
+    lextab = load_table_module(os.path.join(tables_dir, "lextab.py"),
+                               "not_so_swift_lextab_" + os.path.basename(tables_dir))
+    lexer = ply.lex.lex(module=lexical, optimize=True, lextab=lextab)
+    # the pickled LALR tables load much faster than an imported parsetab module
+    parser = yy.yacc(module=syntax, debug=False, picklefile=os.path.join(tables_dir, "parsetab.pickle"))
+    return lexer, parser
+
+
+def generate_tables(tables_dir):
+    """
+    It generates the lexer and the parser from the grammar and publishes their tables to tables_dir.
+    The tables are written to a temporary directory first, so concurrent compilers never see half written tables.
+
+    :param tables_dir: directory where the tables are published
+    """
+    import shutil
+    import tempfile
+
+    lexer = ply.lex.lex(module=lexical)
+    try:
+        os.makedirs(os.path.dirname(tables_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(tables_dir))
+    except OSError:
+        # cache is not writable, tables are generated on every run
+        return lexer, yy.yacc(module=syntax, debug=False, write_tables=False)
+
+    parser = yy.yacc(module=syntax, debug=False, picklefile=os.path.join(tmp_dir, "parsetab.pickle"))
+    try:
+        lexer.writetab("lextab", tmp_dir)
+        os.rename(tmp_dir, tables_dir)
+    except OSError:
+        # somebody else has published the same tables in the meantime
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return lexer, parser
+
+
+def load_table_module(path, module_name):
+    """
+    It imports generated table module from the given path
+
+    :param path: path of the table module
+    :param module_name: unique name of the module
+    """
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
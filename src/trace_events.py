@@ -0,0 +1,117 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import os
+import time
+from contextlib import contextmanager
+
+from src.pl0_code_generator.pl0 import statement_line
+
+# methods of the generator that get a span, one per function body and per control-flow construct
+GENERATOR_SPANS = ("gen_function_signature", "gen_if_else", "gen_while_loop_block", "gen_for_loop_block",
+                   "gen_repeat_loop_block")
+# methods of the semantics analyzer that get a span (the private names are mangled)
+ANALYZER_SPANS = ("_Analyzer__eval_function_signature",)
+
+
+def generator_span_name(args, kwargs) -> tuple:
+    """
+    It returns the name and the arguments of the span of a generator method called with (sub_tree, index, ...)
+    """
+    sub_tree = args[0] if args else kwargs["sub_tree"]
+    index = args[1] if len(args) > 1 else kwargs["index"]
+    node = sub_tree[index]
+    line = statement_line(node.preorder(), node.lineno)
+    if node.name == "function_signature":
+        return f"function {node.children[0].name}", {"line": line}
+    return node.name, {"line": line}
+
+
+def analyzer_span_name(args, kwargs) -> tuple:
+    """
+    It returns the name and the arguments of the span of an analyzer method called with (node)
+    """
+    node = args[0] if args else kwargs["node"]
+    return f"check function {node.children[0].name}", {"line": statement_line(node.preorder(), node.lineno)}
+
+
+# > The Tracer records nested spans of the compiler as complete events of the Chrome trace-event format,
+# the file it writes opens in chrome://tracing and in Perfetto. Methods are traced only while instrument is active,
+# so a compilation without a tracer runs the original methods.
+class Tracer:
+
+    def __init__(self) -> None:
+        self.events = []
+        self.start = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    @contextmanager
+    def span(self, name: str, category: str, args=None):
+        """
+        It records the time of the with block as one span
+
+        :param name: name of the span
+        :param category: category of the span (phase, generator, analyzer)
+        :param args: dictionary shown with the span (optional)
+        """
+        begin = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {"name": name, "cat": category, "ph": "X", "ts": (begin - self.start) / 1000,
+                     "dur": (end - begin) / 1000, "pid": self.pid, "tid": 0}
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    def traced(self, method, category: str, describe):
+        """
+        It returns the method wrapped in a span
+
+        :param method: bound method
+        :param category: category of the spans
+        :param describe: function (args, kwargs) -> (name, args of the span)
+        """
+        span = self.span
+
+        def wrapper(*args, **kwargs):
+            name, span_args = describe(args, kwargs)
+            with span(name, category, span_args):
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    @contextmanager
+    def instrument(self, obj, names, category: str, describe):
+        """
+        It traces the methods of the object in the with block, the wrappers are attributes of the instance
+        that hide the methods of the class and they are removed at the end
+
+        :param obj: the generator or the analyzer
+        :param names: names of the methods
+        :param category: category of the spans
+        :param describe: function (args, kwargs) -> (name, args of the span)
+        """
+        for name in names:
+            setattr(obj, name, self.traced(getattr(obj, name), category, describe))
+        try:
+            yield obj
+        finally:
+            for name in names:
+                delattr(obj, name)
+
+    def to_dict(self) -> dict:
+        # a span starts before the spans nested in it
+        events = sorted(self.events, key=lambda event: (event["ts"], -event["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        """
+        It writes the spans to the file as trace.json of the Chrome trace-event format
+
+        :param path: path of the file
+        """
+        import json
+        with open(path, mode="w") as f:
+            json.dump(self.to_dict(), f)
@@ -0,0 +1,48 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from unittest import TestCase
+
+from src.syntax_analyzer.utils import make_node
+from src.tables_cache import build_lexer_and_parser
+
+
+class TestAstNode(TestCase):
+
+    def setUp(self):
+        self.left = make_node('expression_term', [1, '+', 2], lineno=3)
+        self.right = make_node('expression_term', ['a', '*', None], lineno=3)
+        self.root = make_node('program', [make_node('expression_term', [self.left, '-', self.right])])
+
+    def test_leaves(self):
+        self.assertEqual([1, '+', 2, '-', 'a', '*', ''], self.root.get_leaf_names())
+        self.assertEqual(['program', 'expression_term', 'expression_term', 1],
+                         [node.name for node in self.root.preorder()[:4]])
+        self.assertEqual(3, self.left.lineno)
+
+    def test_common_ancestor(self):
+        first = self.left.children[0]
+        second = self.right.children[2]
+        self.assertIs(self.root.children[0], self.root.get_common_ancestor(first, second))
+        self.assertIs(self.left, self.root.get_common_ancestor(first, self.left.children[2]))
+        self.assertEqual([self.left, self.root.children[0], self.root], first.get_ancestors()[:3])
+        self.assertEqual(2, len(first.get_sisters()))
+
+    def test_ascii(self):
+        # same drawing as ete3 Tree, tree.txt does not change
+        self.assertEqual("\n   /-1\n  |\n--|--+\n  |\n   \\-2", str(self.left))
+        self.assertEqual("\n               /-1\n              |\n-expression_term-+\n              |\n               \\-2",
+                         self.left.get_ascii())
+
+    def test_scopes(self):
+        """
+        Parser stores the depth of the block and the enclosing function on every node.
+        """
+        lexer, parser = build_lexer_and_parser()
+        tree = parser.parse("func f(a: Int) -> Int {\n    if (a > 0) {\n        var b: Int = a;\n    }\n"
+                            "    return a;\n}\nvar c: Int = 1;\n", lexer=lexer)
+        leaves = {leaf.value: leaf for leaf in tree.get_leaves() if leaf.value in ("b", "c")}
+        return_statement = [node for node in tree.preorder() if node.kind == "return_statement"][0]
+        self.assertEqual((2, "f"), (leaves["b"].depth, leaves["b"].scope))
+        self.assertEqual((1, "f"), (return_statement.depth, return_statement.scope))
+        self.assertEqual((0, 0), (leaves["c"].depth, leaves["c"].scope))
@@ -0,0 +1,69 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.batch import collect_sources, compile_batch
+from src.compiler import Compiler
+
+
+class TestBatch(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        os.makedirs(os.path.join(self.directory, "src", "nested"))
+        for name in ("program", "while", "nested/for"):
+            shutil.copy(f"../sample_input/{os.path.basename(name)}.swift",
+                        os.path.join(self.directory, "src", name + ".swift"))
+        with open(os.path.join(self.directory, "src", "bad.swift"), "w") as f:
+            f.write("var a: Int = ;\n")
+
+    def test_collect_sources(self):
+        sources = collect_sources([os.path.join(self.directory, "src"), "../sample_input/w*.swift"])
+        self.assertEqual(["bad", "nested/for", "program", "while", "while_2"], [name for _, name in sources])
+        # a file is compiled once however many paths find it
+        self.assertEqual(sources, collect_sources([os.path.join(self.directory, "src"),
+                                                   os.path.join(self.directory, "src", "program.swift"),
+                                                   "../sample_input/w*.swift"]))
+
+    def test_failures_are_isolated(self):
+        output_dir = os.path.join(self.directory, "out")
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                summary = compile_batch([os.path.join(self.directory, "src")], output_dir, workers=workers)
+                self.assertEqual(["bad.swift"], [os.path.basename(result.source) for result in summary.failed])
+                self.assertIn("Unrecognized token", summary.failed[0].error)
+                self.assertEqual(3, len(summary.succeeded))
+                for result in summary.succeeded:
+                    with open(os.path.join(result.output_dir, "output", "generated_code_only.txt")) as f:
+                        self.assertEqual(self.compiler.compile_file(result.source), f.read())
+                self.assertIn("3 compiled, 1 failed", summary.report())
+
+    def test_dead_worker_fails_only_its_file(self):
+        compile_file = Compiler.compile_file
+
+        def crashing_compile_file(compiler, source, *args, **kwargs):
+            if source.endswith("program.swift"):
+                os._exit(1)
+            return compile_file(compiler, source, *args, **kwargs)
+
+        output_dir = os.path.join(self.directory, "out")
+        # the workers are forked, so they inherit the patched compiler
+        with patch.object(Compiler, "compile_file", crashing_compile_file):
+            summary = compile_batch([os.path.join(self.directory, "src")], output_dir, workers=2)
+        self.assertEqual(["bad.swift", "program.swift"],
+                         [os.path.basename(result.source) for result in summary.failed])
+        self.assertIn("worker process died", summary.failed[1].error)
+        self.assertEqual(["for.swift", "while.swift"],
+                         sorted(os.path.basename(result.source) for result in summary.succeeded))
+        for result in summary.results:
+            self.assertFalse(os.path.exists(os.path.join(result.output_dir, ".compiling")))
@@ -0,0 +1,40 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, CAL, INT, JMP, LIT, LOD, OPR, RET, STO
+from src.pl0_vm import block_compiler, p_machine
+
+
+class TestBlockCompiler(TestCase):
+
+    def assertSameExecution(self, code):
+        self.assertEqual(p_machine.execute(code), block_compiler.execute(code))
+
+    def test_sample_input(self):
+        compiler = Compiler()
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                compiler.compile_file(name)
+                self.assertSameExecution(compiler.generator.code)
+
+    def test_operations_and_static_links(self):
+        """
+        Operations the generator does not emit yet and a function that reaches the frame of the caller.
+        """
+        code = InstructionBuffer()
+        for instruction in ((INT, 0, 5), (LIT, 0, -7), (LIT, 0, 2), (OPR, 0, Op.mod.value), (STO, 0, 3),
+                            (LIT, 0, -7), (LIT, 0, 2), (OPR, 0, Op.div.value), (OPR, 0, Op.neg.value), (STO, 0, 4),
+                            (LIT, 0, 5), (OPR, 0, Op.odd.value), (JMP, 0, 16),
+                            # function: global 3 of the frame one static link below += 10
+                            (INT, 0, 3), (LIT, 0, 10), (JMP, 0, 18),
+                            (CAL, 0, 13), (RET, 0, 0),
+                            (LOD, 1, 3), (OPR, 0, Op.add.value), (STO, 1, 3), (RET, 0, 0)):
+            code.append(*instruction)
+        stack, _ = block_compiler.execute(code)
+        self.assertEqual([9, 3, 1], stack[3:6])
+        self.assertSameExecution(code)
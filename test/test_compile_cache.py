@@ -0,0 +1,123 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.compile_cache import CompileCache
+from src.compiler import Compiler
+from src.pass_timer import PassTimer
+
+
+class TestCompileCache(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = CompileCache(os.path.join(self.directory, "cache"))
+        self.compiler = Compiler(compile_cache=self.cache)
+
+    def read_outputs(self, output_dir):
+        output_dir = os.path.join(output_dir, "output")
+        outputs = {}
+        for name in sorted(os.listdir(output_dir)):
+            with open(os.path.join(output_dir, name)) as f:
+                outputs[name] = f.read()
+        return outputs
+
+    def test_hit_skips_all_phases(self):
+        first_dir = os.path.join(self.directory, "first", "")
+        second_dir = os.path.join(self.directory, "second", "")
+        os.makedirs(first_dir)
+        os.makedirs(second_dir)
+        code = self.compiler.compile_file("../sample_input/program.swift", output_dir=first_dir)
+        passes = PassTimer()
+        self.assertEqual(code, self.compiler.compile_file("../sample_input/program.swift", output_dir=second_dir,
+                                                          passes=passes))
+        self.assertEqual(["cache lookup"], [record.name for record in passes.records])
+        self.assertEqual(self.read_outputs(first_dir), self.read_outputs(second_dir))
+        # the options are a part of the key
+        self.compiler.compile_file("../sample_input/program.swift")
+        self.assertEqual({"hits": 1, "misses": 2, "stores": 2, "evictions": 0},
+                         {name: value for name, value in self.cache.stats().items() if name != "hit_rate"})
+
+    def test_hit_loads_the_generator(self):
+        cached = self.compiler.compile_file("../sample_input/while.swift")
+        self.compiler.compile_file("../sample_input/program.swift")
+        self.assertEqual(cached, self.compiler.compile_file("../sample_input/while.swift"))
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(cached.count("\n"), len(self.compiler.generator.code))
+        # the instructions are parsed, not only the cached text
+        self.compiler.generator.code.text = None
+        self.assertEqual(cached, self.compiler.generator.return_code())
+
+    def test_errors_are_cached(self):
+        for _ in range(2):
+            with self.assertRaises(Exception) as context:
+                self.compiler.compile_source("var a: Int = 1;\na = b;\n", source_name="broken.swift")
+            self.assertIn("line 2", str(context.exception))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_files_of_errors_are_cached(self):
+        # the tree files are written before the semantics analysis fails
+        output_dirs = [os.path.join(self.directory, name, "") for name in ("first", "second")]
+        for output_dir in output_dirs:
+            os.makedirs(output_dir)
+            with self.assertRaises(Exception):
+                self.compiler.compile_source("var a: Int = 1;\na = b;\n", output_dir=output_dir)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(["full_tree.txt", "symbol_table.txt", "tree.txt"], list(self.read_outputs(output_dirs[0])))
+        self.assertEqual(self.read_outputs(output_dirs[0]), self.read_outputs(output_dirs[1]))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        sources = [f"var a: Int = {i};\n" for i in range(3)]
+        for source in sources:
+            self.compiler.compile_source(source)
+        entry_size = max(size for _, size, _ in self.cache.entries())
+        self.cache.max_bytes = 3 * entry_size
+        # the entries were used in the order of the sources, then the first one is used again
+        for order, source in enumerate(sources, start=1):
+            key = self.cache.key(source, source_name="<input>", output=False, profile=False)
+            os.utime(self.cache.path(key), ns=(order, order))
+        self.compiler.compile_source(sources[0])
+        self.compiler.compile_source("var a: Int = 3;\n")
+        self.assertEqual(1, self.cache.evictions)
+        self.assertEqual(3, len(self.cache.entries()))
+        hits = self.cache.hits
+        self.compiler.compile_source(sources[0])
+        self.compiler.compile_source(sources[1])
+        self.assertEqual(hits + 1, self.cache.hits)
+
+    def test_stores_do_not_scan_the_cache(self):
+        with patch.object(self.cache, "entries", wraps=self.cache.entries) as entries:
+            for i in range(5):
+                self.compiler.compile_source(f"var a: Int = {i};\n")
+        # the size is counted by the first store and kept up to date by the others
+        self.assertEqual(1, entries.call_count)
+        self.assertEqual(sum(size for _, size, _ in self.cache.entries()), self.cache.size)
+
+    def test_stale_temporary_files_are_removed(self):
+        directory = os.path.join(self.cache.directory, "00")
+        os.makedirs(directory)
+        stale = os.path.join(directory, "stale.tmp")
+        fresh = os.path.join(directory, "fresh.tmp")
+        for path in (stale, fresh):
+            with open(path, "w") as f:
+                f.write("{half of an entry")
+        # the writer of the stale file died long ago, the fresh one may still be renamed
+        os.utime(stale, (0, 0))
+        self.compiler.compile_source("var a: Int = 1;\n")
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+
+    def test_broken_entry_is_a_miss(self):
+        code = self.compiler.compile_source("var a: Int = 1;\n")
+        for _, _, path in self.cache.entries():
+            with open(path, "w") as f:
+                f.write("{broken")
+        self.assertEqual(code, self.compiler.compile_source("var a: Int = 1;\n"))
+        self.assertEqual(code, self.compiler.compile_source("var a: Int = 1;\n"))
+        self.assertEqual((1, 2), (self.cache.hits, self.cache.misses))
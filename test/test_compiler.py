@@ -0,0 +1,125 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import json
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pass_timer import PassTimer, NO_PASSES
+from src.trace_events import Tracer
+
+
+class TestCompiler(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def test_repeated_compilation(self):
+        """
+        One session compiles the same source again and again with the same result.
+        """
+        with open("../sample_input/complex_program.swift") as f:
+            source = f.read()
+        first = self.compiler.compile_source(source)
+        for _ in range(3):
+            self.assertEqual(first, self.compiler.compile_source(source))
+        self.assertEqual(first, self.compiler.compile_file("../sample_input/complex_program.swift"))
+
+    def test_line_numbers_start_again(self):
+        self.compiler.compile_source("var a: Int = 1;\nvar b: Int = 2;\nvar c: Int = 3;\n")
+        with self.assertRaises(Exception) as context:
+            self.compiler.compile_source("var a: Int = 1;\na = b;\n")
+        self.assertIn("line 2", str(context.exception))
+
+    def test_integer_out_of_range(self):
+        self.assertIn("LIT 0 9223372036854775807", self.compiler.compile_source("var a: Int = 9223372036854775807;\n"))
+        with self.assertRaises(Exception) as context:
+            self.compiler.compile_source("var a: Int = 1;\na = 9223372036854775808;\n")
+        self.assertEqual("Error on line 2. Integer 9223372036854775808 does not fit into 64 bits.",
+                         str(context.exception))
+
+    def test_long_program(self):
+        """
+        Statements of a block are children of one node, long programs do not hit the recursion limit.
+        """
+        statements = ["a += 1;\n"] * 5000
+        code = self.compiler.compile_source("var a: Int = 0;\nif (a >= 0) {\n" + "".join(statements) + "}\n")
+        # prologue, declaration of a, condition, 4 instructions per statement and the end of program
+        self.assertEqual(2 + 2 + 4 + 4 * len(statements) + 1, len(code.splitlines()))
+
+    def test_statement_after_block(self):
+        code = self.compiler.compile_source("var a: Int = 0;\nif (a > 0) {\n    a += 1;\n}\na = a + 1;\n")
+        self.assertEqual(["12 LOD 0 3", "13 LIT 0 1", "14 OPR 0 2", "15 STO 0 3", "16 RET 0 0"],
+                         code.splitlines()[-5:])
+
+    def test_nested_loop_jumps(self):
+        """
+        Every loop jumps behind its own end, nested loops do not share the placeholder of the jump.
+        """
+        code = self.compiler.compile_source("var a: Int = 0;\n"
+                                            "for(var i: Int = 0; i < 3; i += 1;) {\n"
+                                            "    for(var j: Int = 0; j < 3; j += 1;) {\n"
+                                            "        a += 1;\n"
+                                            "    }\n"
+                                            "}\n")
+        instructions = [line.split() for line in code.splitlines()]
+        jumps = [(int(i[0]), int(i[3])) for i in instructions if i[1] == "JMC"]
+        loop_ends = [int(i[0]) + 1 for i in instructions if i[1] == "JMP"]
+        # the inner loop ends first
+        self.assertEqual(sorted(loop_ends, reverse=True), [target for _, target in jumps])
+
+    def test_call_before_declaration(self):
+        code = self.compiler.compile_source("var a: Int = f(2);\n"
+                                            "func f(x: Int) -> Int {\n"
+                                            "    return x;\n"
+                                            "}\n"
+                                            "a = f(a);\n")
+        instructions = [line.split() for line in code.splitlines()]
+        calls = [int(i[3]) for i in instructions if i[1] == "CAL"]
+        # the function starts right after the jump over its body
+        function_start = [int(i[0]) + 1 for i in instructions if i[1] == "JMP"][0]
+        self.assertEqual([function_start, function_start], calls)
+
+    def test_passes(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            with PassTimer(mem_passes=True) as passes:
+                code = self.compiler.compile_file("../sample_input/program.swift", output_dir=output_dir,
+                                                  passes=passes)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(["parse", "symbols", "output files", "semantics", "generator", "save code", "run"],
+                         [record.name for record in passes.records])
+        # the run of the code is nested in the saving of the code
+        self.assertEqual([0, 0, 0, 0, 0, 0, 1], [record.depth for record in passes.records])
+        self.assertGreaterEqual(passes.records[5].peak, passes.records[6].peak)
+        self.assertEqual(len(code.splitlines()), passes.counts["instructions"])
+        self.assertEqual(274, passes.counts["tokens"])
+        exported = json.loads(passes.to_json())
+        self.assertEqual(passes.counts, exported["counts"])
+        self.assertEqual(len(passes.records) + 1 + len(passes.counts), len(passes.report().splitlines()))
+        # compilations without a timer measure nothing
+        self.compiler.compile_file("../sample_input/program.swift")
+        self.assertEqual(([], {}), (NO_PASSES.records, NO_PASSES.counts))
+
+    def test_trace(self):
+        tracer = Tracer()
+        self.compiler.compile_file("../sample_input/program.swift", passes=PassTimer(time_passes=False, tracer=tracer))
+        events = tracer.to_dict()["traceEvents"]
+        self.assertEqual(["parse", "symbols", "semantics", "generator"],
+                         [event["name"] for event in events if event["cat"] == "phase"])
+        spans = [(event["name"], event["args"]["line"]) for event in events if event["cat"] == "generator"]
+        self.assertEqual(("function someComplexFunction", 30), spans[-3])
+        self.assertEqual([("for_loop_block", 32), ("for_loop_block", 33)], spans[-2:])
+        self.assertEqual(4, len([event for event in events if event["cat"] == "analyzer"]))
+        # the spans of the generator are nested in its phase
+        generator = next(event for event in events if event["name"] == "generator")
+        for event in events:
+            if event["cat"] == "generator":
+                self.assertLessEqual(generator["ts"], event["ts"])
+                self.assertLessEqual(event["ts"] + event["dur"], generator["ts"] + generator["dur"])
+        # the methods are traced only during the traced compilation
+        self.assertNotIn("gen_if_else", vars(self.compiler.generator))
+        self.compiler.compile_file("../sample_input/program.swift")
+        self.assertEqual(len(events), len(tracer.events))
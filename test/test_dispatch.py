@@ -0,0 +1,57 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, INT, JMP, LIT, LOD, OPR, RET, STO
+from src.pl0_vm import dispatch, p_machine
+
+
+class TestDispatch(TestCase):
+
+    def assertSameExecution(self, code):
+        stack, steps = p_machine.execute(code)
+        self.assertEqual((stack, steps), dispatch.execute(code, superinstructions=False))
+        fused_stack, fused_steps = dispatch.execute(code)
+        self.assertEqual(stack, fused_stack)
+        self.assertLessEqual(fused_steps, steps)
+
+    def test_sample_input(self):
+        """
+        The decoded program ends with the same stack after the same number of steps as the reference interpreter,
+        with superinstructions it ends with the same stack in fewer steps.
+        """
+        compiler = Compiler()
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                compiler.compile_file(name)
+                self.assertSameExecution(compiler.generator.code)
+
+    def test_operations(self):
+        compiler = Compiler()
+        compiler.compile_source("var a: Int = 0 - 7;\n"
+                                "var b: Int = a / 2;\n"
+                                "var c: Int = a * b - 3;\n"
+                                "var d: Int = 0;\n"
+                                "if (a <= b && b == c || a >= c) {\n"
+                                "    d = 1;\n"
+                                "}\n"
+                                "if (a < b || a > c) {\n"
+                                "    d += 2;\n"
+                                "}\n")
+        self.assertSameExecution(compiler.generator.code)
+
+    def test_jump_into_fused_sequence(self):
+        """
+        Only the first instruction of a fused sequence is replaced, a jump to the second one still works.
+        """
+        code = InstructionBuffer()
+        for instruction in ((INT, 0, 4), (JMP, 0, 3), (LIT, 0, 5), (LOD, 0, 3), (LIT, 0, 7), (OPR, 0, Op.add.value),
+                            (STO, 0, 3), (RET, 0, 0)):
+            code.append(*instruction)
+        opcodes, arguments = dispatch.decode(code)
+        self.assertEqual({"LIT c; LOD x; ADD; STO x": 1}, dispatch.fuse(opcodes, arguments))
+        self.assertEqual([0, 0, 0, 7], dispatch.execute_decoded(opcodes, arguments)[0])
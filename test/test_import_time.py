@@ -0,0 +1,50 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+# budgets of the total import time in microseconds, generous enough for a cold start without bytecode cache
+HELP_BUDGET = 100_000
+COMPILE_BUDGET = 400_000
+
+# modules that are needed only for the visualization of the tree
+VISUALIZATION_MODULES = ("ete3", "PyQt5")
+
+
+def import_times(*args):
+    """
+    It runs the compiler with python -X importtime and returns {module: self time in us}
+
+    :param args: arguments of not_so_swift_compiler.py
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "not_so_swift_compiler.py", *args],
+                            cwd="..", capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(self_time)
+    return times
+
+
+class TestImportTime(TestCase):
+
+    def assertNotImported(self, times, prefixes):
+        imported = [module for module in times if module.split(".")[0] in prefixes]
+        self.assertEqual([], imported)
+
+    def test_help(self):
+        times = import_times("--help")
+        self.assertNotImported(times, ("src", "ply") + VISUALIZATION_MODULES)
+        self.assertLess(sum(times.values()), HELP_BUDGET)
+
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            times = import_times("-i", "sample_input/program.swift", "-o", output_dir + "/")
+        self.assertIn("src.compiler", times)
+        self.assertNotImported(times, VISUALIZATION_MODULES)
+        self.assertLess(sum(times.values()), COMPILE_BUDGET)
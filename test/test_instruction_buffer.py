@@ -0,0 +1,54 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from io import StringIO
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import INST_NAMES, JMP, LIT, OPR, RET
+from src.pl0_vm.p_machine import ret_stack_as_str, write_stack
+
+
+class TestInstructionBuffer(TestCase):
+
+    def test_patch_and_render(self):
+        code = InstructionBuffer()
+        code.append(JMP, 0, 0)
+        code.append(LIT, 0, -5)
+        code.append(OPR, 0, 1)
+        code.append(RET, 0, 0)
+        code.patch(0, 3)
+        self.assertEqual(4, len(code))
+        self.assertEqual((JMP, 0, 3), code[0])
+        self.assertEqual(["0 JMP 0 3", "1 LIT 0 -5", "2 OPR 0 1", "3 RET 0 0"], list(code.render()))
+        code.clear()
+        self.assertEqual([], list(code))
+
+    def test_generated_code(self):
+        compiler = Compiler()
+        text = compiler.compile_file("../sample_input/program.swift")
+        code = compiler.generator.code
+        self.assertIsInstance(code, InstructionBuffer)
+        self.assertEqual(text.splitlines(),
+                         [f"{index} {INST_NAMES[opcode]} {level} {operand}"
+                          for index, (opcode, level, operand) in enumerate(code)])
+
+    def test_text_is_cached(self):
+        code = InstructionBuffer()
+        for value in range(10):
+            code.append(LIT, 0, value)
+        streamed = StringIO()
+        code.write(streamed, chunk_lines=3)
+        text = code.to_text()
+        self.assertEqual(text, streamed.getvalue())
+        self.assertIs(text, code.to_text())
+        code.patch(0, 42)
+        self.assertEqual("0 LIT 0 42\n", code.to_text()[:len("0 LIT 0 42\n")])
+
+    def test_stack_dump(self):
+        stack = list(range(10))
+        streamed = StringIO()
+        write_stack(stack, streamed, chunk_lines=4)
+        self.assertEqual(ret_stack_as_str(stack), streamed.getvalue())
+        self.assertEqual("9\t9\n", ret_stack_as_str(stack)[-4:])
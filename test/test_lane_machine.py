@@ -0,0 +1,65 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instructions import LIT
+from src.pl0_vm import lane_machine, p_machine
+
+SWEEP = """var n: Int = n;
+var a: Int = 0;
+var h: Int = 0;
+func f(x: Int) -> Int {
+    x = x + 1;
+    return x;
+}
+while n > 0 {
+    h = n / 2;
+    if (h * 2 == n) {
+        a = f(n);
+    } else {
+        a = f(a);
+    }
+    n = n - 1;
+}
+"""
+
+
+class TestLaneMachine(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def test_sample_input(self):
+        """
+        Every lane ends with the globals of the scalar machine.
+        """
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                self.compiler.compile_file(name)
+                code = self.compiler.generator.code
+                stack, _ = p_machine.execute(code)
+                final_globals, _ = lane_machine.execute(code, [[0] * (len(stack) - 3)] * 3)
+                for row in final_globals:
+                    self.assertEqual(stack[3:], row.tolist())
+
+    def test_divergent_lanes(self):
+        """
+        Lanes leave the loop after different numbers of iterations and return from different calls,
+        each of them ends as a scalar run with the same value of n.
+        """
+        self.compiler.compile_source(SWEEP)
+        code = self.compiler.generator.code
+        inputs = [[n, 0, 0] for n in range(-3, 40)]
+        final_globals, _ = lane_machine.execute(code, inputs)
+        # the same program with the constant of the first declaration patched per run
+        self.compiler.compile_source(SWEEP.replace("= n;", "= 0;", 1))
+        scalar_code = self.compiler.generator.code
+        seed = scalar_code.opcodes.index(LIT)
+        for row, final in zip(inputs, final_globals):
+            scalar_code.patch(seed, row[0])
+            stack, _ = p_machine.execute(scalar_code)
+            self.assertEqual(stack[3:6], final.tolist())
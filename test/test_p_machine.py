@@ -0,0 +1,86 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import INT, LIT, OPR, STO, Op
+from src.pl0_vm.p_machine import MAX_STACK_SIZE, STACK_SIZE, execute, run_pl0_code
+
+
+class TestPMachine(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def run_file(self, name):
+        self.compiler.compile_file("../sample_input/" + name)
+        stack, _ = execute(self.compiler.generator.code)
+        return stack
+
+    def test_loop(self):
+        # someResult, l
+        self.assertEqual([19, 20], self.run_file("for.swift")[3:5])
+
+    def test_calls(self):
+        # functions take the first 4 global slots, a and b follow
+        stack = self.run_file("program.swift")
+        self.assertEqual([640, 6774], stack[7:9])
+
+    def test_call_with_arguments(self):
+        # function, par, glob
+        self.assertEqual([0, 99999, 107886], self.run_file("func_simple.swift")[3:6])
+
+    def test_conditions(self):
+        self.assertEqual([1737], self.run_file("complex_program.swift")[3:4])
+        self.assertEqual([105], self.run_file("ternary_operator.swift")[3:4])
+        self.assertEqual([1], self.run_file("while.swift")[3:4])
+
+    def test_division(self):
+        code = self.compiler.compile_source("var a: Int = 0 - 7;\nvar b: Int = a / 2;\n")
+        self.assertIn("OPR 0 5", code)
+        self.assertEqual([-7, -3], execute(self.compiler.generator.code)[0][3:5])
+
+    def test_stack_dump(self):
+        self.compiler.compile_file("../sample_input/declaration.swift")
+        self.assertEqual("3\t555\n4\t565\n", run_pl0_code(self.compiler.generator.code)[len("0\t0\n1\t0\n2\t0\n"):])
+
+    def test_large_frame(self):
+        """
+        One INT allocates a frame several times larger than the stack, the new slots are zeros.
+        """
+        code = InstructionBuffer()
+        for instruction in ((INT, 0, 10 * STACK_SIZE), (LIT, 0, 7), (STO, 0, 10 * STACK_SIZE - 1)):
+            code.append(*instruction)
+        stack, _ = execute(code)
+        self.assertEqual(10 * STACK_SIZE, len(stack))
+        self.assertEqual([0, 7], stack[-2:])
+
+    def test_stack_overflow(self):
+        code = InstructionBuffer()
+        code.append(INT, 0, MAX_STACK_SIZE)
+        with self.assertRaises(IndexError) as context:
+            execute(code)
+        self.assertIn("stack overflow", str(context.exception))
+
+    def test_zero_operand(self):
+        # the literal 0 is an operand too, without it the addition takes a value from the empty stack
+        self.compiler.compile_source("var a: Int = 2;\na = a + 0;\n")
+        stack, _ = execute(self.compiler.generator.code)
+        self.assertEqual([2], stack[3:4])
+
+    def test_stack_below_bottom(self):
+        code = InstructionBuffer()
+        code.append(INT, 0, -2)
+        with self.assertRaises(IndexError) as context:
+            execute(code)
+        self.assertIn("stack underflow", str(context.exception))
+        # a value taken from the empty stack
+        code = InstructionBuffer()
+        code.append(LIT, 0, 5)
+        code.append(OPR, 0, Op.add.value)
+        with self.assertRaises(IndexError) as context:
+            execute(code)
+        self.assertIn("stack underflow", str(context.exception))
@@ -0,0 +1,81 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+import json
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_vm import p_machine
+from src.pl0_vm.profiler import profile
+from src.pl0_vm.verifier import verify
+
+
+class TestProfiler(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def test_sample_input(self):
+        """
+        The profiled run ends as the reference run and counts every step, the stack never grows
+        over the size computed by the verifier.
+        """
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                self.compiler.compile_file(name)
+                code = self.compiler.generator.code
+                stack, steps = p_machine.execute(code)
+                profiled_stack, result = profile(code)
+                self.assertEqual(stack, profiled_stack)
+                self.assertEqual(steps, result.steps)
+                self.assertEqual(steps, sum(result.instruction_counts().values()))
+                self.assertLessEqual(len(stack), result.high_water_mark)
+                self.assertLessEqual(result.high_water_mark, verify(code).stack_size)
+
+    def test_counts(self):
+        listing = self.compiler.compile_file("../sample_input/program.swift")
+        _, result = profile(self.compiler.generator.code)
+        # the body of the inner loop of the function at 79 runs twice for both iterations of the outer loop
+        self.assertEqual(4, result.address_counts[99])
+        # the function at 29 is never called
+        self.assertEqual({3: 2, 51: 1, 79: 1}, result.call_counts())
+        self.assertEqual([0] * 21, result.address_counts[29:50])
+        exported = json.loads(result.to_json())
+        self.assertEqual(result.steps, exported["steps"])
+        self.assertEqual({"3": 2, "51": 1, "79": 1}, exported["calls"])
+        self.assertEqual(result.operation_counts()["add"], exported["operations"]["add"])
+        # the listing keeps the lines of return_code() after the counts
+        annotated = result.annotated_listing().splitlines()
+        self.assertEqual(listing.splitlines(), [line.split("%  ")[1] for line in annotated])
+        self.assertEqual("4", annotated[99].split()[0])
+
+    def test_lines(self):
+        self.compiler.compile_file("../sample_input/program.swift")
+        generator = self.compiler.generator
+        lines = generator.lines
+        # the body of the inner loop of someComplexFunction, the jump back belongs to the loop
+        self.assertEqual(34, lines.line_of(99))
+        self.assertEqual(33, lines.line_of(117))
+        # the start of the program is generated on its own
+        self.assertEqual([0, 0], lines.expand(len(generator.code))[:2])
+        _, result = profile(generator.code, timed=True)
+        counts = result.line_counts(lines)
+        self.assertEqual(result.steps, sum(counts.values()))
+        self.assertEqual((22, 178), result.hot_lines(lines, limit=1)[0])
+        self.assertEqual(counts.keys(), result.line_times(lines).keys())
+        self.assertEqual(sum(result.address_times), sum(result.line_times(lines).values()))
+        self.assertEqual({0: 35, 3: 42, 51: 337, 79: 139}, result.function_counts())
+        self.assertEqual(result.function_counts().keys(), result.function_times().keys())
+        self.assertEqual(sum(result.line_times(lines).values()), sum(result.function_times().values()))
+        exported = result.to_dict(lines, generator.function_names())
+        self.assertEqual(["<main>", "someOtherFunction", "someOtherFunction3", "someComplexFunction"],
+                         list(exported["functions"]))
+        self.assertEqual(list(exported["functions"]), list(exported["function_times_ns"]))
+        with open("../sample_input/program.swift") as f:
+            source = f.read()
+        annotated = result.annotated_source(source, lines).splitlines()
+        self.assertEqual(len(source.splitlines()), len(annotated))
+        self.assertEqual("56", annotated[33].split()[0])
+        self.assertTrue(annotated[34].strip().startswith("35"))
@@ -0,0 +1,59 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, CAL, INT, JMC, JMP, LIT, LOD, OPR, RET, STO
+from src.pl0_vm import p_machine, register_machine
+
+
+class TestRegisterMachine(TestCase):
+
+    def assertSameStack(self, code):
+        self.assertEqual(p_machine.execute(code)[0], register_machine.execute(code)[0])
+
+    def test_sample_input(self):
+        """
+        The register IR leaves the same stack as the stack machine and executes fewer instructions.
+        """
+        compiler = Compiler()
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                compiler.compile_file(name)
+                code = compiler.generator.code
+                (stack, steps), (registers_stack, registers_steps) = (p_machine.execute(code),
+                                                                      register_machine.execute(code))
+                self.assertEqual(stack, registers_stack)
+                self.assertLessEqual(registers_steps, steps)
+
+    def test_operations_and_static_links(self):
+        code = InstructionBuffer()
+        for instruction in ((INT, 0, 5), (LIT, 0, -7), (LIT, 0, 2), (OPR, 0, Op.mod.value), (STO, 0, 3),
+                            (LIT, 0, -7), (LIT, 0, 2), (OPR, 0, Op.div.value), (OPR, 0, Op.neg.value), (STO, 0, 4),
+                            (LIT, 0, 5), (OPR, 0, Op.odd.value), (JMP, 0, 16),
+                            # function: global 3 of the frame one static link below += 10
+                            (INT, 0, 3), (LIT, 0, 10), (JMP, 0, 18),
+                            (CAL, 0, 13), (RET, 0, 0),
+                            (LOD, 1, 3), (OPR, 0, Op.add.value), (STO, 1, 3), (RET, 0, 0)):
+            code.append(*instruction)
+        stack, _ = register_machine.execute(code)
+        self.assertEqual([9, 3, 1], stack[3:6])
+        self.assertSameStack(code)
+
+    def test_values_across_blocks(self):
+        """
+        A swap through the stack, a relation stored as a value and values left on the stack by a block.
+        """
+        code = InstructionBuffer()
+        for instruction in ((INT, 0, 7), (LIT, 0, 1), (STO, 0, 3), (LIT, 0, 2), (STO, 0, 4),
+                            (LOD, 0, 3), (LOD, 0, 4), (STO, 0, 3), (STO, 0, 4),
+                            (LOD, 0, 3), (LOD, 0, 4), (OPR, 0, Op.gt.value), (STO, 0, 5),
+                            (LOD, 0, 3), (LOD, 0, 5), (JMC, 0, 17), (OPR, 0, Op.neg.value),
+                            (LIT, 0, 4), (OPR, 0, Op.mul.value), (STO, 0, 6), (RET, 0, 0)):
+            code.append(*instruction)
+        stack, _ = register_machine.execute(code)
+        self.assertEqual([2, 1, 1, -8], stack[3:7])
+        self.assertSameStack(code)
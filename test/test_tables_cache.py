@@ -0,0 +1,36 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import os
+import tempfile
+from unittest import TestCase
+
+from src.tables_cache import build_lexer_and_parser, grammar_hash
+
+
+class TestTablesCache(TestCase):
+
+    def test_tables_are_generated_once(self):
+        """
+        The first build stores the tables, the second one loads them and parses the same tree.
+        """
+        with open("../sample_input/program.swift") as f:
+            code = f.read()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            lexer, parser = build_lexer_and_parser(cache_dir)
+            tables_dir = os.path.join(cache_dir, "tables", grammar_hash())
+            self.assertEqual({"lextab.py", "parsetab.pickle"}, set(os.listdir(tables_dir)))
+            cold_tree = str(parser.parse(code, lexer=lexer))
+
+            lexer, parser = build_lexer_and_parser(cache_dir)
+            self.assertEqual(cold_tree, str(parser.parse(code, lexer=lexer)))
+
+    def test_corrupted_tables_are_rebuilt(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            build_lexer_and_parser(cache_dir)
+            tables_dir = os.path.join(cache_dir, "tables", grammar_hash())
+            with open(os.path.join(tables_dir, "lextab.py"), "w") as f:
+                f.write("this is not python")
+            lexer, parser = build_lexer_and_parser(cache_dir)
+            self.assertIsNotNone(parser.parse("var a: Int = 1;", lexer=lexer))
+            self.assertTrue(os.path.isfile(os.path.join(tables_dir, "lextab.py")))
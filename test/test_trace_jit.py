@@ -0,0 +1,48 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_vm import p_machine, trace_jit
+
+
+class TestTraceJit(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.compiler = Compiler()
+
+    def assertSameExecution(self, code):
+        expected = p_machine.execute(code)
+        for threshold in (1, 2, trace_jit.HOT_LOOP_THRESHOLD):
+            with self.subTest(threshold=threshold):
+                self.assertEqual(expected, trace_jit.execute(code, threshold=threshold))
+
+    def test_sample_input(self):
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                self.compiler.compile_file(name)
+                self.assertSameExecution(self.compiler.generator.code)
+
+    def test_failing_guards(self):
+        """
+        The branch inside the loop changes every few iterations, the trace leaves through its guard and comes back.
+        """
+        self.compiler.compile_source("var a: Int = 0;\n"
+                                     "var b: Int = 0;\n"
+                                     "var i: Int = 0;\n"
+                                     "while i < 300 {\n"
+                                     "    if (b > 3) {\n"
+                                     "        b = 0;\n"
+                                     "        a += 100;\n"
+                                     "    }\n"
+                                     "    else {\n"
+                                     "        b += 1;\n"
+                                     "    }\n"
+                                     "    i += 1;\n"
+                                     "}\n")
+        self.assertSameExecution(self.compiler.generator.code)
+        stack, _ = trace_jit.execute(self.compiler.generator.code)
+        self.assertEqual([6000, 0, 300], stack[3:6])
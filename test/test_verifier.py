@@ -0,0 +1,89 @@
+#  date: 18. 10. 2026
+#  author: Daniel Schnurpfeil
+#
+import glob
+from unittest import TestCase
+
+from src.compiler import Compiler
+from src.pl0_code_generator.instruction_buffer import InstructionBuffer
+from src.pl0_code_generator.instructions import Op, CAL, INT, JMC, JMP, LIT, LOD, OPR, RET, STO
+from src.pl0_vm import dispatch, p_machine
+from src.pl0_vm.verifier import VerificationError, verify
+
+
+def buffer(*instructions) -> InstructionBuffer:
+    code = InstructionBuffer()
+    for instruction in instructions:
+        code.append(*instruction)
+    return code
+
+
+class TestVerifier(TestCase):
+
+    def test_sample_input(self):
+        """
+        The generated programs verify and the computed size of the stack is never exceeded.
+        """
+        compiler = Compiler()
+        for name in sorted(glob.glob("../sample_input/*.swift")):
+            with self.subTest(name):
+                compiler.compile_file(name)
+                verification = verify(compiler.generator.code)
+                stack, _ = p_machine.execute(compiler.generator.code)
+                self.assertLessEqual(len(stack), verification.stack_size)
+                self.assertEqual(0, verification.depths[0])
+
+    def test_depths_and_frames(self):
+        # main: 2 globals, calls the function with one argument, the function has one local
+        verification = verify(buffer((INT, 0, 5), (INT, 0, 1), (LIT, 0, 7), (CAL, 0, 7), (INT, 0, -1),
+                                     (STO, 0, 3), (RET, 0, 0),
+                                     (INT, 0, 4), (LOD, 0, -1), (STO, 0, 3), (LOD, 0, 3), (STO, 0, -2), (RET, 0, 0)))
+        self.assertEqual([0, 5, 6, 7, 7, 6, 5, 0, 4, 5, 4, 5, 4], verification.depths)
+        self.assertEqual({0: 10, 7: 5}, verification.frame_sizes)
+        self.assertEqual(12, verification.stack_size)
+
+    def test_recursion(self):
+        verification = verify(buffer((INT, 0, 3), (CAL, 0, 3), (RET, 0, 0),
+                                     (INT, 0, 3), (CAL, 1, 3), (RET, 0, 0)))
+        self.assertIsNone(verification.stack_size)
+
+    def test_rejected_programs(self):
+        for name, code in (("jump outside", buffer((INT, 0, 3), (JMP, 0, 9))),
+                           ("call behind the end", buffer((INT, 0, 3), (CAL, 0, 2))),
+                           ("empty stack", buffer((LIT, 0, 1), (OPR, 0, Op.add.value), (RET, 0, 0))),
+                           ("different depths", buffer((INT, 0, 4), (LOD, 0, 3), (JMC, 0, 4), (LIT, 0, 1),
+                                                       (RET, 0, 0)))):
+            with self.subTest(name):
+                with self.assertRaises(VerificationError):
+                    verify(code)
+
+    def test_unverified_program_is_checked(self):
+        """
+        A program the verifier rejects runs on the checked loop, its errors stop it.
+        """
+        code = buffer((INT, 0, 4), (LIT, 0, 1), (STO, 0, 3), (LOD, 0, 3), (JMC, 0, 6), (LIT, 0, 9), (RET, 0, 0))
+        with self.assertRaises(VerificationError):
+            verify(code)
+        self.assertEqual(p_machine.execute(code), dispatch.execute(code))
+        code = buffer((LIT, 0, 5), (OPR, 0, Op.add.value), (STO, 0, 0), (RET, 0, 0))
+        with self.assertRaises(VerificationError):
+            verify(code)
+        with self.assertRaises(IndexError) as context:
+            dispatch.execute(code)
+        self.assertIn("stack underflow", str(context.exception))
+
+    def test_checked_loop(self):
+        """
+        The reference machine stops a program that leaves the stack or its frames.
+        """
+        for name, code, error in (
+                ("empty stack", buffer((LIT, 0, 5), (OPR, 0, Op.add.value), (STO, 0, 0), (RET, 0, 0)),
+                 "stack underflow"),
+                ("address below the stack", buffer((INT, 0, 3), (LOD, 0, -1), (RET, 0, 0)), "address out of range"),
+                ("jump outside", buffer((INT, 0, 3), (JMP, 0, -1)), "jump target out of range"),
+                ("broken dynamic link", buffer((INT, 0, 3), (CAL, 0, 3), (RET, 0, 0), (INT, 0, 3), (LIT, 0, -7),
+                                               (STO, 0, 1), (RET, 0, 0)), "dynamic link out of range")):
+            with self.subTest(name):
+                with self.assertRaises(IndexError) as context:
+                    p_machine.execute(code)
+                self.assertIn(error, str(context.exception))